@@ -0,0 +1,26 @@
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from app.config import SQLITE_PROFILE
+from app.database import SQLALCHEMY_DATABASE_URL, SQLITE_PROFILES, apply_sqlite_pragmas
+from app.instrumentation import instrument_engine
+
+ASYNC_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+
+def create_async_sqlite_engine(url: str, profile: str = SQLITE_PROFILE, **kwargs) -> AsyncEngine:
+    """Async counterpart of create_sqlite_engine, backed by aiosqlite."""
+    engine = create_async_engine(url, **kwargs)
+    apply_sqlite_pragmas(engine.sync_engine, SQLITE_PROFILES[profile])
+    return engine
+
+
+async_engine = create_async_sqlite_engine(ASYNC_DATABASE_URL)
+instrument_engine(async_engine.sync_engine)
+# Rows are converted to responses after commit, so keep them loaded instead of
+# lazily refreshing them (lazy loads are not possible on an AsyncSession).
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,24 @@
+"""Agentic Todo with the JSON API on an async SQLAlchemy session.
+
+    uvicorn app.async_main:app                # or: uvicorn --factory app.async_main:create_app
+
+The todo CRUD routes of /api await aiosqlite instead of borrowing a
+threadpool worker per request. The rest of /api and the HTML routes are the
+sync app's, on the sync session, so both apps serve the same routes. Startup
+and shutdown are as for app.main.
+"""
+from fastapi import FastAPI
+
+from app import main
+from app.config import MIGRATE_ON_STARTUP
+
+
+def create_app(migrate: bool = MIGRATE_ON_STARTUP) -> FastAPI:
+    return main.create_app(async_api=True, migrate=migrate)
+
+
+def __getattr__(name: str):
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
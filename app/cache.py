@@ -0,0 +1,415 @@
+"""Read-through cache backends for TodoService.
+
+Two backends share one small interface:
+
+* MemoryCache - per-process LRU with a TTL. Fastest, but each uvicorn worker
+  holds its own copy, so a write in one worker only invalidates that worker.
+* SQLiteCache - a key/value table in a separate SQLite file that every
+  worker opens. It stands in for Redis: invalidations are visible to all
+  processes.
+
+Besides plain entries, backends keep integer counters. TodoCache uses them
+as generation numbers so that a write can invalidate every cached list page
+of a filter combination with a single increment, and as per-todo versions
+for single-todo entries.
+
+A counter never goes back to a value it has had, which is what makes it safe
+to key entries on. incr() gives each key the next number of one sequence
+shared by all counters, so the counters written longest ago hold the lowest
+values. Beyond max_entries counters those are dropped, and the highest value
+dropped becomes the floor every missing counter reads as. That moves each
+dropped counter forward (and, once, every counter never incremented, which
+orphans their entries too), so none of them can return to an earlier value.
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from itertools import product
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import text
+
+from app.config import CACHE_BACKEND, CACHE_MAX_ENTRIES, CACHE_PATH, CACHE_TTL_SECONDS
+from app.database import create_sqlite_engine
+from app.metrics import CACHE_EVENTS
+from app.models import Phase, Priority
+from app.schemas import CacheStats, TodoResponse
+
+# How many writes SQLiteCache accepts between sweeps of expired and excess rows.
+SQLITE_PRUNE_INTERVAL = 500
+
+
+class CacheBackend(ABC):
+    name = "base"
+
+    def __init__(self, ttl: float = CACHE_TTL_SECONDS, max_entries: int = CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._events = {
+            name: CACHE_EVENTS.labels(self.name, name)
+            for name in ("hit", "miss", "eviction", "expiration")
+        }
+
+    def _hit(self) -> None:
+        self.hits += 1
+        self._events["hit"].inc()
+
+    def _miss(self) -> None:
+        self.misses += 1
+        self._events["miss"].inc()
+
+    def _evicted(self, count: int = 1) -> None:
+        self.evictions += count
+        self._events["eviction"].inc(count)
+
+    def _expired(self, count: int = 1) -> None:
+        self.expirations += count
+        self._events["expiration"].inc(count)
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def counter(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    def incr(self, keys: Iterable[str]) -> None:
+        """Move each counter past every value any counter has had."""
+
+    @abstractmethod
+    def size(self) -> int:
+        ...
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            backend=self.name,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            expirations=self.expirations,
+            entries=self.size(),
+        )
+
+
+class MemoryCache(CacheBackend):
+    name = "memory"
+
+    def __init__(self, ttl: float = CACHE_TTL_SECONDS, max_entries: int = CACHE_MAX_ENTRIES):
+        super().__init__(ttl, max_entries)
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        # In incr() order, so oldest (and lowest) first.
+        self._counters: "OrderedDict[str, int]" = OrderedDict()
+        self._sequence = 0
+        self._floor = 0
+        # Sync routes run in the threadpool, so every access is locked.
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._miss()
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._expired()
+                self._miss()
+                return None
+            self._entries.move_to_end(key)
+            self._hit()
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evicted()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, self._floor)
+
+    def incr(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._sequence += 1
+                self._counters[key] = self._sequence
+                self._counters.move_to_end(key)
+            while len(self._counters) > self.max_entries:
+                _, self._floor = self._counters.popitem(last=False)
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(CacheBackend):
+    name = "sqlite"
+
+    def __init__(
+        self,
+        path: str = CACHE_PATH,
+        ttl: float = CACHE_TTL_SECONDS,
+        max_entries: int = CACHE_MAX_ENTRIES,
+    ):
+        super().__init__(ttl, max_entries)
+        self.engine = create_sqlite_engine(f"sqlite:///{path}", profile="production")
+        self._writes = 0
+        with self.engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL"
+                ") WITHOUT ROWID"
+            ))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_cache_entries_expires_at ON cache_entries (expires_at)"
+            ))
+            conn.execute(text(
+                "CREATE TABLE IF NOT EXISTS cache_counters ("
+                "key TEXT PRIMARY KEY, value INTEGER NOT NULL"
+                ") WITHOUT ROWID"
+            ))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_cache_counters_value ON cache_counters (value)"
+            ))
+            # The floor of dropped counters (see the module docstring).
+            conn.execute(text(
+                "CREATE TABLE IF NOT EXISTS cache_counter_floor (value INTEGER NOT NULL)"
+            ))
+            conn.execute(text(
+                "INSERT INTO cache_counter_floor (value) "
+                "SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM cache_counter_floor)"
+            ))
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                text("SELECT value, expires_at FROM cache_entries WHERE key = :key"), {"key": key}
+            ).first()
+        if row is None:
+            self._miss()
+            return None
+        if row.expires_at <= time.time():
+            self._expired()
+            self._miss()
+            return None
+        self._hit()
+        return row.value
+
+    def set(self, key: str, value: bytes) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(
+                    "INSERT INTO cache_entries (key, value, expires_at) VALUES (:key, :value, :expires_at) "
+                    "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at"
+                ),
+                {"key": key, "value": value, "expires_at": time.time() + self.ttl},
+            )
+            self._maybe_prune(conn)
+
+    def _maybe_prune(self, conn) -> None:
+        self._writes += 1
+        if self._writes % SQLITE_PRUNE_INTERVAL == 0:
+            self._prune(conn)
+
+    def _prune(self, conn) -> None:
+        self._expired(conn.execute(
+            text("DELETE FROM cache_entries WHERE expires_at <= :now"), {"now": time.time()}
+        ).rowcount)
+        # Rows expiring soonest were written longest ago: drop those first.
+        self._evicted(conn.execute(
+            text(
+                "DELETE FROM cache_entries WHERE key IN ("
+                "SELECT key FROM cache_entries ORDER BY expires_at "
+                "LIMIT max((SELECT count(*) FROM cache_entries) - :max_entries, 0))"
+            ),
+            {"max_entries": self.max_entries},
+        ).rowcount)
+        floor = conn.execute(
+            text(
+                "SELECT max(value) FROM (SELECT value FROM cache_counters ORDER BY value "
+                "LIMIT max((SELECT count(*) FROM cache_counters) - :max_entries, 0))"
+            ),
+            {"max_entries": self.max_entries},
+        ).scalar()
+        if floor is not None:
+            conn.execute(text("UPDATE cache_counter_floor SET value = max(value, :floor)"), {"floor": floor})
+            conn.execute(text("DELETE FROM cache_counters WHERE value <= :floor"), {"floor": floor})
+
+    def delete(self, key: str) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(text("DELETE FROM cache_entries WHERE key = :key"), {"key": key})
+
+    def counter(self, key: str) -> int:
+        with self.engine.connect() as conn:
+            return conn.execute(
+                text(
+                    "SELECT coalesce((SELECT value FROM cache_counters WHERE key = :key), "
+                    "(SELECT value FROM cache_counter_floor))"
+                ),
+                {"key": key},
+            ).scalar()
+
+    def incr(self, keys: Iterable[str]) -> None:
+        params = [{"key": key} for key in keys]
+        if not params:
+            return
+        with self.engine.begin() as conn:
+            # One statement reads and writes the sequence, so workers
+            # incrementing at once never hand out the same number.
+            conn.execute(
+                text(
+                    "INSERT INTO cache_counters (key, value) VALUES (:key, 1 + max("
+                    "(SELECT coalesce(max(value), 0) FROM cache_counters), "
+                    "(SELECT value FROM cache_counter_floor))) "
+                    "ON CONFLICT (key) DO UPDATE SET value = excluded.value"
+                ),
+                params,
+            )
+            self._maybe_prune(conn)
+
+    def size(self) -> int:
+        with self.engine.connect() as conn:
+            return conn.execute(text("SELECT count(*) FROM cache_entries")).scalar()
+
+
+ListFilters = Tuple[Optional[Phase], Optional[Priority], Optional[bool]]
+TODO_LIST = TypeAdapter(List[TodoResponse])
+
+
+def _part(value) -> str:
+    if value is None:
+        return "*"
+    return getattr(value, "value", str(value))
+
+
+def filter_group(phase: Optional[Phase], priority: Optional[Priority], completed: Optional[bool]) -> str:
+    return ":".join(_part(value) for value in (phase, priority, completed))
+
+
+def groups_containing(phase: Phase, priority: Priority, completed: bool) -> List[str]:
+    """Every filter combination a todo with these values shows up under."""
+    return [
+        filter_group(*combo)
+        for combo in product((None, phase), (None, priority), (None, completed))
+    ]
+
+
+ALL_GROUPS = [
+    filter_group(*combo)
+    for combo in product((None, *Phase), (None, *Priority), (None, True, False))
+]
+
+
+class TodoCache:
+    """Todo-shaped keys over a CacheBackend.
+
+    Single todos are cached under their id plus a per-todo version, and list
+    pages under their filter tuple plus the generation of that filter group.
+    A write bumps the todo's version and the generation of every group the
+    todo belonged to before or after the write, which orphans exactly the
+    affected entries. Readers take the key (version or generation included)
+    before reading the database, so a value computed from pre-write data is
+    stored under a key nobody reads any more rather than outliving the write.
+
+    Entries hold TodoResponse JSON either way, so the model getters and the
+    *_dict getters used by the fast JSON path read each other's entries.
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str = ""):
+        self.backend = backend
+        self.namespace = namespace
+
+    def _key(self, *parts) -> str:
+        return ":".join((self.namespace, *map(str, parts)))
+
+    def todo_key(self, todo_id: int) -> str:
+        version = self.backend.counter(self._key("ver", todo_id))
+        return self._key("todo", todo_id, version)
+
+    def get_todo(self, key: str) -> Optional[TodoResponse]:
+        value = self.backend.get(key)
+        return None if value is None else TodoResponse.model_validate_json(value)
+
+    def set_todo(self, key: str, todo: TodoResponse) -> None:
+        self.backend.set(key, todo.model_dump_json().encode())
+
+    def get_todo_dict(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.backend.get(key)
+        return None if value is None else orjson.loads(value)
+
+    def set_todo_dict(self, key: str, todo: Dict[str, Any]) -> None:
+        self.backend.set(key, orjson.dumps(todo))
+
+    def forget_todos(self, todo_ids: Iterable[int]) -> None:
+        todo_ids = list(todo_ids)
+        stale = [self.todo_key(todo_id) for todo_id in todo_ids]
+        self.backend.incr(self._key("ver", todo_id) for todo_id in todo_ids)
+        # Unreachable once the version moved on; dropped now to free the space.
+        for key in stale:
+            self.backend.delete(key)
+
+    def list_key(self, filters: ListFilters, limit: Optional[int], cursor: Optional[str]) -> str:
+        group = filter_group(*filters)
+        generation = self.backend.counter(self._key("gen", group))
+        return self._key("list", group, generation, limit, cursor)
+
+    def get_list(self, key: str) -> Optional[List[TodoResponse]]:
+        value = self.backend.get(key)
+        return None if value is None else TODO_LIST.validate_json(value)
+
+    def set_list(self, key: str, todos: Sequence[TodoResponse]) -> None:
+        self.backend.set(key, TODO_LIST.dump_json(list(todos)))
+
+    def get_list_dicts(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        value = self.backend.get(key)
+        return None if value is None else orjson.loads(value)
+
+    def set_list_dicts(self, key: str, todos: Sequence[Dict[str, Any]]) -> None:
+        self.backend.set(key, orjson.dumps(todos))
+
+    def invalidate_groups(self, groups: Iterable[str]) -> None:
+        self.backend.incr(self._key("gen", group) for group in sorted(set(groups)))
+
+    def invalidate_all_lists(self) -> None:
+        self.invalidate_groups(ALL_GROUPS)
+
+    def stats(self) -> CacheStats:
+        return self.backend.stats()
+
+
+def create_cache(backend: str = CACHE_BACKEND) -> Optional[TodoCache]:
+    """Build the configured cache, or None when caching is off."""
+    if not backend:
+        return None
+    if backend == "memory":
+        return TodoCache(MemoryCache())
+    if backend == "sqlite":
+        return TodoCache(SQLiteCache())
+    raise ValueError(f"Unknown cache backend: {backend!r}")
+
+
+todo_cache = create_cache()
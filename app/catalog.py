@@ -0,0 +1,48 @@
+"""Skill catalog validated and serialized once at import.
+
+PHASE_SKILLS and SKILL_DETAILS never change while the app runs, so every
+response reuses the same frozen SkillResponse objects and the phase
+endpoints send pre-encoded JSON bytes.
+"""
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Tuple
+
+from pydantic import TypeAdapter
+
+from app.config import PHASE_SKILLS, get_skills_for_phase
+from app.http_cache import etag_for_bytes
+from app.schemas import PhaseResponse, SkillResponse
+
+PHASE_SKILL_RESPONSES: Mapping[str, Tuple[SkillResponse, ...]] = MappingProxyType({
+    phase: tuple(SkillResponse(**skill) for skill in get_skills_for_phase(phase))
+    for phase in PHASE_SKILLS
+})
+
+# The same skills as plain dicts, shared by every fast-JSON todo of a phase.
+PHASE_SKILL_DICTS: Mapping[str, Tuple[Dict[str, Any], ...]] = MappingProxyType({
+    phase: tuple(skill.model_dump() for skill in skills)
+    for phase, skills in PHASE_SKILL_RESPONSES.items()
+})
+
+PHASE_RESPONSES: Mapping[str, PhaseResponse] = MappingProxyType({
+    phase: PhaseResponse(name=phase, skills=list(skills))
+    for phase, skills in PHASE_SKILL_RESPONSES.items()
+})
+
+PHASES_JSON: bytes = TypeAdapter(List[PhaseResponse]).dump_json(list(PHASE_RESPONSES.values()))
+PHASE_JSON: Mapping[str, bytes] = MappingProxyType({
+    phase: response.model_dump_json().encode() for phase, response in PHASE_RESPONSES.items()
+})
+
+PHASES_ETAG: str = etag_for_bytes(PHASES_JSON)
+PHASE_ETAGS: Mapping[str, str] = MappingProxyType({
+    phase: etag_for_bytes(data) for phase, data in PHASE_JSON.items()
+})
+
+
+def skills_for_phase(phase: str) -> Tuple[SkillResponse, ...]:
+    return PHASE_SKILL_RESPONSES.get(phase, ())
+
+
+def skill_dicts_for_phase(phase: str) -> Tuple[Dict[str, Any], ...]:
+    return PHASE_SKILL_DICTS.get(phase, ())
@@ -1,5 +1,52 @@
+import os
 from typing import List, Dict, Any
 
+DATABASE_URL = os.environ.get("AGENTIC_TODO_DATABASE_URL", "sqlite:///./agentic_todo.db")
+# Name of an entry in app.database.SQLITE_PROFILES ("production" or "default").
+SQLITE_PROFILE = os.environ.get("AGENTIC_TODO_SQLITE_PROFILE", "production")
+# How long change-feed tombstones survive compaction. Clients that have not
+# synced for longer must start over from since=0.
+CHANGE_LOG_RETENTION_DAYS = int(os.environ.get("AGENTIC_TODO_CHANGE_LOG_RETENTION_DAYS", "30"))
+# With 1, pages subscribe to /api/events and patch themselves. Off by default:
+# every open page then holds a long-lived connection and a subscriber queue.
+LIVE_UPDATES = os.environ.get("AGENTIC_TODO_LIVE_UPDATES", "0") == "1"
+# Read-through cache for TodoService: "" (off), "memory" (per process) or
+# "sqlite" (a file shared by every worker; see app.cache).
+CACHE_BACKEND = os.environ.get("AGENTIC_TODO_CACHE", "")
+CACHE_TTL_SECONDS = float(os.environ.get("AGENTIC_TODO_CACHE_TTL", "60"))
+CACHE_MAX_ENTRIES = int(os.environ.get("AGENTIC_TODO_CACHE_MAX_ENTRIES", "10000"))
+CACHE_PATH = os.environ.get("AGENTIC_TODO_CACHE_PATH", "./agentic_todo_cache.db")
+# Requests spending at least this long in SQL are logged at WARNING on the
+# "app.sql" logger; every other request is logged there at INFO.
+SQL_SLOW_REQUEST_MS = float(os.environ.get("AGENTIC_TODO_SQL_SLOW_REQUEST_MS", "100"))
+# Todo API routes return orjson-encoded dicts built straight from rows instead
+# of response_model objects that FastAPI validates and encodes again. The
+# JSON and the OpenAPI schema are the same either way.
+FAST_JSON = os.environ.get("AGENTIC_TODO_FAST_JSON", "0") == "1"
+# Todo writes from concurrent requests are committed together by one writer
+# thread (see app.group_commit): it gathers writes for up to the window, or
+# until the batch is full, and commits them as one transaction.
+GROUP_COMMIT = os.environ.get("AGENTIC_TODO_GROUP_COMMIT", "0") == "1"
+GROUP_COMMIT_WINDOW_MS = float(os.environ.get("AGENTIC_TODO_GROUP_COMMIT_WINDOW_MS", "2"))
+GROUP_COMMIT_MAX_BATCH = int(os.environ.get("AGENTIC_TODO_GROUP_COMMIT_MAX_BATCH", "64"))
+# Completed todos untouched for this long are moved to todos_archive by
+# POST /api/todos:archive, that many rows per transaction.
+ARCHIVE_AFTER_DAYS = int(os.environ.get("AGENTIC_TODO_ARCHIVE_AFTER_DAYS", "90"))
+ARCHIVE_BATCH_SIZE = int(os.environ.get("AGENTIC_TODO_ARCHIVE_BATCH_SIZE", "500"))
+# Schema migrations (app.migrations) are a deploy step: run
+# `python -m app.migrations` before starting the workers. With 1 the app
+# applies pending ones itself when it starts, which suits a single process.
+MIGRATE_ON_STARTUP = os.environ.get("AGENTIC_TODO_MIGRATE_ON_STARTUP", "0") == "1"
+# Requests carrying WORKSPACE_HEADER are served from their own SQLite file in
+# WORKSPACE_DIR; requests without it use DATABASE_URL. At most
+# WORKSPACE_MAX_ENGINES workspaces stay open, and one unused for
+# WORKSPACE_IDLE_SECONDS is closed the next time any workspace is opened.
+WORKSPACES = os.environ.get("AGENTIC_TODO_WORKSPACES", "0") == "1"
+WORKSPACE_DIR = os.environ.get("AGENTIC_TODO_WORKSPACE_DIR", "./workspaces")
+WORKSPACE_HEADER = os.environ.get("AGENTIC_TODO_WORKSPACE_HEADER", "X-Workspace")
+WORKSPACE_MAX_ENGINES = int(os.environ.get("AGENTIC_TODO_WORKSPACE_MAX_ENGINES", "32"))
+WORKSPACE_IDLE_SECONDS = float(os.environ.get("AGENTIC_TODO_WORKSPACE_IDLE_SECONDS", "300"))
+
 PHASE_SKILLS: Dict[str, List[str]] = {
     "planning": ["brainstorming", "writing-plans"],
     "design": ["brainstorming", "writing-plans"],
@@ -1,18 +1,262 @@
-from sqlalchemy import create_engine
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException, Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool
+
+from app.config import (
+    DATABASE_URL,
+    SQLITE_PROFILE,
+    WORKSPACE_DIR,
+    WORKSPACE_HEADER,
+    WORKSPACE_IDLE_SECONDS,
+    WORKSPACE_MAX_ENGINES,
+    WORKSPACES,
+)
+from app.instrumentation import instrument_engine
+from app.metrics import TimedQueuePool, instrument_pool
+
+SQLALCHEMY_DATABASE_URL = DATABASE_URL
+
+# PRAGMAs applied to every new pooled connection. WAL lets readers proceed
+# while a writer is active; synchronous=NORMAL is durable across application
+# crashes in WAL mode and only fsyncs at checkpoints. auto_vacuum only takes
+# effect on a file with no tables yet; it lets the archiver hand freed pages
+# back to the filesystem with incremental_vacuum.
+SQLITE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    "production": {
+        "auto_vacuum": "INCREMENTAL",
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,  # negative values are KiB: 64 MiB
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+}
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: Dict[str, Any]) -> None:
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./agentic_todo.db"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+def create_sqlite_engine(
+    url: str,
+    profile: str = SQLITE_PROFILE,
+    pragmas: Optional[Dict[str, Any]] = None,
+    **kwargs: Any,
+) -> Engine:
+    """Create a SQLite engine with a named PRAGMA profile, plus any overrides."""
+    kwargs.setdefault("connect_args", {"check_same_thread": False})
+    engine = create_engine(url, **kwargs)
+    apply_sqlite_pragmas(engine, {**SQLITE_PROFILES[profile], **(pragmas or {})})
+    return engine
+
+
+# Sync routes and their yield dependencies share AnyIO's 40-thread pool. With
+# fewer connections than threads, requests can hold every thread while waiting
+# for connections that only free up once a queued session teardown runs.
+engine = create_sqlite_engine(
+    SQLALCHEMY_DATABASE_URL, poolclass=TimedQueuePool, pool_size=20, max_overflow=20
 )
+instrument_engine(engine)
+instrument_pool(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# Workspace names double as file names.
+WORKSPACE_NAME = re.compile(r"[a-z0-9][a-z0-9_-]{0,62}")
+# Connections per workspace engine; a workspace is one team, not the whole app.
+WORKSPACE_POOL_SIZE = 5
+
+
+class WorkspaceEngines:
+    """One SQLite file and engine per workspace, behind a bounded LRU.
+
+    Each workspace has its own file and so its own write lock: writes to
+    different workspaces never wait on each other. Engines are opened on
+    first use (migrating the workspace's schema) and closed lazily:
+    whenever a workspace is opened, the least recently used ones beyond
+    `max_engines`, and any idle for longer than `idle_seconds`, are disposed.
+    Sessions still using a disposed engine keep their connection until they
+    close it.
+    """
+
+    def __init__(
+        self,
+        directory: str = WORKSPACE_DIR,
+        max_engines: int = WORKSPACE_MAX_ENGINES,
+        idle_seconds: float = WORKSPACE_IDLE_SECONDS,
+        profile: str = SQLITE_PROFILE,
+        pragmas: Optional[Dict[str, Any]] = None,
+    ):
+        self.directory = Path(directory)
+        self.max_engines = max_engines
+        self.idle_seconds = idle_seconds
+        self.profile = profile
+        self.pragmas = pragmas
+        self.opened = 0
+        self.closed = 0
+        # name -> (engine, last used), least recently used first.
+        self._engines: "OrderedDict[str, Tuple[Engine, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # name -> lock held while that workspace is being opened, so opening
+        # (and migrating) one never holds up lookups of the others.
+        self._opening: Dict[str, threading.Lock] = {}
+
+    def url(self, name: str) -> str:
+        return f"sqlite:///{self.directory / name}.db"
+
+    def get(self, name: str) -> Engine:
+        """The engine for `name`, opening (and if need be creating) it."""
+        engine = self._touch(name)
+        if engine is not None:
+            return engine
+        with self._lock:
+            opening = self._opening.setdefault(name, threading.Lock())
+        with opening:
+            # Another request may have opened it while this one waited.
+            engine = self._touch(name)
+            if engine is not None:
+                return engine
+            try:
+                engine = self._open(name)
+            finally:
+                with self._lock:
+                    self._opening.pop(name, None)
+        return self._insert(name, engine)
+
+    def _touch(self, name: str) -> Optional[Engine]:
+        """The open engine for `name`, marked as just used, or None."""
+        with self._lock:
+            entry = self._engines.pop(name, None)
+            if entry is None:
+                return None
+            self._engines[name] = (entry[0], time.monotonic())
+            return entry[0]
+
+    def _insert(self, name: str, engine: Engine) -> Engine:
+        with self._lock:
+            now = time.monotonic()
+            entry = self._engines.pop(name, None)
+            if entry is not None:
+                # Another open of this name started after ours released its
+                # lock and finished first; keep the engine already handed out.
+                stale = [engine]
+                engine = entry[0]
+                self.closed += 1
+            else:
+                stale = []
+            self._engines[name] = (engine, now)
+            stale.extend(self._evict(now))
+        for old in stale:
+            old.dispose()
+        return engine
+
+    @contextmanager
+    def borrow(self, name: str) -> Iterator[Engine]:
+        """An engine for a one-off read that leaves the LRU as it was.
+
+        Open workspaces lend their engine; others get a throwaway one, so a
+        sweep over every workspace does not push the busy ones out.
+        """
+        with self._lock:
+            entry = self._engines.get(name)
+        if entry is not None:
+            yield entry[0]
+            return
+        engine = create_sqlite_engine(
+            self.url(name), profile=self.profile, pragmas=self.pragmas, poolclass=NullPool
+        )
+        try:
+            yield engine
+        finally:
+            engine.dispose()
+
+    def names(self) -> List[str]:
+        """Every workspace that has a database file, open or not."""
+        return sorted(path.stem for path in self.directory.glob("*.db"))
+
+    def open_names(self) -> List[str]:
+        with self._lock:
+            return list(self._engines)
+
+    def close(self) -> None:
+        with self._lock:
+            engines = [engine for engine, _ in self._engines.values()]
+            self._engines.clear()
+        for engine in engines:
+            engine.dispose()
+        self.closed += len(engines)
+
+    def _open(self, name: str) -> Engine:
+        from app.migrations import migrate  # app.migrations imports the models, which import this module
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        engine = create_sqlite_engine(
+            self.url(name),
+            profile=self.profile,
+            pragmas=self.pragmas,
+            pool_size=WORKSPACE_POOL_SIZE,
+            max_overflow=0,
+        )
+        instrument_engine(engine)
+        migrate(engine)
+        self.opened += 1
+        return engine
+
+    def _evict(self, now: float) -> List[Engine]:
+        stale = []
+        # The last entry is the workspace being opened; it always stays.
+        while len(self._engines) > 1:
+            name, (engine, last_used) = next(iter(self._engines.items()))
+            if len(self._engines) <= self.max_engines and now - last_used < self.idle_seconds:
+                break
+            del self._engines[name]
+            stale.append(engine)
+        self.closed += len(stale)
+        return stale
+
+
+workspace_engines = WorkspaceEngines() if WORKSPACES else None
+
+
+def workspace_for(request: Request) -> Optional[str]:
+    """The workspace named by the request's tenant header, or None for the default database."""
+    if workspace_engines is None:
+        return None
+    name = request.headers.get(WORKSPACE_HEADER)
+    if name is None:
+        return None
+    if not WORKSPACE_NAME.fullmatch(name):
+        raise HTTPException(status_code=400, detail="Invalid workspace")
+    return name
+
 
-def get_db():
-    db = SessionLocal()
+def get_db(request: Request):
+    workspace = workspace_for(request)
+    if workspace is None:
+        db = SessionLocal()
+    else:
+        db = SessionLocal(bind=workspace_engines.get(workspace), info={"workspace": workspace})
     try:
         yield db
     finally:
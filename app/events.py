@@ -0,0 +1,131 @@
+"""In-process fan-out of todo mutations to Server-Sent Events subscribers.
+
+Every subscriber owns a bounded queue. Events are encoded once per publish
+and the same bytes are handed to every queue, so an idle subscriber costs a
+parked coroutine and nothing else. A subscriber whose queue fills up is
+dropped: its backlog is replaced with a single `reset` event telling the
+client to reload, and its stream ends.
+"""
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+# Events a subscriber may fall behind by before it is dropped.
+DEFAULT_QUEUE_SIZE = 100
+# Comment lines sent on idle streams keep proxies from timing the connection out.
+HEARTBEAT_SECONDS = 15.0
+# Reconnect delay suggested to EventSource clients, in milliseconds.
+RETRY_MS = 3000
+
+HEARTBEAT = b": ping\n\n"
+RESET = b"event: reset\ndata: {}\n\n"
+
+
+def encode_event(event: str, data: Any) -> bytes:
+    """Encode one SSE message; `data` must already be JSON-serializable."""
+    payload = json.dumps(data, separators=(",", ":"), default=str)
+    return f"event: {event}\ndata: {payload}\n\n".encode()
+
+
+class Subscription:
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(queue_size)
+        self.dropped = False
+
+    async def messages(self) -> AsyncIterator[bytes]:
+        """Yield encoded events; ends after the reset of a dropped subscription."""
+        yield f"retry: {RETRY_MS}\n\n".encode()
+        while True:
+            message = await self.queue.get()
+            yield message
+            if message is RESET:
+                return
+
+
+class Broadcaster:
+    """Fan events out to every live subscription on the server's event loop.
+
+    `publish` may be called from any thread: sync route handlers run in the
+    threadpool, so delivery is handed to the loop with call_soon_threadsafe
+    and costs the publishing thread a single callback, not one per
+    subscriber. Heartbeats come from one shared timer rather than a timeout
+    per subscriber, so an idle subscription is just a coroutine parked on its
+    queue.
+    """
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE, heartbeat: float = HEARTBEAT_SECONDS):
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self.subscriptions: Set[Subscription] = set()
+        self.dropped = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[Subscription]:
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(self.queue_size)
+        self.subscriptions.add(subscription)
+        task = self._heartbeat_task
+        if task is None or task.done() or task.get_loop() is not self._loop:
+            self._heartbeat_task = self._loop.create_task(self._beat())
+        try:
+            yield subscription
+        finally:
+            self.subscriptions.discard(subscription)
+
+    def publish(self, event: str, data: Any) -> None:
+        loop = self._loop
+        if loop is None or not self.subscriptions:
+            return
+        message = encode_event(event, data)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._fan_out(message)
+            return
+        try:
+            loop.call_soon_threadsafe(self._fan_out, message)
+        except RuntimeError:
+            # The loop has shut down; nobody is listening any more.
+            pass
+
+    async def _beat(self) -> None:
+        while self.subscriptions:
+            await asyncio.sleep(self.heartbeat)
+            for subscription in list(self.subscriptions):
+                if subscription.queue.empty():
+                    subscription.queue.put_nowait(HEARTBEAT)
+
+    def _fan_out(self, message: bytes) -> None:
+        for subscription in list(self.subscriptions):
+            try:
+                subscription.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self._drop(subscription)
+
+    def _drop(self, subscription: Subscription) -> None:
+        self.subscriptions.discard(subscription)
+        subscription.dropped = True
+        self.dropped += 1
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(RESET)
+
+
+broadcaster = Broadcaster()
+# Subscribers only hear about their own workspace. A broadcaster holds no
+# resources until someone subscribes, so one per workspace ever seen is cheap.
+workspace_broadcasters: Dict[str, Broadcaster] = {}
+
+
+def broadcaster_for(workspace: Optional[str]) -> Broadcaster:
+    if workspace is None:
+        return broadcaster
+    found = workspace_broadcasters.get(workspace)
+    if found is None:
+        found = workspace_broadcasters.setdefault(workspace, Broadcaster())
+    return found
@@ -0,0 +1,195 @@
+"""Group commit: one writer thread folds concurrent writes into shared transactions.
+
+With AGENTIC_TODO_GROUP_COMMIT=1, while the app runs, TodoService hands each single-statement
+write (see insert_statement and friends in app.services.todo_service) to a
+GroupCommitter instead of committing it on the request's own session. The
+writer thread takes the first queued write, keeps collecting for up to
+`window` seconds or `max_batch` writes, runs each one inside its own SAVEPOINT
+and commits the lot once. N concurrent writers then pay for one commit (one
+fsync under synchronous=FULL) instead of N commits queued behind SQLite's
+single write lock.
+
+Every caller still gets its own outcome: a statement that fails only rolls
+back its savepoint and raises in that caller, while a failed COMMIT raises in
+every caller of the batch. Results are handed back only after the commit, so
+a caller never observes a write that could still be rolled back.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Executable, Row, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config import (
+    DATABASE_URL,
+    GROUP_COMMIT,
+    GROUP_COMMIT_MAX_BATCH,
+    GROUP_COMMIT_WINDOW_MS,
+    SQLITE_PROFILE,
+)
+from app.database import create_sqlite_engine
+
+logger = logging.getLogger("app.group_commit")
+
+_STOP = object()
+
+
+@dataclass
+class PendingWrite:
+    statement: Executable
+    future: "Future[Optional[Row]]" = field(default_factory=Future)
+
+
+def create_writer_engine(
+    url: str, profile: str = SQLITE_PROFILE, pragmas: Optional[Dict[str, Any]] = None
+) -> Engine:
+    """A one-connection engine whose transactions start with BEGIN IMMEDIATE.
+
+    pysqlite does not emit BEGIN before a SAVEPOINT, which would make every
+    savepoint its own transaction; the driver's own transaction handling is
+    switched off and SQLAlchemy's begin event issues BEGIN instead
+    (IMMEDIATE, so the writer holds the write lock for the whole batch).
+    """
+    engine = create_sqlite_engine(
+        url,
+        profile=profile,
+        pragmas=pragmas,
+        pool_size=1,
+        max_overflow=0,
+        connect_args={"check_same_thread": False, "isolation_level": None},
+    )
+
+    @event.listens_for(engine, "begin")
+    def begin_immediate(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return engine
+
+
+class GroupCommitter:
+    def __init__(
+        self,
+        url: str = DATABASE_URL,
+        window: float = GROUP_COMMIT_WINDOW_MS / 1000,
+        max_batch: int = GROUP_COMMIT_MAX_BATCH,
+        profile: str = SQLITE_PROFILE,
+        pragmas: Optional[Dict[str, Any]] = None,
+    ):
+        self.window = window
+        self.max_batch = max_batch
+        self.engine = create_writer_engine(url, profile, pragmas)
+        self.Session = sessionmaker(bind=self.engine, autoflush=False)
+        self.batches = 0
+        self.writes = 0
+        self._queue: "queue.SimpleQueue[object]" = queue.SimpleQueue()
+        # Held to enqueue and to close, so nothing is queued behind _STOP.
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+        self._thread.start()
+
+    def enqueue(self, statement: Executable) -> "Future[Optional[Row]]":
+        """Queue a write; the future resolves to its RETURNING row once committed."""
+        pending = PendingWrite(statement)
+        with self._lock:
+            if self._closed or not self._thread.is_alive():
+                raise RuntimeError("GroupCommitter is closed")
+            self._queue.put(pending)
+        return pending.future
+
+    def submit(self, statement: Executable) -> Optional[Row]:
+        """Queue a write and block until its batch has committed."""
+        return self.enqueue(statement).result()
+
+    def close(self) -> None:
+        """Commit everything already queued, then stop the writer thread."""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(_STOP)
+        self._thread.join()
+        # Only a writer thread that died early leaves writes behind; fail
+        # them rather than leave their callers waiting.
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, PendingWrite):
+                item.future.set_exception(RuntimeError("GroupCommitter is closed"))
+        self.engine.dispose()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._commit(batch)
+
+    def _commit(self, batch: List[PendingWrite]) -> None:
+        outcomes = []
+        try:
+            with self.Session() as db:
+                for pending in batch:
+                    try:
+                        with db.begin_nested():
+                            outcomes.append((pending, db.execute(pending.statement).one_or_none()))
+                    except Exception as exc:
+                        outcomes.append((pending, exc))
+                db.commit()
+        except Exception as exc:
+            logger.exception("group commit of %d writes failed", len(batch))
+            for pending in batch:
+                pending.future.set_exception(exc)
+            return
+        self.batches += 1
+        self.writes += len(batch)
+        for pending, outcome in outcomes:
+            if isinstance(outcome, Exception):
+                pending.future.set_exception(outcome)
+            else:
+                pending.future.set_result(outcome)
+
+
+def create_group_committer(enabled: bool = GROUP_COMMIT) -> Optional[GroupCommitter]:
+    """The app's writer, or None when group commit is off."""
+    return GroupCommitter() if enabled else None
+
+
+# The app's writer while the app runs: set by start() and cleared by stop(),
+# which the app's lifespan calls (see app.main). Until then, and whenever
+# group commit is off, writes commit on the request's own session.
+group_committer: Optional[GroupCommitter] = None
+
+
+def start() -> None:
+    """Start the app's writer, if group commit is on."""
+    global group_committer
+    if group_committer is None:
+        group_committer = create_group_committer()
+
+
+def stop() -> None:
+    """Commit what is queued and stop the writer thread."""
+    global group_committer
+    writer, group_committer = group_committer, None
+    if writer is not None:
+        writer.close()
@@ -0,0 +1,196 @@
+"""Per-request SQL accounting: statement count, DB time and slowest statements.
+
+instrument_engine() hooks an engine's cursor events. Statements are charged
+to the QueryStats of the current request, found through a context variable
+that the middleware sets and that Starlette copies into the threadpool for
+sync handlers. The middleware reports each request as a Server-Timing
+header and as one JSON log line on the "app.sql" logger.
+
+QueryBudget charges statements globally instead, so tests can cap what an
+endpoint issues even though TestClient runs the app on another thread.
+"""
+import heapq
+import json
+import logging
+import threading
+import time
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import SQL_SLOW_REQUEST_MS
+
+logger = logging.getLogger("app.sql")
+
+# How many of a request's slowest statements are kept for its log line.
+SLOWEST_KEPT = 3
+# Statement text longer than this is cut short in logs and budget errors.
+STATEMENT_PREVIEW_CHARS = 200
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self._slowest: List[Tuple[float, int, str]] = []
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.seconds += seconds
+            entry = (seconds, self.count, statement)
+            if len(self._slowest) < SLOWEST_KEPT:
+                heapq.heappush(self._slowest, entry)
+            else:
+                heapq.heappushpop(self._slowest, entry)
+
+    @property
+    def milliseconds(self) -> float:
+        return self.seconds * 1000
+
+    def slowest(self) -> List[Dict[str, Any]]:
+        return [
+            {"ms": round(seconds * 1000, 3), "sql": preview(statement)}
+            for seconds, _, statement in sorted(self._slowest, reverse=True)
+        ]
+
+
+current_queries: ContextVar[Optional[QueryStats]] = ContextVar("current_queries", default=None)
+_active_budgets: List["QueryBudget"] = []
+
+
+def preview(statement: str) -> str:
+    statement = " ".join(statement.split())
+    if len(statement) > STATEMENT_PREVIEW_CHARS:
+        return statement[:STATEMENT_PREVIEW_CHARS] + "..."
+    return statement
+
+
+# The start time lives on the statement's execution context rather than the
+# connection: a statement that raises never reaches the after hook, and its
+# context is discarded with it instead of leaving a stale entry behind.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - context._query_started
+    stats = current_queries.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+    for budget in _active_budgets:
+        budget.stats.record(statement, seconds)
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    """Charge every statement run on `engine` to the current request. Idempotent."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    return engine
+
+
+def server_timing(stats: QueryStats, total_seconds: float) -> str:
+    queries = "1 query" if stats.count == 1 else f"{stats.count} queries"
+    return (
+        f'db;dur={stats.milliseconds:.2f};desc="{queries}", '
+        f"app;dur={total_seconds * 1000:.2f}"
+    )
+
+
+class QueryMetricsMiddleware:
+    """ASGI middleware that measures the SQL issued while handling a request.
+
+    Pure ASGI rather than BaseHTTPMiddleware so the context variable reaches
+    the handler and streaming bodies are passed through untouched. Headers go
+    out before a streamed body is produced, so Server-Timing covers the
+    handler; the log line covers the whole response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_queries.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timing = server_timing(stats, time.perf_counter() - started)
+                message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_queries.reset(token)
+            self.log(scope, status, stats, time.perf_counter() - started)
+
+    @staticmethod
+    def log(scope, status: int, stats: QueryStats, seconds: float) -> None:
+        level = logging.WARNING if stats.milliseconds >= SQL_SLOW_REQUEST_MS else logging.INFO
+        if not logger.isEnabledFor(level):
+            return
+        logger.log(
+            level,
+            json.dumps(
+                {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status,
+                    "statements": stats.count,
+                    "db_ms": round(stats.milliseconds, 3),
+                    "total_ms": round(seconds * 1000, 3),
+                    "slowest": stats.slowest(),
+                }
+            ),
+        )
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryBudget(ContextDecorator):
+    """Fail when more than `statements` SQL statements run inside the block.
+
+        with QueryBudget(2):
+            client.get("/api/todos")
+
+        @QueryBudget(2)
+        def test_list(client): ...
+
+    Counts every statement on instrumented engines from any thread, so keep
+    concurrent work out of the block.
+    """
+
+    def __init__(self, statements: int):
+        self.statements = statements
+        self.stats = QueryStats()
+
+    def __enter__(self) -> "QueryBudget":
+        self.stats = QueryStats()
+        _active_budgets.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        _active_budgets.remove(self)
+        if exc_type is None and self.stats.count > self.statements:
+            slowest = "\n".join(f"  {s['ms']} ms: {s['sql']}" for s in self.stats.slowest())
+            raise QueryBudgetExceeded(
+                f"{self.stats.count} statements issued, budget is {self.statements}. "
+                f"Slowest:\n{slowest}"
+            )
+        return False
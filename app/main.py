@@ -1,13 +1,76 @@
+"""Agentic Todo.
+
+    uvicorn app.main:app                      # or: uvicorn --factory app.main:create_app
+
+Importing this module is cheap: `app` is built by create_app() on first
+access, and that is where routers, templates and static files are set up.
+The group-commit writer thread starts with the app, not at import.
+
+Schema migrations are a deploy step that runs before the workers start:
+
+    python -m app.migrations && uvicorn app.main:app
+
+With AGENTIC_TODO_MIGRATE_ON_STARTUP=1 (or create_app(migrate=True)) the app
+applies pending migrations itself when it starts instead.
+"""
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 
-from app.database import engine, Base
-from app.routers import api, web
+from app.config import MIGRATE_ON_STARTUP
+
+
+def create_app(async_api: bool = False, migrate: bool = MIGRATE_ON_STARTUP) -> FastAPI:
+    """Build the app. With `async_api`, /api is served by app.routers.async_api.
+
+    Startup migrates the default database when `migrate` is set and starts
+    the group-commit writer; shutdown releases the writer thread, workspace
+    engines and metrics of this worker.
+    """
+    # Imported here so that importing this module, or app.async_main, loads
+    # nothing but the routers of the app that is actually built.
+    from fastapi.staticfiles import StaticFiles
+
+    from app import database, group_commit, migrations
+    from app.instrumentation import QueryMetricsMiddleware
+    from app.metrics import MetricsMiddleware, mark_worker_dead
+    from app.routers import metrics, web
+
+    if async_api:
+        from app.routers import async_api as api
+    else:
+        from app.routers import api
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        if migrate:
+            migrations.migrate(database.engine)
+        group_commit.start()
+        yield
+        mark_worker_dead()
+        group_commit.stop()
+        if database.workspace_engines is not None:
+            database.workspace_engines.close()
 
-Base.metadata.create_all(bind=engine)
+    app = FastAPI(
+        title="Agentic Todo",
+        description="Todo app with agentic skill recommendations",
+        lifespan=lifespan,
+    )
+    app.add_middleware(QueryMetricsMiddleware)
+    # Added last so it runs outermost and times the SQL accounting too.
+    app.add_middleware(MetricsMiddleware)
+    app.mount("/static", StaticFiles(directory="app/static"), name="static")
+    app.include_router(api.router)
+    app.include_router(web.router)
+    app.include_router(metrics.router)
+    return app
 
-app = FastAPI(title="Agentic Todo", description="Todo app with agentic skill recommendations")
 
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
-app.include_router(api.router)
-app.include_router(web.router)
+def __getattr__(name: str):
+    # `uvicorn app.main:app` and `from app.main import app` build the app on
+    # first use rather than at import.
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
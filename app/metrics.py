@@ -0,0 +1,154 @@
+"""Prometheus metrics for the app, served as text at /metrics.
+
+Works under several uvicorn workers when PROMETHEUS_MULTIPROC_DIR points at
+an empty directory shared by the workers (and wiped before they start):
+prometheus_client then keeps every value in per-process mmap files and
+/metrics merges them, whichever worker answers the scrape.
+
+Label values are bounded: routes are reported by their path template
+("/api/todos/{todo_id}"), never the raw path, and requests that match no
+route share the label "unmatched".
+"""
+import os
+import time
+
+from fastapi.templating import Jinja2Templates
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+# Finer than the client default at the low end: most routes answer in
+# single-digit milliseconds.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time from request start until the response body is sent.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection.",
+    buckets=POOL_WAIT_BUCKETS,
+)
+POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured connection pool size, summed over live workers.",
+    multiprocess_mode="livesum",
+)
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool.",
+    multiprocess_mode="livesum",
+)
+CACHE_EVENTS = Counter(
+    "todo_cache_events_total",
+    "Cache lookups and removals by result (hit, miss, eviction, expiration).",
+    ["backend", "event"],
+)
+TEMPLATE_RENDER = Histogram(
+    "template_render_seconds",
+    "Time spent rendering a Jinja2 template.",
+    ["template"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+def instrument_pool(engine: Engine) -> Engine:
+    if isinstance(engine.pool, QueuePool):
+        POOL_SIZE.inc(engine.pool.size())
+    event.listen(engine, "checkout", lambda *args: POOL_CHECKED_OUT.inc())
+    event.listen(engine, "checkin", lambda *args: POOL_CHECKED_OUT.dec())
+    return engine
+
+
+class InstrumentedTemplates(Jinja2Templates):
+    """Jinja2Templates whose TemplateResponse records render time per template.
+
+    Starlette renders the template while building the response, so timing
+    the constructor times the render.
+    """
+
+    def TemplateResponse(self, *args, **kwargs):
+        name = kwargs.get("name") or next(arg for arg in args if isinstance(arg, str))
+        started = time.perf_counter()
+        try:
+            return super().TemplateResponse(*args, **kwargs)
+        finally:
+            TEMPLATE_RENDER.labels(name).observe(time.perf_counter() - started)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency and in-flight requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        in_flight = REQUESTS_IN_FLIGHT.labels(method)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            # The router adds the matched route to the scope on its way in.
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                method, getattr(route, "path", "unmatched"), status
+            ).observe(time.perf_counter() - started)
+
+
+def render_metrics() -> bytes:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_worker_dead() -> None:
+    """Drop this worker's live gauges from the multiprocess directory."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,150 @@
+"""Schema migrations, numbered by SQLite's PRAGMA user_version.
+
+    python -m app.migrations            # bring AGENTIC_TODO_DATABASE_URL up to date
+    python -m app.migrations --check    # exit 1 if migrations are pending
+
+MIGRATIONS[n - 1] takes a database from version n - 1 to n. Each step runs in
+its own BEGIN IMMEDIATE transaction together with the user_version bump, so a
+step that fails leaves the database at the version before it, and workers
+migrating at the same moment take turns: the later ones find the work done.
+
+The first step creates the schema from the current models, so a new database
+may already have what a later step adds. Steps therefore check before they
+change anything. Append new steps; never edit one that has shipped.
+"""
+import argparse
+import sys
+from typing import Callable, List
+
+from sqlalchemy import MetaData
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateTable
+
+from app.config import DATABASE_URL
+from app.database import Base, create_sqlite_engine
+from app.models import BACKFILL_TODO_CHANGES, Todo
+
+Migration = Callable[[Connection], None]
+
+
+def create_schema(conn: Connection) -> None:
+    """Every table, trigger and search index that is missing.
+
+    Databases from before migrations were created the same way, by create_all
+    at import, so for them this only adds the tables added since.
+    """
+    Base.metadata.create_all(conn)
+
+
+def create_missing_indexes(conn: Connection) -> None:
+    """Indexes added to a table after the table was created.
+
+    create_all skips existing tables along with their indexes, so older files
+    lack e.g. ix_todos_completed_due_date.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def autoincrement_todos(conn: Connection) -> None:
+    """Rebuild todos with AUTOINCREMENT if it was created without it.
+
+    Without it SQLite hands out max(id) + 1, reusing the ids of the newest
+    todos once they are deleted or archived. The sequence starts above every
+    id the table, the archive and the change log have seen.
+    """
+    sql = conn.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'todos'"
+    ).scalar_one()
+    if "AUTOINCREMENT" in sql.upper():
+        return
+    rebuilt = Todo.__table__.to_metadata(MetaData(), name="todos_rebuild")
+    columns = ", ".join(column.name for column in rebuilt.columns)
+    conn.execute(CreateTable(rebuilt))
+    conn.exec_driver_sql(f"INSERT INTO todos_rebuild ({columns}) SELECT {columns} FROM todos")
+    # Drops the table's indexes and triggers too; todos_fts keeps its rows,
+    # which follow the ids rather than the table.
+    conn.exec_driver_sql("DROP TABLE todos")
+    conn.exec_driver_sql("ALTER TABLE todos_rebuild RENAME TO todos")
+    conn.exec_driver_sql("DELETE FROM sqlite_sequence WHERE name = 'todos'")
+    conn.exec_driver_sql(
+        """
+        INSERT INTO sqlite_sequence (name, seq) SELECT 'todos', max(
+            (SELECT coalesce(max(id), 0) FROM todos),
+            (SELECT coalesce(max(id), 0) FROM todos_archive),
+            (SELECT coalesce(max(todo_id), 0) FROM todo_changes)
+        )
+        """
+    )
+    Base.metadata.create_all(conn)
+    create_missing_indexes(conn)
+
+
+def backfill_change_log(conn: Connection) -> None:
+    """Log todos that predate todo_changes, which create_schema did not do
+    for files upgraded before the backfill was part of the schema."""
+    conn.exec_driver_sql(BACKFILL_TODO_CHANGES)
+
+
+MIGRATIONS: List[Migration] = [
+    create_schema,
+    create_missing_indexes,
+    autoincrement_todos,
+    backfill_change_log,
+]
+
+
+def schema_version(conn: Connection) -> int:
+    return conn.exec_driver_sql("PRAGMA user_version").scalar_one()
+
+
+def pending(engine: Engine) -> int:
+    """How many migrations the database is behind."""
+    with engine.connect() as conn:
+        return max(len(MIGRATIONS) - schema_version(conn), 0)
+
+
+def migrate(engine: Engine) -> List[int]:
+    """Apply pending migrations; returns the versions applied, oldest first.
+
+    An up-to-date database costs one PRAGMA read and takes no lock.
+    """
+    applied: List[int] = []
+    if not pending(engine):
+        return applied
+    while True:
+        with engine.connect() as conn:
+            # pysqlite only opens transactions before DML; DDL has to be
+            # inside one explicitly to roll back with the rest of the step.
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+            version = schema_version(conn)
+            if version >= len(MIGRATIONS):
+                conn.rollback()
+                return applied
+            MIGRATIONS[version](conn)
+            conn.exec_driver_sql(f"PRAGMA user_version = {version + 1}")
+            conn.commit()
+        applied.append(version + 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    parser.add_argument("--check", action="store_true", help="only report pending migrations")
+    args = parser.parse_args()
+
+    engine = create_sqlite_engine(args.database_url)
+    try:
+        if args.check:
+            behind = pending(engine)
+            print(f"{behind} pending migration(s)")
+            sys.exit(1 if behind else 0)
+        applied = migrate(engine)
+        print(f"applied {applied}" if applied else "up to date")
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
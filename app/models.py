@@ -2,7 +2,9 @@ import enum
 from datetime import datetime, date
 from typing import Optional
 
-from sqlalchemy import String, Text, Boolean, Date, DateTime, Enum
+from sqlalchemy import (
+    DDL, String, Text, Boolean, Date, DateTime, Enum, Index, Integer, column, event, table
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -22,8 +24,8 @@ class Priority(str, enum.Enum):
     HIGH = "high"
 
 
-class Todo(Base):
-    __tablename__ = "todos"
+class TodoColumns:
+    """Columns shared by the hot todos table and its archive."""
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(200))
@@ -36,3 +38,244 @@ class Todo(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
+
+
+class Todo(TodoColumns, Base):
+    __tablename__ = "todos"
+    # Every list query sorts by (created_at, id); each filter column leads an
+    # index ending in created_at so filtered pages are read in order. SQLite
+    # appends the rowid (id) to every index, which covers the id tiebreak.
+    # AUTOINCREMENT keeps ids of archived todos from being handed out again.
+    __table_args__ = (
+        Index("ix_todos_created_at", "created_at"),
+        Index("ix_todos_phase_created_at", "phase", "created_at"),
+        Index("ix_todos_priority_created_at", "priority", "created_at"),
+        Index("ix_todos_completed_created_at", "completed", "created_at"),
+        Index("ix_todos_phase_completed_created_at", "phase", "completed", "created_at"),
+        Index("ix_todos_due_date", "due_date"),
+        # Overdue and due-soon lists: open todos in due_date order.
+        Index("ix_todos_completed_due_date", "completed", "due_date"),
+        {"sqlite_autoincrement": True},
+    )
+
+
+class ArchivedTodo(TodoColumns, Base):
+    """Completed todos moved out of `todos` by app.services.archive.
+
+    Rows keep their id and every column; they are only read, by list and
+    search calls that ask for include_archived. Everything archived is
+    completed, so only the filters that can still narrow it are indexed.
+    """
+
+    __tablename__ = "todos_archive"
+    __table_args__ = (
+        Index("ix_todos_archive_created_at", "created_at"),
+        Index("ix_todos_archive_phase_created_at", "phase", "created_at"),
+    )
+
+    archived_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class TableVersion(Base):
+    """Change counter per table, bumped by SQLite triggers on every write.
+
+    Reading it is a primary-key lookup, which makes it a cheap validator for
+    list responses (ETags) no matter how large the table grows.
+    """
+
+    __tablename__ = "table_versions"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class TodoChange(Base):
+    """Append-only log of writes to todos, one row per insert, update or delete.
+
+    Rows are written by SQLite triggers, so every write path (single CRUD,
+    batches, imports) is logged. `seq` is AUTOINCREMENT so values are never
+    reused after old entries are compacted away.
+    """
+
+    __tablename__ = "todo_changes"
+    __table_args__ = (
+        Index("ix_todo_changes_todo_id_seq", "todo_id", "seq"),
+        {"sqlite_autoincrement": True},
+    )
+
+    seq: Mapped[int] = mapped_column(primary_key=True)
+    todo_id: Mapped[int] = mapped_column(Integer)
+    op: Mapped[str] = mapped_column(String(10))
+    changed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class DueDateCount(Base):
+    """How many todos, and how many open ones, fall due on each day.
+
+    Maintained by SQLite triggers on todos, so calendar views read one row
+    per day instead of counting todos. Days whose todos are all gone keep a
+    row of zeros. Archived todos no longer count.
+    """
+
+    __tablename__ = "due_date_counts"
+
+    due_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    total: Mapped[int] = mapped_column(Integer, default=0)
+    open: Mapped[int] = mapped_column(Integer, default=0)
+
+
+# Trigger bodies adding a todo to, or taking it off, its day's counts.
+_COUNT_DUE_DATE = """
+    INSERT INTO due_date_counts (due_date, total, open)
+    VALUES (new.due_date, 1, NOT new.completed)
+    ON CONFLICT (due_date) DO UPDATE SET total = total + 1, open = open + excluded.open;
+"""
+_UNCOUNT_DUE_DATE = """
+    UPDATE due_date_counts SET total = total - 1, open = open - (NOT old.completed)
+    WHERE due_date = old.due_date;
+"""
+
+# Log todos that predate the change log, so a sync from since=0 sees every
+# todo. Compaction always keeps each todo's newest entry, so the log is only
+# empty while it has never recorded anything.
+BACKFILL_TODO_CHANGES = """
+    INSERT INTO todo_changes (todo_id, op, changed_at)
+    SELECT id, 'insert', coalesce(updated_at, created_at) FROM todos
+    WHERE NOT EXISTS (SELECT 1 FROM todo_changes)
+    ORDER BY id
+"""
+
+SQLITE_SCHEMA_DDL = [
+    "INSERT OR IGNORE INTO table_versions (name, version) VALUES ('todos', 0)",
+    # For the change log the counter is the compaction horizon instead: the
+    # highest seq whose tombstone may already have been dropped.
+    "INSERT OR IGNORE INTO table_versions (name, version) VALUES ('todo_changes', 0)",
+    *(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS todos_version_{action.lower()}
+        AFTER {action} ON todos
+        BEGIN
+            UPDATE table_versions SET version = version + 1 WHERE name = 'todos';
+        END
+        """
+        for action in ("INSERT", "UPDATE", "DELETE")
+    ),
+    *(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS todos_change_{action.lower()}
+        AFTER {action} ON todos
+        BEGIN
+            INSERT INTO todo_changes (todo_id, op, changed_at)
+            VALUES ({row}.id, '{action.lower()}', strftime('%%Y-%%m-%%d %%H:%%M:%%f', 'now'));
+        END
+        """
+        for action, row in (("INSERT", "new"), ("UPDATE", "new"), ("DELETE", "old"))
+    ),
+    BACKFILL_TODO_CHANGES,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS todos_due_date_insert
+    AFTER INSERT ON todos WHEN new.due_date IS NOT NULL
+    BEGIN {_COUNT_DUE_DATE} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS todos_due_date_delete
+    AFTER DELETE ON todos WHEN old.due_date IS NOT NULL
+    BEGIN {_UNCOUNT_DUE_DATE} END
+    """,
+    # The two halves check their own side, so a due date that is set or
+    # cleared only counts or uncounts.
+    f"""
+    CREATE TRIGGER IF NOT EXISTS todos_due_date_update_old
+    AFTER UPDATE OF due_date, completed ON todos
+    WHEN old.due_date IS NOT NULL
+        AND (old.due_date IS NOT new.due_date OR old.completed IS NOT new.completed)
+    BEGIN {_UNCOUNT_DUE_DATE} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS todos_due_date_update_new
+    AFTER UPDATE OF due_date, completed ON todos
+    WHEN new.due_date IS NOT NULL
+        AND (old.due_date IS NOT new.due_date OR old.completed IS NOT new.completed)
+    BEGIN {_COUNT_DUE_DATE} END
+    """,
+    # Count rows that predate the summary table, as for todos_fts below.
+    """
+    INSERT INTO due_date_counts (due_date, total, open)
+    SELECT due_date, count(*), sum(NOT completed) FROM todos
+    WHERE due_date IS NOT NULL
+        AND NOT EXISTS (SELECT 1 FROM due_date_counts)
+    GROUP BY due_date
+    """,
+    # Full-text index over title and description. It is an external-content
+    # table: the text lives only in todos and the triggers below keep the
+    # index in step with every insert, delete and text edit.
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS todos_fts USING fts5(
+        title, description,
+        content='todos', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    # Index rows that predate the search table (an empty index over a
+    # non-empty table); a no-op on every later startup.
+    """
+    INSERT INTO todos_fts(todos_fts)
+    SELECT 'rebuild'
+    WHERE NOT EXISTS (SELECT 1 FROM todos_fts_docsize) AND EXISTS (SELECT 1 FROM todos)
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_fts_insert AFTER INSERT ON todos
+    BEGIN
+        INSERT INTO todos_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_fts_delete AFTER DELETE ON todos
+    BEGIN
+        INSERT INTO todos_fts(todos_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_fts_update AFTER UPDATE OF title, description ON todos
+    BEGIN
+        INSERT INTO todos_fts(todos_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO todos_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    # Search over the archive, for include_archived; same tokenizer as todos_fts.
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS todos_archive_fts USING fts5(
+        title, description,
+        content='todos_archive', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    # Archived rows are never edited, only inserted (and deleted by hand).
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_archive_fts_insert AFTER INSERT ON todos_archive
+    BEGIN
+        INSERT INTO todos_archive_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_archive_fts_delete AFTER DELETE ON todos_archive
+    BEGIN
+        INSERT INTO todos_archive_fts(todos_archive_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+]
+
+for statement in SQLITE_SCHEMA_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+# The FTS5 table is created by the DDL above, not by the metadata, so queries
+# reach it through a lightweight table clause. `todos_fts` is its hidden
+# column of the same name, the left-hand side of MATCH.
+todos_fts = table("todos_fts", column("rowid"), column("todos_fts"))
+todos_archive_fts = table("todos_archive_fts", column("rowid"), column("todos_archive_fts"))
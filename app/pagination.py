@@ -0,0 +1,45 @@
+import base64
+import json
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(*values: Any) -> str:
+    """Pack keyset values into an opaque, URL-safe token."""
+    raw = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+    if not isinstance(values, list):
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+
+def next_cursor(
+    rows: Sequence[Any],
+    limit: Optional[int],
+    key: Optional[Callable[[Any], Tuple[Any, ...]]] = None,
+) -> Optional[str]:
+    """Cursor for the page after `rows`, or None when the page was not full.
+
+    `key` returns the keyset values of a row; the default matches the
+    (created_at, id) order of the list endpoints.
+    """
+    if limit is None or len(rows) < limit:
+        return None
+    last = rows[-1]
+    if key is not None:
+        return encode_cursor(*key(last))
+    return encode_cursor(last.created_at.isoformat(), last.id)
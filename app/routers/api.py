@@ -1,50 +1,418 @@
-from typing import List, Optional
+import io
+import tempfile
+from datetime import date, datetime, timedelta
+from typing import Callable, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.models import Phase, Priority
+from app.config import (
+    ARCHIVE_AFTER_DAYS,
+    ARCHIVE_BATCH_SIZE,
+    CHANGE_LOG_RETENTION_DAYS,
+    FAST_JSON,
+)
+from app.database import get_db, workspace_engines, workspace_for
+from app.cache import todo_cache
+from app.events import broadcaster, broadcaster_for
+from app.models import Phase, Priority, Todo
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursor, next_cursor
 from app.schemas import (
     TodoCreate,
     TodoUpdate,
     TodoResponse,
     PhaseResponse,
-    SkillResponse,
+    TodoBatchRequest,
+    TodoBatchResponse,
+    TodoImportResponse,
+    TodoArchiveReport,
+    TodoStats,
+    TodoSearchHit,
+    TodoChangesResponse,
+    ChangeLogCompaction,
+    CacheStats,
+    CalendarBucket,
+    DueDateBucket,
+    WorkspaceSummary,
+)
+from app.services import importer, workspaces
+from app.services.export import EXPORTERS, MEDIA_TYPES, ExportFormat
+from app.services.cached_todo_service import todo_service_for
+from app.services.todo_service import (
+    ChangesExpired,
+    TodoService,
+    due_key,
+    search_dict_key,
+    search_key,
+    todo_dict_key,
 )
-from app.services.todo_service import TodoService
-from app.config import PHASE_SKILLS, get_skills_for_phase
+from app.catalog import PHASE_ETAGS, PHASE_JSON, PHASES_ETAG, PHASES_JSON
+from app.http_cache import is_conditional, is_not_modified, make_etag, not_modified, validator_headers
 
 router = APIRouter(prefix="/api", tags=["api"])
 
+# Uploads larger than this are spooled to a temporary file instead of memory.
+IMPORT_SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
 
 def get_todo_service(db: Session = Depends(get_db)) -> TodoService:
-    return TodoService(db)
+    return todo_service_for(db)
 
 
 @router.post("/todos", response_model=TodoResponse, status_code=status.HTTP_201_CREATED)
 def create_todo(data: TodoCreate, service: TodoService = Depends(get_todo_service)):
     todo = service.create(data)
-    return service.get_with_skills(todo.id)
+    if FAST_JSON:
+        return ORJSONResponse(service.to_dict(todo), status_code=status.HTTP_201_CREATED)
+    return service.to_response(todo)
+
+
+@router.post("/todos:batch", response_model=TodoBatchResponse)
+def batch_todos(batch: TodoBatchRequest, service: TodoService = Depends(get_todo_service)):
+    return TodoBatchResponse(results=service.apply_batch(batch))
 
 
 @router.get("/todos", response_model=List[TodoResponse])
 def list_todos(
+    request: Request,
+    response: Response,
+    phase: Optional[Phase] = None,
+    priority: Optional[Priority] = None,
+    completed: Optional[bool] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_archived: bool = False,
+    service: TodoService = Depends(get_todo_service),
+):
+    etag = make_etag(
+        "todos",
+        service.table_version(),
+        phase,
+        priority,
+        completed,
+        limit,
+        cursor,
+        include_archived,
+    )
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    headers = validator_headers(etag)
+    try:
+        if FAST_JSON:
+            todos = service.list_dicts(
+                phase=phase,
+                priority=priority,
+                completed=completed,
+                limit=limit,
+                cursor=cursor,
+                include_archived=include_archived,
+            )
+            cursor = next_cursor(todos, limit, key=todo_dict_key)
+        else:
+            todos = service.list_with_skills(
+                phase=phase,
+                priority=priority,
+                completed=completed,
+                limit=limit,
+                cursor=cursor,
+                include_archived=include_archived,
+            )
+            cursor = next_cursor(todos, limit)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor:
+        headers["X-Next-Cursor"] = cursor
+    if FAST_JSON:
+        return ORJSONResponse(todos, headers=headers)
+    response.headers.update(headers)
+    return todos
+
+
+@router.get("/todos/search", response_model=List[TodoSearchHit])
+def search_todos(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    phase: Optional[Phase] = None,
+    priority: Optional[Priority] = None,
+    completed: Optional[bool] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_archived: bool = False,
+    service: TodoService = Depends(get_todo_service),
+):
+    etag = make_etag(
+        "search",
+        service.table_version(),
+        q,
+        phase,
+        priority,
+        completed,
+        limit,
+        cursor,
+        include_archived,
+    )
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    headers = validator_headers(etag)
+    try:
+        if FAST_JSON:
+            hits = service.search_dicts(
+                q,
+                phase=phase,
+                priority=priority,
+                completed=completed,
+                limit=limit,
+                cursor=cursor,
+                include_archived=include_archived,
+            )
+            cursor = next_cursor(hits, limit, key=search_dict_key)
+        else:
+            hits = service.search_with_skills(
+                q,
+                phase=phase,
+                priority=priority,
+                completed=completed,
+                limit=limit,
+                cursor=cursor,
+                include_archived=include_archived,
+            )
+            cursor = next_cursor(hits, limit, key=search_key)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor:
+        headers["X-Next-Cursor"] = cursor
+    if FAST_JSON:
+        return ORJSONResponse(hits, headers=headers)
+    response.headers.update(headers)
+    return hits
+
+
+def due_page(
+    request: Request,
+    response: Response,
+    service: TodoService,
+    etag_parts: tuple,
+    load: Callable[[], List[Todo]],
+    limit: int,
+):
+    etag = make_etag("due", service.table_version(), *etag_parts)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    headers = validator_headers(etag)
+    try:
+        todos = load()
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    cursor = next_cursor(todos, limit, key=due_key)
+    if cursor:
+        headers["X-Next-Cursor"] = cursor
+    if FAST_JSON:
+        return ORJSONResponse([service.to_dict(todo) for todo in todos], headers=headers)
+    response.headers.update(headers)
+    return [service.to_response(todo) for todo in todos]
+
+
+@router.get("/todos/overdue", response_model=List[TodoResponse])
+def overdue_todos(
+    request: Request,
+    response: Response,
+    phase: Optional[Phase] = None,
+    priority: Optional[Priority] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    service: TodoService = Depends(get_todo_service),
+):
+    """Open todos whose due date has passed, most overdue first."""
+    today = date.today()
+    return due_page(
+        request,
+        response,
+        service,
+        ("overdue", today, phase, priority, limit, cursor),
+        lambda: service.overdue(
+            today=today, phase=phase, priority=priority, limit=limit, cursor=cursor
+        ),
+        limit,
+    )
+
+
+@router.get("/todos/due", response_model=List[TodoResponse])
+def due_soon_todos(
+    request: Request,
+    response: Response,
+    within_days: int = Query(7, ge=0, le=366),
+    phase: Optional[Phase] = None,
+    priority: Optional[Priority] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    service: TodoService = Depends(get_todo_service),
+):
+    """Open todos due today or within `within_days` days, soonest first."""
+    today = date.today()
+    return due_page(
+        request,
+        response,
+        service,
+        ("soon", today, within_days, phase, priority, limit, cursor),
+        lambda: service.due_soon(
+            within_days, today=today, phase=phase, priority=priority, limit=limit, cursor=cursor
+        ),
+        limit,
+    )
+
+
+@router.get("/todos/calendar", response_model=List[DueDateBucket])
+def due_calendar(
+    request: Request,
+    response: Response,
+    start: date,
+    end: date,
+    bucket: CalendarBucket = CalendarBucket.DAY,
+    service: TodoService = Depends(get_todo_service),
+):
+    """Todos and open todos due per day or week between `start` and `end`."""
+    if end < start:
+        raise HTTPException(status_code=400, detail="end is before start")
+    etag = make_etag("calendar", service.table_version(), start, end, bucket)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers.update(validator_headers(etag))
+    return service.due_date_counts(start, end, bucket)
+
+
+@router.get("/stats", response_model=TodoStats)
+def get_stats(service: TodoService = Depends(get_todo_service)):
+    return service.stats()
+
+
+@router.get("/changes", response_model=TodoChangesResponse)
+def list_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    service: TodoService = Depends(get_todo_service),
+):
+    try:
+        return service.changes_since(since, limit=limit)
+    except ChangesExpired:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Changes since this position were compacted; resync from since=0",
+        )
+
+
+@router.post("/changes:compact", response_model=ChangeLogCompaction)
+def compact_changes(
+    retention_days: int = Query(CHANGE_LOG_RETENTION_DAYS, ge=0),
+    service: TodoService = Depends(get_todo_service),
+):
+    return service.compact_changes(timedelta(days=retention_days))
+
+
+@router.post("/todos:archive", response_model=TodoArchiveReport)
+def archive_todos(
+    older_than_days: int = Query(ARCHIVE_AFTER_DAYS, ge=0),
+    batch_size: int = Query(ARCHIVE_BATCH_SIZE, ge=1, le=10_000),
+    service: TodoService = Depends(get_todo_service),
+):
+    """Move completed todos untouched for `older_than_days` out of the hot table.
+
+    Runs in batches of `batch_size`, then releases the freed pages with
+    incremental_vacuum. Archived todos are only returned by list and search
+    with include_archived=true.
+    """
+    return service.archive_completed(timedelta(days=older_than_days), batch_size)
+
+
+@router.get("/cache", response_model=CacheStats)
+def cache_stats():
+    if todo_cache is None:
+        raise HTTPException(status_code=404, detail="Cache disabled")
+    return todo_cache.stats()
+
+
+@router.get("/workspaces", response_model=WorkspaceSummary)
+def workspace_summary():
+    """Todo stats of every workspace and their sum, read in parallel."""
+    if workspace_engines is None:
+        raise HTTPException(status_code=404, detail="Workspaces disabled")
+    return workspaces.summarize(workspace_engines)
+
+
+@router.get("/todos/export")
+def export_todos(
+    format: ExportFormat = ExportFormat.NDJSON,
     phase: Optional[Phase] = None,
     priority: Optional[Priority] = None,
     completed: Optional[bool] = None,
     service: TodoService = Depends(get_todo_service),
 ):
-    todos = service.list(phase=phase, priority=priority, completed=completed)
-    return [service.get_with_skills(todo.id) for todo in todos]
+    # The request session is closed once the handler returns, before the body
+    # streams, so the generator reads through its own session on the same bind.
+    bind = service.db.get_bind()
+
+    def generate():
+        with Session(bind=bind) as db:
+            rows = TodoService(db).iter_rows(phase=phase, priority=priority, completed=completed)
+            yield from EXPORTERS[format](rows)
+
+    return StreamingResponse(
+        generate(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="todos.{format.value}"'},
+    )
+
+
+@router.post("/todos/import", response_model=TodoImportResponse)
+async def import_todos(
+    request: Request,
+    format: ExportFormat = ExportFormat.NDJSON,
+    chunk_size: int = Query(importer.DEFAULT_CHUNK_SIZE, ge=1, le=10_000),
+    service: TodoService = Depends(get_todo_service),
+):
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_MAX_MEMORY) as spool:
+        async for chunk in request.stream():
+            # Past IMPORT_SPOOL_MAX_MEMORY this is file I/O; keep it off the loop.
+            await run_in_threadpool(spool.write, chunk)
+        spool.seek(0)
+        lines = io.TextIOWrapper(spool, encoding="utf-8-sig", errors="replace", newline="")
+        return await run_in_threadpool(service.import_todos, lines, format, chunk_size)
 
 
 @router.get("/todos/{todo_id}", response_model=TodoResponse)
-def get_todo(todo_id: int, service: TodoService = Depends(get_todo_service)):
-    response = service.get_with_skills(todo_id)
-    if not response:
+def get_todo(
+    todo_id: int,
+    request: Request,
+    response: Response,
+    service: TodoService = Depends(get_todo_service),
+):
+    if not FAST_JSON and is_conditional(request):
+        # Revalidating takes only the timestamp; the response model (skills
+        # and all) is built only when the client's copy is out of date.
+        updated_at = service.last_modified(todo_id)
+        if updated_at is None:
+            raise HTTPException(status_code=404, detail="Todo not found")
+        etag = make_etag("todo", todo_id, updated_at.isoformat())
+        if is_not_modified(request, etag, updated_at):
+            return not_modified(etag, updated_at)
+    if FAST_JSON:
+        todo = service.get_dict(todo_id)
+        updated_at = todo and datetime.fromisoformat(todo["updated_at"])
+    else:
+        todo = service.get_with_skills(todo_id)
+        updated_at = todo and todo.updated_at
+    if not todo:
         raise HTTPException(status_code=404, detail="Todo not found")
-    return response
+    etag = make_etag("todo", todo_id, updated_at.isoformat())
+    if is_not_modified(request, etag, updated_at):
+        return not_modified(etag, updated_at)
+    headers = validator_headers(etag, updated_at)
+    if FAST_JSON:
+        return ORJSONResponse(todo, headers=headers)
+    response.headers.update(headers)
+    return todo
 
 
 @router.put("/todos/{todo_id}", response_model=TodoResponse)
@@ -56,7 +424,9 @@ def update_todo(
     todo = service.update(todo_id, data)
     if not todo:
         raise HTTPException(status_code=404, detail="Todo not found")
-    return service.get_with_skills(todo_id)
+    if FAST_JSON:
+        return ORJSONResponse(service.to_dict(todo))
+    return service.to_response(todo)
 
 
 @router.delete("/todos/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -71,29 +441,53 @@ def toggle_complete(todo_id: int, service: TodoService = Depends(get_todo_servic
     todo = service.toggle_complete(todo_id)
     if not todo:
         raise HTTPException(status_code=404, detail="Todo not found")
-    return service.get_with_skills(todo_id)
+    if FAST_JSON:
+        return ORJSONResponse(service.to_dict(todo))
+    return service.to_response(todo)
+
+
+@router.get("/events")
+async def stream_events(request: Request):
+    """Server-Sent Events: todo.created, todo.updated, todo.deleted, todos.bulk.
+
+    A client that falls too far behind receives `reset` and is disconnected;
+    it should reload its view before reconnecting.
+    """
+    workspace = workspace_for(request)
+    events = broadcaster if workspace is None else broadcaster_for(workspace)
+
+    async def generate():
+        async with events.subscribe() as subscription:
+            async for message in subscription.messages():
+                yield message
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/phases", response_model=List[PhaseResponse])
-def list_phases():
-    phases = []
-    for phase_name in PHASE_SKILLS.keys():
-        skills = get_skills_for_phase(phase_name)
-        phases.append(
-            PhaseResponse(
-                name=phase_name,
-                skills=[SkillResponse(**s) for s in skills],
-            )
-        )
-    return phases
+async def list_phases(request: Request):
+    if is_not_modified(request, PHASES_ETAG):
+        return not_modified(PHASES_ETAG)
+    return Response(
+        content=PHASES_JSON,
+        media_type="application/json",
+        headers=validator_headers(PHASES_ETAG),
+    )
 
 
 @router.get("/phases/{phase_name}", response_model=PhaseResponse)
-def get_phase(phase_name: str):
-    if phase_name not in PHASE_SKILLS:
+async def get_phase(phase_name: str, request: Request):
+    if phase_name not in PHASE_JSON:
         raise HTTPException(status_code=404, detail="Phase not found")
-    skills = get_skills_for_phase(phase_name)
-    return PhaseResponse(
-        name=phase_name,
-        skills=[SkillResponse(**s) for s in skills],
+    etag = PHASE_ETAGS[phase_name]
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    return Response(
+        content=PHASE_JSON[phase_name],
+        media_type="application/json",
+        headers=validator_headers(etag),
     )
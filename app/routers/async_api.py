@@ -0,0 +1,123 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import group_commit
+from app.async_database import get_async_db
+from app.config import FAST_JSON
+from app.database import workspace_for
+from app.models import Phase, Priority
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursor, next_cursor
+from app.routers import api
+from app.schemas import TodoCreate, TodoUpdate, TodoResponse
+from app.services.async_todo_service import AsyncTodoService
+from app.services.todo_service import todo_dict_key
+
+router = APIRouter(prefix="/api", tags=["api"])
+
+
+def get_todo_service(
+    request: Request, db: AsyncSession = Depends(get_async_db)
+) -> AsyncTodoService:
+    # The async engine only reaches the default database; refuse rather than
+    # serve another workspace's todos.
+    if workspace_for(request) is not None:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Workspaces are not supported by the async API",
+        )
+    return AsyncTodoService(db, writer=group_commit.group_committer)
+
+
+@router.post("/todos", response_model=TodoResponse, status_code=status.HTTP_201_CREATED)
+async def create_todo(data: TodoCreate, service: AsyncTodoService = Depends(get_todo_service)):
+    todo = await service.create(data)
+    if FAST_JSON:
+        return ORJSONResponse(service.to_dict(todo), status_code=status.HTTP_201_CREATED)
+    return service.to_response(todo)
+
+
+@router.get("/todos", response_model=List[TodoResponse])
+async def list_todos(
+    response: Response,
+    phase: Optional[Phase] = None,
+    priority: Optional[Priority] = None,
+    completed: Optional[bool] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    service: AsyncTodoService = Depends(get_todo_service),
+):
+    try:
+        if FAST_JSON:
+            todos = await service.list_dicts(
+                phase=phase, priority=priority, completed=completed, limit=limit, cursor=cursor
+            )
+            cursor = next_cursor(todos, limit, key=todo_dict_key)
+        else:
+            todos = await service.list_with_skills(
+                phase=phase, priority=priority, completed=completed, limit=limit, cursor=cursor
+            )
+            cursor = next_cursor(todos, limit)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    headers = {"X-Next-Cursor": cursor} if cursor else {}
+    if FAST_JSON:
+        return ORJSONResponse(todos, headers=headers)
+    response.headers.update(headers)
+    return todos
+
+
+@router.get("/todos/{todo_id}", response_model=TodoResponse)
+async def get_todo(todo_id: int, service: AsyncTodoService = Depends(get_todo_service)):
+    if FAST_JSON:
+        todo = await service.get_dict(todo_id)
+        if not todo:
+            raise HTTPException(status_code=404, detail="Todo not found")
+        return ORJSONResponse(todo)
+    response = await service.get_with_skills(todo_id)
+    if not response:
+        raise HTTPException(status_code=404, detail="Todo not found")
+    return response
+
+
+@router.put("/todos/{todo_id}", response_model=TodoResponse)
+async def update_todo(
+    todo_id: int,
+    data: TodoUpdate,
+    service: AsyncTodoService = Depends(get_todo_service),
+):
+    todo = await service.update(todo_id, data)
+    if not todo:
+        raise HTTPException(status_code=404, detail="Todo not found")
+    if FAST_JSON:
+        return ORJSONResponse(service.to_dict(todo))
+    return service.to_response(todo)
+
+
+@router.delete("/todos/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_todo(todo_id: int, service: AsyncTodoService = Depends(get_todo_service)):
+    if not await service.delete(todo_id):
+        raise HTTPException(status_code=404, detail="Todo not found")
+    return None
+
+
+@router.patch("/todos/{todo_id}/complete", response_model=TodoResponse)
+async def toggle_complete(todo_id: int, service: AsyncTodoService = Depends(get_todo_service)):
+    todo = await service.toggle_complete(todo_id)
+    if not todo:
+        raise HTTPException(status_code=404, detail="Todo not found")
+    if FAST_JSON:
+        return ORJSONResponse(service.to_dict(todo))
+    return service.to_response(todo)
+
+
+# Every other /api route is the sync API's own: its handler runs in the
+# threadpool on the sync session, so both apps serve the same API. The sync
+# router's order is kept, which keeps e.g. /todos/search ahead of
+# /todos/{todo_id}.
+_async_routes = {(route.path, frozenset(route.methods)): route for route in router.routes}
+router.routes[:] = [
+    _async_routes.get((route.path, frozenset(route.methods)), route) for route in api.router.routes
+]
@@ -1,45 +1,54 @@
-from datetime import date
+from datetime import date, timedelta
+from functools import lru_cache
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Form, Request
+from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.metrics import InstrumentedTemplates
 from app.models import Phase, Priority
-from app.schemas import TodoCreate, TodoUpdate, SkillResponse
-from app.services.todo_service import TodoService
-from app.config import PHASE_SKILLS, get_skills_for_phase
+from app.pagination import MAX_PAGE_SIZE, InvalidCursor, next_cursor
+from app.schemas import CalendarBucket, TodoCreate, TodoUpdate
+from app.services.cached_todo_service import todo_service_for
+from app.services.todo_service import TodoService, search_key
+from app.catalog import PHASE_RESPONSES, skills_for_phase
+from app.config import LIVE_UPDATES, PHASE_SKILLS
 
 router = APIRouter(tags=["web"])
-templates = Jinja2Templates(directory="app/templates")
 
 PHASES = [p.value for p in Phase]
 PRIORITIES = [p.value for p in Priority]
+WEB_PAGE_SIZE = 50
+DASHBOARD_TODOS_PER_PHASE = 10
+
+
+@lru_cache(maxsize=None)
+def get_templates() -> InstrumentedTemplates:
+    """The template environment, built by the first page rendered rather than at import."""
+    templates = InstrumentedTemplates(directory="app/templates")
+    templates.env.globals["live_updates"] = LIVE_UPDATES
+    return templates
 
 
 def get_todo_service(db: Session = Depends(get_db)) -> TodoService:
-    return TodoService(db)
+    return todo_service_for(db)
 
 
 @router.get("/", response_class=HTMLResponse)
 def dashboard(request: Request, service: TodoService = Depends(get_todo_service)):
-    todos = service.list()
-    todos_by_phase = {phase: [] for phase in PHASES}
-    for todo in todos:
-        todos_by_phase[todo.phase.value].append(todo)
-
     skills_by_phase = {
         phase: [s for s in PHASE_SKILLS.get(phase, [])] for phase in PHASES
     }
 
-    return templates.TemplateResponse(
+    return get_templates().TemplateResponse(
         "index.html",
         {
             "request": request,
             "phases": PHASES,
-            "todos_by_phase": todos_by_phase,
+            "stats": service.stats(),
+            "todos_by_phase": service.recent_by_phase(limit=DASHBOARD_TODOS_PER_PHASE),
             "skills_by_phase": skills_by_phase,
         },
     )
@@ -51,6 +60,9 @@ def list_todos(
     phase: Optional[str] = None,
     priority: Optional[str] = None,
     completed: Optional[str] = None,
+    q: Optional[str] = Query(None, max_length=200),
+    limit: int = Query(WEB_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     service: TodoService = Depends(get_todo_service),
 ):
     phase_enum = Phase(phase) if phase else None
@@ -61,9 +73,30 @@ def list_todos(
     elif completed == "false":
         completed_bool = False
 
-    todos = service.list(phase=phase_enum, priority=priority_enum, completed=completed_bool)
-
-    return templates.TemplateResponse(
+    try:
+        if q:
+            todos = service.search_with_skills(
+                q,
+                phase=phase_enum,
+                priority=priority_enum,
+                completed=completed_bool,
+                limit=limit,
+                cursor=cursor,
+            )
+            cursor = next_cursor(todos, limit, key=search_key)
+        else:
+            todos = service.list(
+                phase=phase_enum,
+                priority=priority_enum,
+                completed=completed_bool,
+                limit=limit,
+                cursor=cursor,
+            )
+            cursor = next_cursor(todos, limit)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return get_templates().TemplateResponse(
         "todos/list.html",
         {
             "request": request,
@@ -73,13 +106,35 @@ def list_todos(
             "phase": phase,
             "priority": priority,
             "completed": completed,
+            "q": q,
+            "next_cursor": cursor,
+        },
+    )
+
+
+@router.get("/todos/due", response_class=HTMLResponse)
+def due_todos(
+    request: Request,
+    days: int = Query(7, ge=0, le=366),
+    service: TodoService = Depends(get_todo_service),
+):
+    today = date.today()
+    end = today + timedelta(days=days)
+    return get_templates().TemplateResponse(
+        "todos/due.html",
+        {
+            "request": request,
+            "days": days,
+            "overdue": service.overdue(today=today, limit=WEB_PAGE_SIZE),
+            "due_soon": service.due_soon(days, today=today, limit=WEB_PAGE_SIZE),
+            "calendar": service.due_date_counts(today, end, CalendarBucket.DAY),
         },
     )
 
 
 @router.get("/todos/new", response_class=HTMLResponse)
 def new_todo_form(request: Request):
-    return templates.TemplateResponse(
+    return get_templates().TemplateResponse(
         "todos/form.html",
         {
             "request": request,
@@ -124,15 +179,12 @@ def todo_detail(
     if not todo:
         return RedirectResponse(url="/todos", status_code=303)
 
-    skills = get_skills_for_phase(todo.phase.value)
-    skill_responses = [SkillResponse(**s) for s in skills]
-
-    return templates.TemplateResponse(
+    return get_templates().TemplateResponse(
         "todos/detail.html",
         {
             "request": request,
             "todo": todo,
-            "recommended_skills": skill_responses,
+            "recommended_skills": skills_for_phase(todo.phase.value),
         },
     )
 
@@ -147,7 +199,7 @@ def edit_todo_form(
     if not todo:
         return RedirectResponse(url="/todos", status_code=303)
 
-    return templates.TemplateResponse(
+    return get_templates().TemplateResponse(
         "todos/form.html",
         {
             "request": request,
@@ -203,18 +255,10 @@ def delete_todo(
 
 @router.get("/phases", response_class=HTMLResponse)
 def list_phases(request: Request):
-    phases = []
-    for phase_name in PHASE_SKILLS.keys():
-        skills = get_skills_for_phase(phase_name)
-        phases.append({
-            "name": phase_name,
-            "skills": [SkillResponse(**s) for s in skills],
-        })
-
-    return templates.TemplateResponse(
+    return get_templates().TemplateResponse(
         "phases.html",
         {
             "request": request,
-            "phases": phases,
+            "phases": PHASE_RESPONSES.values(),
         },
     )
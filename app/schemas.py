@@ -1,12 +1,15 @@
+import enum
 from datetime import date, datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.models import Phase, Priority
 
 
 class SkillResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str
     description: str
     when_to_use: str
@@ -25,6 +28,11 @@ class TodoCreate(TodoBase):
     pass
 
 
+class TodoImport(TodoCreate):
+    # Imports restore exported todos, done or not.
+    completed: bool = False
+
+
 class TodoUpdate(BaseModel):
     title: Optional[str] = Field(None, max_length=200)
     description: Optional[str] = None
@@ -45,6 +53,121 @@ class TodoResponse(TodoBase):
         from_attributes = True
 
 
+class TodoSearchHit(TodoResponse):
+    # bm25 score; lower is a better match.
+    rank: float
+
+
 class PhaseResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str
     skills: List[SkillResponse]
+
+
+MAX_BATCH_ITEMS = 1000
+
+
+class TodoBatchUpdate(TodoUpdate):
+    id: int
+
+
+class TodoBatchComplete(BaseModel):
+    id: int
+    completed: bool
+
+
+class TodoBatchRequest(BaseModel):
+    create: List[TodoCreate] = Field(default_factory=list, max_length=MAX_BATCH_ITEMS)
+    update: List[TodoBatchUpdate] = Field(default_factory=list, max_length=MAX_BATCH_ITEMS)
+    delete: List[int] = Field(default_factory=list, max_length=MAX_BATCH_ITEMS)
+    complete: List[TodoBatchComplete] = Field(default_factory=list, max_length=MAX_BATCH_ITEMS)
+
+
+class BatchItemResult(BaseModel):
+    op: str
+    index: int
+    id: Optional[int] = None
+    status: int
+    error: Optional[str] = None
+
+
+class TodoBatchResponse(BaseModel):
+    results: List[BatchItemResult]
+
+
+class ImportLineError(BaseModel):
+    line: int
+    error: str
+
+
+class TodoImportResponse(BaseModel):
+    imported: int = 0
+    failed: int = 0
+    chunks: int = 0
+    errors: List[ImportLineError] = []
+    errors_truncated: bool = False
+
+
+class TodoStats(BaseModel):
+    total: int = 0
+    completed: int = 0
+    open: int = 0
+    by_phase: Dict[str, int] = {}
+    open_by_phase: Dict[str, int] = {}
+    by_priority: Dict[str, int] = {}
+
+
+class WorkspaceSummary(BaseModel):
+    total: TodoStats
+    workspaces: Dict[str, TodoStats] = {}
+
+
+class CalendarBucket(str, enum.Enum):
+    DAY = "day"
+    WEEK = "week"
+
+
+class DueDateBucket(BaseModel):
+    # The bucket's first day: the day itself, or the Monday of its week.
+    start: date
+    total: int = 0
+    open: int = 0
+
+
+class TodoChangeEntry(BaseModel):
+    seq: int
+    id: int
+    deleted: bool
+    # Current state of the todo; None for tombstones.
+    todo: Optional[TodoResponse] = None
+
+
+class TodoChangesResponse(BaseModel):
+    changes: List[TodoChangeEntry]
+    # High-water mark to pass as `since` on the next sync.
+    since: int
+    has_more: bool
+
+
+class ChangeLogCompaction(BaseModel):
+    superseded: int
+    tombstones: int
+    horizon: int
+
+
+class TodoArchiveReport(BaseModel):
+    archived: int = 0
+    batches: int = 0
+    # Pages returned to the filesystem by incremental_vacuum; None when the
+    # database was not created with auto_vacuum=INCREMENTAL.
+    pages_freed: Optional[int] = None
+
+
+class CacheStats(BaseModel):
+    backend: str
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
@@ -0,0 +1,116 @@
+"""Move long-finished todos out of the hot table.
+
+Completed todos whose updated_at is older than a cutoff are copied into
+todos_archive and deleted from todos, `batch_size` rows per transaction, so
+writers only ever wait for one short batch. The delete goes through the
+todos triggers like any other: the table version moves on, the FTS index
+drops the rows and the change feed reports them as deleted, which is what
+default reads now see.
+
+Freed pages stay in the file until incremental_vacuum hands them back, again
+a few at a time. That needs auto_vacuum=INCREMENTAL, which SQLite only
+honours on a file created with it (the production profile sets it).
+"""
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+from sqlalchemy import delete, insert, literal, select, text
+from sqlalchemy.orm import Session
+
+from app.config import ARCHIVE_BATCH_SIZE
+from app.events import Broadcaster, broadcaster
+from app.models import ArchivedTodo, Todo
+from app.schemas import TodoArchiveReport
+
+# Sleep between batches so writers queued on busy_timeout get the lock
+# before the next batch takes it again.
+BATCH_PAUSE_SECONDS = 0.01
+# Pages released per incremental_vacuum transaction.
+VACUUM_STEP_PAGES = 1000
+AUTO_VACUUM_INCREMENTAL = 2
+
+COPIED_COLUMNS = [column.name for column in Todo.__table__.columns]
+
+
+def archive_batch(db: Session, cutoff: datetime, batch_size: int = ARCHIVE_BATCH_SIZE) -> List[int]:
+    """Move up to `batch_size` eligible todos in one transaction; return their ids.
+
+    The INSERT ... SELECT picks the rows and takes the write lock in one go,
+    so the DELETE that follows removes exactly what was copied.
+    """
+    eligible = (
+        select(*(getattr(Todo, name) for name in COPIED_COLUMNS), literal(datetime.utcnow()))
+        .where(Todo.completed.is_(True), Todo.updated_at < cutoff)
+        .order_by(Todo.id)
+        .limit(batch_size)
+    )
+    try:
+        ids = db.scalars(
+            insert(ArchivedTodo)
+            .from_select([*COPIED_COLUMNS, "archived_at"], eligible)
+            .returning(ArchivedTodo.id)
+        ).all()
+        if ids:
+            db.execute(
+                delete(Todo).where(Todo.id.in_(ids)).execution_options(synchronize_session=False)
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return ids
+
+
+def incremental_vacuum(db: Session, step: int = VACUUM_STEP_PAGES) -> Optional[int]:
+    """Release free pages `step` at a time; None unless auto_vacuum is INCREMENTAL."""
+    if db.execute(text("PRAGMA auto_vacuum")).scalar() != AUTO_VACUUM_INCREMENTAL:
+        db.commit()
+        return None
+    freed = 0
+    while True:
+        before = db.execute(text("PRAGMA freelist_count")).scalar()
+        db.commit()
+        if not before:
+            break
+        # pysqlite steps a statement that returns no rows only once, which
+        # frees a single page; executescript runs it to completion (in its
+        # own transaction, which is why the session was committed above).
+        driver = db.connection().connection.driver_connection
+        driver.executescript(f"PRAGMA incremental_vacuum({int(step)})")
+        after = db.execute(text("PRAGMA freelist_count")).scalar()
+        db.commit()
+        if after >= before:
+            break
+        freed += before - after
+    return freed
+
+
+def archive_completed(
+    db: Session,
+    older_than: timedelta,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    events: Broadcaster = broadcaster,
+    on_batch: Optional[Callable[[List[int]], None]] = None,
+) -> TodoArchiveReport:
+    """Archive every completed todo untouched for `older_than`, then vacuum.
+
+    `on_batch` is called with the ids of each committed batch.
+    """
+    report = TodoArchiveReport()
+    cutoff = datetime.utcnow() - older_than
+    while True:
+        ids = archive_batch(db, cutoff, batch_size)
+        if not ids:
+            break
+        report.archived += len(ids)
+        report.batches += 1
+        if on_batch is not None:
+            on_batch(ids)
+        if len(ids) < batch_size:
+            break
+        time.sleep(BATCH_PAUSE_SECONDS)
+    report.pages_freed = incremental_vacuum(db)
+    if report.archived:
+        events.publish("todos.bulk", {"count": report.archived})
+    return report
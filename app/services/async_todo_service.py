@@ -0,0 +1,128 @@
+import asyncio
+from typing import List, Optional
+
+from sqlalchemy import Executable, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.events import Broadcaster, broadcaster
+from app.group_commit import GroupCommitter
+from app.models import Todo, Phase, Priority
+from app.schemas import TodoCreate, TodoUpdate, TodoResponse
+from app.services.todo_service import (
+    TodoDict,
+    TodoRow,
+    TodoService,
+    apply_list_filters,
+    delete_statement,
+    insert_statement,
+    toggle_statement,
+    update_statement,
+)
+
+
+class AsyncTodoService:
+    """TodoService for an AsyncSession; same operations, awaitable."""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        events: Broadcaster = broadcaster,
+        writer: Optional[GroupCommitter] = None,
+    ):
+        self.db = db
+        self.events = events
+        self.writer = writer
+
+    async def create(self, data: TodoCreate) -> TodoRow:
+        todo = await self._execute_write(insert_statement(data))
+        self.publish("todo.created", todo)
+        return todo
+
+    async def get(self, todo_id: int) -> Optional[Todo]:
+        return await self.db.get(Todo, todo_id)
+
+    async def list(
+        self,
+        phase: Optional[Phase] = None,
+        priority: Optional[Priority] = None,
+        completed: Optional[bool] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> List[Todo]:
+        stmt = apply_list_filters(
+            select(Todo), phase=phase, priority=priority, completed=completed, cursor=cursor
+        )
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        result = await self.db.scalars(stmt)
+        return list(result)
+
+    async def update(self, todo_id: int, data: TodoUpdate) -> Optional[TodoRow]:
+        return await self._write("todo.updated", update_statement(todo_id, data))
+
+    async def delete(self, todo_id: int) -> Optional[TodoRow]:
+        todo = await self._execute_write(delete_statement(todo_id))
+        if todo is not None:
+            self.events.publish("todo.deleted", {"id": todo_id})
+        return todo
+
+    async def toggle_complete(self, todo_id: int) -> Optional[TodoRow]:
+        return await self._write("todo.updated", toggle_statement(todo_id))
+
+    async def _write(self, event: str, statement: Executable) -> Optional[TodoRow]:
+        todo = await self._execute_write(statement)
+        if todo is not None:
+            self.publish(event, todo)
+        return todo
+
+    async def _execute_write(self, statement: Executable) -> Optional[TodoRow]:
+        if self.writer is None:
+            todo = (await self.db.execute(statement)).one_or_none()
+            await self.db.commit()
+            return todo
+        # Awaiting the writer's future leaves the event loop free meanwhile.
+        todo = await asyncio.wrap_future(self.writer.enqueue(statement))
+        await self.db.commit()
+        return todo
+
+    async def list_with_skills(
+        self,
+        phase: Optional[Phase] = None,
+        priority: Optional[Priority] = None,
+        completed: Optional[bool] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> List[TodoResponse]:
+        todos = await self.list(
+            phase=phase, priority=priority, completed=completed, limit=limit, cursor=cursor
+        )
+        return [self.to_response(todo) for todo in todos]
+
+    async def get_with_skills(self, todo_id: int) -> Optional[TodoResponse]:
+        todo = await self.get(todo_id)
+        if not todo:
+            return None
+        return self.to_response(todo)
+
+    async def list_dicts(
+        self,
+        phase: Optional[Phase] = None,
+        priority: Optional[Priority] = None,
+        completed: Optional[bool] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> List[TodoDict]:
+        todos = await self.list(
+            phase=phase, priority=priority, completed=completed, limit=limit, cursor=cursor
+        )
+        return [self.to_dict(todo) for todo in todos]
+
+    async def get_dict(self, todo_id: int) -> Optional[TodoDict]:
+        todo = await self.get(todo_id)
+        if not todo:
+            return None
+        return self.to_dict(todo)
+
+    publish = TodoService.publish
+    to_response = staticmethod(TodoService.to_response)
+    to_dict = staticmethod(TodoService.to_dict)
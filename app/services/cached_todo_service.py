@@ -0,0 +1,212 @@
+from datetime import timedelta
+from typing import Iterable, List, Optional, Union
+
+from sqlalchemy.orm import Session
+
+from app import group_commit
+from app.cache import TodoCache, groups_containing, todo_cache
+from app.config import ARCHIVE_BATCH_SIZE
+from app.events import Broadcaster, broadcaster, broadcaster_for
+from app.group_commit import GroupCommitter
+from app.models import Todo, Phase, Priority
+from app.schemas import (
+    BatchItemResult,
+    TodoArchiveReport,
+    TodoBatchRequest,
+    TodoCreate,
+    TodoImportResponse,
+    TodoResponse,
+    TodoUpdate,
+)
+from app.services import archive, importer
+from app.services.export import ExportFormat
+from app.services.todo_service import TodoDict, TodoRow, TodoService
+
+
+# TodoUpdate fields that decide which filter groups a todo is listed under.
+GROUPING_FIELDS = {"phase", "priority", "completed"}
+
+
+def _groups(todo: Union[Todo, TodoRow]) -> List[str]:
+    return groups_containing(todo.phase, todo.priority, todo.completed)
+
+
+class CachedTodoService(TodoService):
+    """TodoService whose response-building reads go through a TodoCache.
+
+    get_with_skills and list_with_skills, and their fast-JSON twins get_dict
+    and list_dicts, are read-through; every mutation invalidates the todo's
+    own entry and the list groups it belonged to before and after the write.
+    ORM-level reads (get, list, search) are left uncached because callers
+    mutate or lazily load what they return, and so are the rare
+    include_archived lists.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        cache: TodoCache,
+        events: Broadcaster = broadcaster,
+        writer: Optional[GroupCommitter] = None,
+    ):
+        super().__init__(db, events=events, writer=writer)
+        self.cache = cache
+
+    def get_with_skills(self, todo_id: int) -> Optional[TodoResponse]:
+        key = self.cache.todo_key(todo_id)
+        cached = self.cache.get_todo(key)
+        if cached is not None:
+            return cached
+        todo = super().get_with_skills(todo_id)
+        if todo is not None:
+            self.cache.set_todo(key, todo)
+        return todo
+
+    def list_with_skills(
+        self,
+        phase: Optional[Phase] = None,
+        priority: Optional[Priority] = None,
+        completed: Optional[bool] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_archived: bool = False,
+    ) -> List[TodoResponse]:
+        if include_archived:
+            return super().list_with_skills(
+                phase=phase,
+                priority=priority,
+                completed=completed,
+                limit=limit,
+                cursor=cursor,
+                include_archived=True,
+            )
+        key = self.cache.list_key((phase, priority, completed), limit, cursor)
+        cached = self.cache.get_list(key)
+        if cached is not None:
+            return cached
+        todos = super().list_with_skills(
+            phase=phase, priority=priority, completed=completed, limit=limit, cursor=cursor
+        )
+        self.cache.set_list(key, todos)
+        return todos
+
+    def get_dict(self, todo_id: int) -> Optional[TodoDict]:
+        key = self.cache.todo_key(todo_id)
+        cached = self.cache.get_todo_dict(key)
+        if cached is not None:
+            return cached
+        todo = super().get_dict(todo_id)
+        if todo is not None:
+            self.cache.set_todo_dict(key, todo)
+        return todo
+
+    def list_dicts(
+        self,
+        phase: Optional[Phase] = None,
+        priority: Optional[Priority] = None,
+        completed: Optional[bool] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_archived: bool = False,
+    ) -> List[TodoDict]:
+        if include_archived:
+            return super().list_dicts(
+                phase=phase,
+                priority=priority,
+                completed=completed,
+                limit=limit,
+                cursor=cursor,
+                include_archived=True,
+            )
+        key = self.cache.list_key((phase, priority, completed), limit, cursor)
+        cached = self.cache.get_list_dicts(key)
+        if cached is not None:
+            return cached
+        todos = super().list_dicts(
+            phase=phase, priority=priority, completed=completed, limit=limit, cursor=cursor
+        )
+        self.cache.set_list_dicts(key, todos)
+        return todos
+
+    def create(self, data: TodoCreate) -> TodoRow:
+        todo = super().create(data)
+        self.cache.invalidate_groups(_groups(todo))
+        return todo
+
+    def update(self, todo_id: int, data: TodoUpdate) -> Optional[TodoRow]:
+        # RETURNING only has the new values. When the update can move the todo
+        # to another filter group, read the old ones first.
+        before: List[str] = []
+        if data.model_fields_set & GROUPING_FIELDS:
+            todo = self.get(todo_id)
+            if not todo:
+                return None
+            before = _groups(todo)
+        todo = super().update(todo_id, data)
+        if todo is not None:
+            self._invalidate(todo_id, before + _groups(todo))
+        return todo
+
+    def toggle_complete(self, todo_id: int) -> Optional[TodoRow]:
+        todo = super().toggle_complete(todo_id)
+        if todo is not None:
+            before = groups_containing(todo.phase, todo.priority, not todo.completed)
+            self._invalidate(todo_id, before + _groups(todo))
+        return todo
+
+    def delete(self, todo_id: int) -> Optional[TodoRow]:
+        todo = super().delete(todo_id)
+        if todo is not None:
+            self._invalidate(todo_id, _groups(todo))
+        return todo
+
+    def apply_batch(self, batch: TodoBatchRequest) -> List[BatchItemResult]:
+        results = super().apply_batch(batch)
+        # A batch can touch any group; one bump of every generation is cheaper
+        # than loading each todo's previous state.
+        self.cache.invalidate_all_lists()
+        self.cache.forget_todos(r.id for r in results if r.op != "create" and r.id is not None)
+        return results
+
+    def import_todos(
+        self,
+        lines: Iterable[str],
+        format: ExportFormat,
+        chunk_size: int = importer.DEFAULT_CHUNK_SIZE,
+    ) -> TodoImportResponse:
+        report = super().import_todos(lines, format, chunk_size)
+        if report.imported:
+            self.cache.invalidate_all_lists()
+        return report
+
+    def archive_completed(
+        self, older_than: timedelta, batch_size: int = ARCHIVE_BATCH_SIZE
+    ) -> TodoArchiveReport:
+        report = archive.archive_completed(
+            self.db, older_than, batch_size, events=self.events, on_batch=self.cache.forget_todos
+        )
+        if report.archived:
+            self.cache.invalidate_all_lists()
+        return report
+
+    def _invalidate(self, todo_id: int, groups: List[str]) -> None:
+        self.cache.forget_todos([todo_id])
+        self.cache.invalidate_groups(groups)
+
+
+def todo_service_for(db: Session) -> TodoService:
+    """The service for a request, per AGENTIC_TODO_CACHE and AGENTIC_TODO_GROUP_COMMIT.
+
+    A workspace session (see app.database.get_db) gets its own cache
+    namespace and event channel. The group committer writes to the default
+    database only, so workspaces commit their own writes.
+    """
+    workspace = db.info.get("workspace")
+    if workspace is not None:
+        events = broadcaster_for(workspace)
+        if todo_cache is not None:
+            return CachedTodoService(db, TodoCache(todo_cache.backend, workspace), events=events)
+        return TodoService(db, events=events)
+    if todo_cache is not None:
+        return CachedTodoService(db, todo_cache, writer=group_commit.group_committer)
+    return TodoService(db, writer=group_commit.group_committer)
@@ -0,0 +1,84 @@
+import csv
+import enum
+import io
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, Sequence
+
+EXPORT_FIELDS = [
+    "id",
+    "title",
+    "description",
+    "phase",
+    "priority",
+    "due_date",
+    "completed",
+    "created_at",
+    "updated_at",
+]
+
+# Rows are grouped into chunks so each write to the socket carries a useful
+# amount of data without holding more than one chunk in memory.
+ROWS_PER_CHUNK = 500
+
+
+class ExportFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _chunked(lines: Iterable[str]) -> Iterator[str]:
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= ROWS_PER_CHUNK:
+            yield "".join(chunk)
+            chunk.clear()
+    if chunk:
+        yield "".join(chunk)
+
+
+def ndjson_chunks(rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+    return _chunked(
+        json.dumps(dict(zip(EXPORT_FIELDS, map(_plain, row))), separators=(",", ":")) + "\n"
+        for row in rows
+    )
+
+
+def csv_chunks(rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def take() -> str:
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    def lines() -> Iterator[str]:
+        writer.writerow(EXPORT_FIELDS)
+        yield take()
+        for row in rows:
+            writer.writerow([_plain(value) for value in row])
+            yield take()
+
+    return _chunked(lines())
+
+
+EXPORTERS: Dict[ExportFormat, Callable[[Iterable[Sequence[Any]]], Iterator[str]]] = {
+    ExportFormat.NDJSON: ndjson_chunks,
+    ExportFormat.CSV: csv_chunks,
+}
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
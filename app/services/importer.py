@@ -0,0 +1,118 @@
+import csv
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.events import Broadcaster, broadcaster
+from app.models import Todo
+from app.schemas import ImportLineError, TodoImport, TodoImportResponse
+from app.services.export import ExportFormat
+
+DEFAULT_CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+
+# (line number, parsed record) or (line number, error message)
+Record = Tuple[int, Any]
+
+
+class RecordError(str):
+    pass
+
+
+def ndjson_records(lines: Iterable[str]) -> Iterator[Record]:
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError as exc:
+            yield line_no, RecordError(f"Invalid JSON: {exc}")
+
+
+def csv_records(lines: Iterable[str]) -> Iterator[Record]:
+    reader = csv.DictReader(lines)
+    for row in reader:
+        # Empty cells mean "not set", matching what the CSV export writes for None.
+        yield reader.line_num, {key: value for key, value in row.items() if value != ""}
+
+
+PARSERS = {
+    ExportFormat.NDJSON: ndjson_records,
+    ExportFormat.CSV: csv_records,
+}
+
+
+def _describe(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'record'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def import_todos(
+    db: Session,
+    lines: Iterable[str],
+    format: ExportFormat,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    events: Broadcaster = broadcaster,
+) -> TodoImportResponse:
+    """Validate records against TodoImport and insert them chunk by chunk.
+
+    Each chunk is one transaction. Bad records are reported with their line
+    number and skipped. A chunk that fails to insert is retried one row per
+    transaction, so only the rows the database rejects are reported and the
+    rest of the chunk is still imported.
+    """
+    report = TodoImportResponse()
+    pending: List[Tuple[int, Dict[str, Any]]] = []
+
+    def fail(line_no: int, message: str):
+        report.failed += 1
+        if len(report.errors) < MAX_REPORTED_ERRORS:
+            report.errors.append(ImportLineError(line=line_no, error=message))
+        else:
+            report.errors_truncated = True
+
+    def flush():
+        if not pending:
+            return
+        try:
+            db.execute(insert(Todo), [row for _, row in pending])
+            db.commit()
+            report.imported += len(pending)
+        except SQLAlchemyError:
+            db.rollback()
+            for line_no, row in pending:
+                try:
+                    db.execute(insert(Todo), [row])
+                    db.commit()
+                    report.imported += 1
+                except SQLAlchemyError as exc:
+                    db.rollback()
+                    fail(line_no, f"Insert failed: {exc.__class__.__name__}")
+        report.chunks += 1
+        pending.clear()
+
+    for line_no, record in PARSERS[format](lines):
+        if isinstance(record, RecordError):
+            fail(line_no, record)
+            continue
+        if not isinstance(record, dict):
+            fail(line_no, "Expected an object")
+            continue
+        try:
+            todo = TodoImport.model_validate(record)
+        except ValidationError as exc:
+            fail(line_no, _describe(exc))
+            continue
+        pending.append((line_no, todo.model_dump()))
+        if len(pending) >= chunk_size:
+            flush()
+    flush()
+    if report.imported:
+        events.publish("todos.bulk", {"count": report.imported})
+    return report
@@ -1,81 +1,837 @@
-from typing import List, Optional
+import heapq
+import re
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Type, Union
+)
 
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    Executable,
+    Row,
+    Select,
+    delete,
+    exists,
+    func,
+    insert,
+    literal_column,
+    not_,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.orm import Query, Session, aliased
+from sqlalchemy.sql import TableClause
 
-from app.models import Todo, Phase, Priority
-from app.schemas import TodoCreate, TodoUpdate, TodoResponse, SkillResponse
-from app.config import get_skills_for_phase
+from app.config import ARCHIVE_BATCH_SIZE
+from app.models import (
+    ArchivedTodo,
+    DueDateCount,
+    Todo,
+    Phase,
+    Priority,
+    TableVersion,
+    TodoChange,
+    todos_archive_fts,
+    todos_fts,
+)
+from app.pagination import InvalidCursor, decode_cursor
+from app.schemas import (
+    TodoCreate,
+    TodoUpdate,
+    TodoResponse,
+    TodoBatchRequest,
+    BatchItemResult,
+    TodoStats,
+    TodoSearchHit,
+    TodoChangeEntry,
+    TodoChangesResponse,
+    ChangeLogCompaction,
+    TodoImportResponse,
+    TodoArchiveReport,
+    CalendarBucket,
+    DueDateBucket,
+)
+from app.catalog import skill_dicts_for_phase, skills_for_phase
+from app.events import Broadcaster, broadcaster
+from app.group_commit import GroupCommitter
+from app.services import archive, importer
+from app.services.export import EXPORT_FIELDS, ExportFormat
+
+ListQuery = Union[Query, Select]
+# The hot table or the archive; list and search run the same query on either.
+TodoModel = Union[Type[Todo], Type[ArchivedTodo]]
+# TodoResponse (or TodoSearchHit) JSON as a plain dict; see TodoService.to_dict.
+TodoDict = Dict[str, Any]
+# What create/update/toggle_complete/delete return: the row as written, read
+# off the statement's RETURNING clause. It has the same attributes as a Todo
+# but is plain data, so it stays readable after commit() expires the session.
+TodoRow = Row
+# Every column of todos, for RETURNING.
+TODO_COLUMNS = tuple(Todo.__table__.columns)
+
+
+class ChangesExpired(LookupError):
+    """The requested change-feed position predates the compaction horizon."""
+
+
+# bm25 weights per indexed column (title, description): a hit in the title
+# counts four times as much as one in the description.
+SEARCH_COLUMN_WEIGHTS = (4.0, 1.0)
+SEARCH_TERM = re.compile(r"(\w+)(\*?)")
+
+
+def parse_list_cursor(cursor: str) -> Tuple[datetime, int]:
+    values = decode_cursor(cursor)
+    try:
+        created_at, todo_id = values
+        return datetime.fromisoformat(created_at), int(todo_id)
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+
+
+def parse_search_cursor(cursor: str) -> Tuple[float, int]:
+    values = decode_cursor(cursor)
+    try:
+        rank, todo_id = values
+        return float(rank), int(todo_id)
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+
+
+def parse_due_cursor(cursor: str) -> Tuple[date, int]:
+    values = decode_cursor(cursor)
+    try:
+        due_date, todo_id = values
+        return date.fromisoformat(due_date), int(todo_id)
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+
+
+def due_key(todo: Union[Todo, TodoResponse]) -> Tuple[str, int]:
+    """Keyset values of a due_between() row, for `next_cursor`."""
+    return todo.due_date.isoformat(), todo.id
+
+
+def search_key(hit: TodoSearchHit) -> Tuple[float, int]:
+    """Keyset values of a search hit, for `next_cursor`."""
+    return hit.rank, hit.id
+
+
+def todo_dict_key(todo: TodoDict) -> Tuple[str, int]:
+    """Keyset values of a list_dicts() row, for `next_cursor`."""
+    return todo["created_at"], todo["id"]
+
+
+def search_dict_key(hit: TodoDict) -> Tuple[float, int]:
+    """Keyset values of a search_dicts() hit, for `next_cursor`."""
+    return hit["rank"], hit["id"]
+
+
+def match_expression(q: str) -> Optional[str]:
+    """Turn free text into an FTS5 MATCH expression.
+
+    Every word becomes a quoted term, so operators and punctuation in user
+    input are never parsed as FTS5 syntax; a trailing `*` keeps the term a
+    prefix query. Terms are implicitly ANDed. Returns None when `q` has no
+    searchable words.
+    """
+    terms = [f'"{word}"{star}' for word, star in SEARCH_TERM.findall(q)]
+    return " ".join(terms) or None
+
+
+def apply_filters(
+    query: ListQuery,
+    phase: Optional[Phase] = None,
+    priority: Optional[Priority] = None,
+    completed: Optional[bool] = None,
+    model: TodoModel = Todo,
+) -> ListQuery:
+    if phase is not None:
+        query = query.filter(model.phase == phase)
+    if priority is not None:
+        query = query.filter(model.priority == priority)
+    if completed is not None:
+        query = query.filter(model.completed == completed)
+    return query
+
+
+def apply_list_filters(
+    query: ListQuery,
+    phase: Optional[Phase] = None,
+    priority: Optional[Priority] = None,
+    completed: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    model: TodoModel = Todo,
+) -> ListQuery:
+    """Apply list filters and keyset ordering to an ORM Query or a select()."""
+    query = apply_filters(query, phase=phase, priority=priority, completed=completed, model=model)
+    if cursor is not None:
+        created_at, todo_id = parse_list_cursor(cursor)
+        query = query.filter(tuple_(model.created_at, model.id) < (created_at, todo_id))
+    return query.order_by(model.created_at.desc(), model.id.desc())
+
+
+def merge_pages(
+    hot: List[Any], archived: List[Any], key: Callable[[Any], Any], limit: Optional[int], reverse: bool
+) -> List[Any]:
+    """Merge two pages that are each sorted by `key` into the first `limit` rows.
+
+    Keyset cursors work unchanged across both tables: each side only ever
+    returns rows past the cursor, so the merged page continues where the
+    last one ended.
+    """
+    merged = heapq.merge(hot, archived, key=key, reverse=reverse)
+    return list(islice(merged, limit))
+
+
+def _list_key(todo: Union[Todo, ArchivedTodo]) -> Tuple[datetime, int]:
+    return todo.created_at, todo.id
+
+
+def _search_key(hit: Tuple[Union[Todo, ArchivedTodo], float]) -> Tuple[float, int]:
+    return hit[1], hit[0].id
+
+
+def _returning_update(todo_id: int):
+    # The session is committed right after these run, which expires any copy
+    # of the todo it holds, so there is nothing to synchronize.
+    return (
+        update(Todo)
+        .where(Todo.id == todo_id)
+        .returning(*TODO_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def insert_statement(data: TodoCreate) -> Executable:
+    return insert(Todo).values(**data.model_dump()).returning(*TODO_COLUMNS)
+
+
+def update_statement(todo_id: int, data: TodoUpdate) -> Executable:
+    values = data.model_dump(exclude_unset=True)
+    if not values:
+        # Nothing to write; leave updated_at alone and just read the row.
+        return select(*TODO_COLUMNS).where(Todo.id == todo_id)
+    return _returning_update(todo_id).values(**values)
+
+
+def toggle_statement(todo_id: int) -> Executable:
+    # Flipped inside SQLite, so concurrent toggles cannot both read the same
+    # old value and write the same new one.
+    return _returning_update(todo_id).values(completed=not_(Todo.completed))
+
+
+def delete_statement(todo_id: int) -> Executable:
+    return (
+        delete(Todo)
+        .where(Todo.id == todo_id)
+        .returning(*TODO_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
 
 
 class TodoService:
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        events: Broadcaster = broadcaster,
+        writer: Optional[GroupCommitter] = None,
+    ):
         self.db = db
+        self.events = events
+        self.writer = writer
 
-    def create(self, data: TodoCreate) -> Todo:
-        todo = Todo(
-            title=data.title,
-            description=data.description,
-            phase=data.phase,
-            priority=data.priority,
-            due_date=data.due_date,
-        )
-        self.db.add(todo)
-        self.db.commit()
-        self.db.refresh(todo)
+    def create(self, data: TodoCreate) -> TodoRow:
+        todo = self._execute_write(insert_statement(data))
+        self.publish("todo.created", todo)
         return todo
 
     def get(self, todo_id: int) -> Optional[Todo]:
-        return self.db.query(Todo).filter(Todo.id == todo_id).first()
+        return self.db.get(Todo, todo_id)
+
+    def last_modified(self, todo_id: int) -> Optional[datetime]:
+        """updated_at alone, enough to revalidate a client's copy."""
+        return self.db.scalar(select(Todo.updated_at).where(Todo.id == todo_id))
+
+    def query(
+        self,
+        phase: Optional[Phase] = None,
+        priority: Optional[Priority] = None,
+        completed: Optional[bool] = None,
+        cursor: Optional[str] = None,
+        model: TodoModel = Todo,
+    ) -> Query:
+        return apply_list_filters(
+            self.db.query(model),
+            phase=phase,
+            priority=priority,
+            completed=completed,
+            cursor=cursor,
+            model=model,
+        )
 
     def list(
         self,
         phase: Optional[Phase] = None,
         priority: Optional[Priority] = None,
         completed: Optional[bool] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_archived: bool = False,
+    ) -> List[Union[Todo, ArchivedTodo]]:
+        """A page of todos, newest first, from the hot table unless include_archived.
+
+        Archived todos are all completed, so completed=False never reads the
+        archive.
+        """
+        models = [Todo]
+        if include_archived and completed is not False:
+            models.append(ArchivedTodo)
+        pages = []
+        for model in models:
+            query = self.query(
+                phase=phase, priority=priority, completed=completed, cursor=cursor, model=model
+            )
+            if limit is not None:
+                query = query.limit(limit)
+            pages.append(query.all())
+        if len(pages) == 1:
+            return pages[0]
+        return merge_pages(*pages, key=_list_key, limit=limit, reverse=True)
+
+    def search(
+        self,
+        q: str,
+        phase: Optional[Phase] = None,
+        priority: Optional[Priority] = None,
+        completed: Optional[bool] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_archived: bool = False,
+    ) -> List[Tuple[Union[Todo, ArchivedTodo], float]]:
+        """Todos whose title or description match `q`, best bm25 rank first.
+
+        Pages are keyed on (rank, id) the same way list pages are keyed on
+        (created_at, id). With include_archived the archive's own index is
+        searched too and the hits are interleaved by rank; bm25 weighs terms
+        by their frequency in each index, so ranks across the two are close
+        but not strictly comparable.
+        """
+        match = match_expression(q)
+        if match is None:
+            return []
+        sources = [(Todo, todos_fts)]
+        if include_archived and completed is not False:
+            sources.append((ArchivedTodo, todos_archive_fts))
+        pages = []
+        for model, fts in sources:
+            stmt = self._search_statement(match, model, fts, phase, priority, completed, cursor)
+            if limit is not None:
+                stmt = stmt.limit(limit)
+            pages.append([(todo, rank) for todo, rank in self.db.execute(stmt)])
+        if len(pages) == 1:
+            return pages[0]
+        return merge_pages(*pages, key=_search_key, limit=limit, reverse=False)
+
+    @staticmethod
+    def _search_statement(
+        match: str,
+        model: TodoModel,
+        fts: TableClause,
+        phase: Optional[Phase],
+        priority: Optional[Priority],
+        completed: Optional[bool],
+        cursor: Optional[str],
+    ) -> Select:
+        ranked = apply_filters(
+            select(
+                model.id,
+                func.bm25(literal_column(fts.name), *SEARCH_COLUMN_WEIGHTS).label("rank"),
+            )
+            .join_from(fts, model, model.id == fts.c.rowid)
+            .where(fts.c[fts.name].match(match)),
+            phase=phase,
+            priority=priority,
+            completed=completed,
+            model=model,
+        ).subquery()
+        stmt = select(model, ranked.c.rank).join(ranked, model.id == ranked.c.id)
+        if cursor is not None:
+            rank, todo_id = parse_search_cursor(cursor)
+            stmt = stmt.where(tuple_(ranked.c.rank, ranked.c.id) > (rank, todo_id))
+        return stmt.order_by(ranked.c.rank, ranked.c.id)
+
+    def search_with_skills(
+        self,
+        q: str,
+        phase: Optional[Phase] = None,
+        priority: Optional[Priority] = None,
+        completed: Optional[bool] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_archived: bool = False,
+    ) -> List[TodoSearchHit]:
+        hits = self.search(
+            q,
+            phase=phase,
+            priority=priority,
+            completed=completed,
+            limit=limit,
+            cursor=cursor,
+            include_archived=include_archived,
+        )
+        return [
+            TodoSearchHit(**self.to_response(todo).model_dump(), rank=rank) for todo, rank in hits
+        ]
+
+    def stats(self) -> TodoStats:
+        """Counts per phase, priority and completion from one GROUP BY query."""
+        stats = TodoStats(
+            by_phase={phase.value: 0 for phase in Phase},
+            open_by_phase={phase.value: 0 for phase in Phase},
+            by_priority={priority.value: 0 for priority in Priority},
+        )
+        rows = self.db.execute(
+            select(Todo.phase, Todo.priority, Todo.completed, func.count())
+            .group_by(Todo.phase, Todo.priority, Todo.completed)
+        )
+        for phase, priority, completed, count in rows:
+            stats.total += count
+            stats.by_phase[phase.value] += count
+            stats.by_priority[priority.value] += count
+            if completed:
+                stats.completed += count
+            else:
+                stats.open += count
+                stats.open_by_phase[phase.value] += count
+        return stats
+
+    def recent_by_phase(
+        self, limit: int = 10, completed: Optional[bool] = False
+    ) -> Dict[str, List[Todo]]:
+        """The newest `limit` todos of every phase, in one query.
+
+        Each phase gets its own ORDER BY ... LIMIT branch, so every branch is a
+        short range read on the phase index and the cost depends on `limit`,
+        not on how many todos each phase holds.
+        """
+        branches = []
+        for phase in Phase:
+            branch = apply_list_filters(select(Todo.id), phase=phase, completed=completed)
+            branches.append(select(branch.limit(limit).subquery().c.id))
+        todos = self.db.scalars(
+            apply_list_filters(select(Todo).where(Todo.id.in_(union_all(*branches))))
+        )
+        grouped: Dict[str, List[Todo]] = {phase.value: [] for phase in Phase}
+        for todo in todos:
+            grouped[todo.phase.value].append(todo)
+        return grouped
+
+    def due_query(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        completed: Optional[bool] = False,
+        phase: Optional[Phase] = None,
+        priority: Optional[Priority] = None,
+        cursor: Optional[str] = None,
+    ) -> Query:
+        query = apply_filters(
+            self.db.query(Todo).filter(Todo.due_date.is_not(None)),
+            phase=phase,
+            priority=priority,
+            completed=completed,
+        )
+        if start is not None:
+            query = query.filter(Todo.due_date >= start)
+        if end is not None:
+            query = query.filter(Todo.due_date <= end)
+        if cursor is not None:
+            due_date, todo_id = parse_due_cursor(cursor)
+            query = query.filter(tuple_(Todo.due_date, Todo.id) > (due_date, todo_id))
+        return query.order_by(Todo.due_date, Todo.id)
+
+    def due_between(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        completed: Optional[bool] = False,
+        phase: Optional[Phase] = None,
+        priority: Optional[Priority] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> List[Todo]:
-        query = self.db.query(Todo)
-        if phase is not None:
-            query = query.filter(Todo.phase == phase)
-        if priority is not None:
-            query = query.filter(Todo.priority == priority)
-        if completed is not None:
-            query = query.filter(Todo.completed == completed)
-        return query.order_by(Todo.created_at.desc()).all()
-
-    def update(self, todo_id: int, data: TodoUpdate) -> Optional[Todo]:
-        todo = self.get(todo_id)
-        if not todo:
-            return None
-        update_data = data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(todo, field, value)
+        """Todos due from `start` to `end` (inclusive, either open-ended), soonest first.
+
+        Open todos by default: a range read on (completed, due_date), which
+        also yields them in order. Pages are keyed on (due_date, id).
+        """
+        query = self.due_query(
+            start=start, end=end, completed=completed, phase=phase, priority=priority, cursor=cursor
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def overdue(self, today: Optional[date] = None, **kwargs: Any) -> List[Todo]:
+        """Open todos due before `today`, most overdue first; see due_between."""
+        today = today or date.today()
+        return self.due_between(end=today - timedelta(days=1), **kwargs)
+
+    def due_soon(self, days: int, today: Optional[date] = None, **kwargs: Any) -> List[Todo]:
+        """Open todos due from `today` through `days` days later; see due_between."""
+        today = today or date.today()
+        return self.due_between(start=today, end=today + timedelta(days=days), **kwargs)
+
+    def due_date_counts(
+        self, start: date, end: date, bucket: CalendarBucket = CalendarBucket.DAY
+    ) -> List[DueDateBucket]:
+        """Todo counts per day or per week (starting Monday) from `start` to `end`.
+
+        Reads the trigger-maintained due_date_counts table, one row per day
+        in range, however many todos there are. Empty buckets are left out.
+        """
+        rows = self.db.scalars(
+            select(DueDateCount)
+            .where(DueDateCount.due_date.between(start, end), DueDateCount.total > 0)
+            .order_by(DueDateCount.due_date)
+        )
+        buckets: Dict[date, DueDateBucket] = {}
+        for row in rows:
+            key = row.due_date
+            if bucket == CalendarBucket.WEEK:
+                key -= timedelta(days=key.weekday())
+            counts = buckets.setdefault(key, DueDateBucket(start=key))
+            counts.total += row.total
+            counts.open += row.open
+        return list(buckets.values())
+
+    def table_version(self) -> int:
+        """Counter bumped by a trigger on every write to todos."""
+        version = self.db.scalar(
+            select(TableVersion.version).where(TableVersion.name == Todo.__tablename__)
+        )
+        return version or 0
+
+    def change_log_horizon(self) -> int:
+        horizon = self.db.scalar(
+            select(TableVersion.version).where(TableVersion.name == TodoChange.__tablename__)
+        )
+        return horizon or 0
+
+    def changes_since(self, since: int = 0, limit: int = 100) -> TodoChangesResponse:
+        """Todos written after change `since`, each with its current state.
+
+        Reads at most `limit` log entries past `since` on the primary key, so
+        a sync costs time proportional to the changes, not the table. A todo
+        touched several times is reported once; todos that no longer exist
+        come back as tombstones.
+        """
+        if 0 < since < self.change_log_horizon():
+            raise ChangesExpired(f"Changes before {since} have been compacted")
+        window = self.db.execute(
+            select(TodoChange.seq, TodoChange.todo_id)
+            .where(TodoChange.seq > since)
+            .order_by(TodoChange.seq)
+            .limit(limit)
+        ).all()
+        latest: Dict[int, int] = {todo_id: seq for seq, todo_id in window}
+        todos: Dict[int, Todo] = {}
+        if latest:
+            todos = {todo.id: todo for todo in self.db.scalars(select(Todo).where(Todo.id.in_(latest)))}
+        changes = [
+            TodoChangeEntry(
+                seq=seq,
+                id=todo_id,
+                deleted=todo_id not in todos,
+                todo=self.to_response(todos[todo_id]) if todo_id in todos else None,
+            )
+            for todo_id, seq in sorted(latest.items(), key=lambda item: item[1])
+        ]
+        return TodoChangesResponse(
+            changes=changes,
+            since=window[-1].seq if window else since,
+            has_more=len(window) == limit,
+        )
+
+    def compact_changes(self, retention: timedelta) -> ChangeLogCompaction:
+        """Drop superseded log entries and tombstones older than `retention`.
+
+        Only the newest entry per todo matters to a sync, so older ones go
+        unconditionally. Dropping a tombstone does lose information, so the
+        highest dropped seq becomes the horizon below which changes_since
+        refuses to answer.
+        """
+        newer = aliased(TodoChange)
+        superseded = self.db.execute(
+            delete(TodoChange).where(
+                exists().where(newer.todo_id == TodoChange.todo_id, newer.seq > TodoChange.seq)
+            )
+        ).rowcount
+        dropped = self.db.scalars(
+            delete(TodoChange)
+            .where(TodoChange.op == "delete", TodoChange.changed_at < datetime.utcnow() - retention)
+            .returning(TodoChange.seq)
+        ).all()
+        if dropped:
+            self.db.execute(
+                update(TableVersion)
+                .where(TableVersion.name == TodoChange.__tablename__)
+                .values(version=func.max(TableVersion.version, max(dropped)))
+            )
         self.db.commit()
-        self.db.refresh(todo)
+        return ChangeLogCompaction(
+            superseded=superseded, tombstones=len(dropped), horizon=self.change_log_horizon()
+        )
+
+    def iter_rows(
+        self,
+        phase: Optional[Phase] = None,
+        priority: Optional[Priority] = None,
+        completed: Optional[bool] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Sequence[Any]]:
+        """Stream matching rows as plain column tuples in EXPORT_FIELDS order.
+
+        Rows are fetched `batch_size` at a time and never enter the identity
+        map, so memory stays flat regardless of how many rows match.
+        """
+        columns = [getattr(Todo, field) for field in EXPORT_FIELDS]
+        stmt = apply_list_filters(
+            select(*columns), phase=phase, priority=priority, completed=completed
+        )
+        return iter(self.db.execute(stmt.execution_options(yield_per=batch_size)))
+
+    def update(self, todo_id: int, data: TodoUpdate) -> Optional[TodoRow]:
+        return self._write("todo.updated", update_statement(todo_id, data))
+
+    def delete(self, todo_id: int) -> Optional[TodoRow]:
+        """Delete a todo and return the row it had, or None if it did not exist."""
+        todo = self._execute_write(delete_statement(todo_id))
+        if todo is not None:
+            self.events.publish("todo.deleted", {"id": todo_id})
         return todo
 
-    def delete(self, todo_id: int) -> bool:
-        todo = self.get(todo_id)
-        if not todo:
-            return False
-        self.db.delete(todo)
+    def toggle_complete(self, todo_id: int) -> Optional[TodoRow]:
+        return self._write("todo.updated", toggle_statement(todo_id))
+
+    def _write(self, event: str, statement: Executable) -> Optional[TodoRow]:
+        todo = self._execute_write(statement)
+        if todo is not None:
+            self.publish(event, todo)
+        return todo
+
+    def _execute_write(self, statement: Executable) -> Optional[TodoRow]:
+        """Run one write statement and commit it, alone or in a group commit."""
+        if self.writer is None:
+            todo = self.db.execute(statement).one_or_none()
+            self.db.commit()
+            return todo
+        todo = self.writer.submit(statement)
+        # Ends any read transaction still open on this session so later reads
+        # see the write, and expires rows it loaded before it, as a commit of
+        # the write itself would have.
         self.db.commit()
-        return True
+        return todo
 
-    def toggle_complete(self, todo_id: int) -> Optional[Todo]:
+    def publish(self, event: str, todo: Union[Todo, TodoRow]) -> None:
+        """Announce a committed write to live subscribers (see app.events)."""
+        if self.events.subscriptions:
+            self.events.publish(
+                event, self.to_response(todo).model_dump(mode="json", exclude={"recommended_skills"})
+            )
+
+    def apply_batch(self, batch: TodoBatchRequest) -> List[BatchItemResult]:
+        """Apply creates, updates, completions and deletes in one transaction.
+
+        Operations run in that order with one executemany-style statement per
+        kind, so an id that is updated and deleted in the same batch ends up
+        deleted. Unknown ids are reported per item instead of failing the batch.
+        """
+        now = datetime.utcnow()
+        referenced = (
+            {item.id for item in batch.update}
+            | {item.id for item in batch.complete}
+            | set(batch.delete)
+        )
+        existing: Set[int] = set()
+        if referenced:
+            existing = set(self.db.scalars(select(Todo.id).where(Todo.id.in_(referenced))))
+
+        results: List[BatchItemResult] = []
+        try:
+            if batch.create:
+                rows = [
+                    {**item.model_dump(), "completed": False, "created_at": now, "updated_at": now}
+                    for item in batch.create
+                ]
+                ids = self.db.scalars(
+                    insert(Todo).returning(Todo.id, sort_by_parameter_order=True), rows
+                ).all()
+                results.extend(
+                    BatchItemResult(op="create", index=i, id=todo_id, status=201)
+                    for i, todo_id in enumerate(ids)
+                )
+
+            updates = []
+            for item in batch.update:
+                values = item.model_dump(exclude_unset=True, exclude={"id"})
+                # As in update_statement, an item that sets no fields writes
+                # nothing and leaves updated_at alone.
+                if item.id in existing and values:
+                    updates.append({**values, "id": item.id, "updated_at": now})
+            if updates:
+                self.db.execute(update(Todo), updates)
+            results.extend(self._batch_results("update", [i.id for i in batch.update], existing, 200))
+
+            for completed in (True, False):
+                ids = [i.id for i in batch.complete if i.completed is completed and i.id in existing]
+                if ids:
+                    self.db.execute(
+                        update(Todo)
+                        .where(Todo.id.in_(ids))
+                        .values(completed=completed, updated_at=now)
+                        .execution_options(synchronize_session=False)
+                    )
+            results.extend(self._batch_results("complete", [i.id for i in batch.complete], existing, 200))
+
+            deletes = [todo_id for todo_id in batch.delete if todo_id in existing]
+            if deletes:
+                self.db.execute(
+                    delete(Todo)
+                    .where(Todo.id.in_(deletes))
+                    .execution_options(synchronize_session=False)
+                )
+            results.extend(self._batch_results("delete", batch.delete, existing, 204))
+
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        # One event for the whole batch; clients refetch rather than replay items.
+        self.events.publish("todos.bulk", {"count": sum(r.status < 400 for r in results)})
+        return results
+
+    def import_todos(
+        self,
+        lines: Iterable[str],
+        format: ExportFormat,
+        chunk_size: int = importer.DEFAULT_CHUNK_SIZE,
+    ) -> TodoImportResponse:
+        return importer.import_todos(self.db, lines, format, chunk_size, events=self.events)
+
+    def archive_completed(
+        self, older_than: timedelta, batch_size: int = ARCHIVE_BATCH_SIZE
+    ) -> TodoArchiveReport:
+        """Move completed todos untouched for `older_than` to the archive."""
+        return archive.archive_completed(self.db, older_than, batch_size, events=self.events)
+
+    @staticmethod
+    def _batch_results(op: str, ids: List[int], existing: Set[int], status: int) -> List[BatchItemResult]:
+        return [
+            BatchItemResult(op=op, index=i, id=todo_id, status=status)
+            if todo_id in existing
+            else BatchItemResult(op=op, index=i, id=todo_id, status=404, error="Todo not found")
+            for i, todo_id in enumerate(ids)
+        ]
+
+    def list_with_skills(
+        self,
+        phase: Optional[Phase] = None,
+        priority: Optional[Priority] = None,
+        completed: Optional[bool] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_archived: bool = False,
+    ) -> List[TodoResponse]:
+        todos = self.list(
+            phase=phase,
+            priority=priority,
+            completed=completed,
+            limit=limit,
+            cursor=cursor,
+            include_archived=include_archived,
+        )
+        return [self.to_response(todo) for todo in todos]
+
+    def get_with_skills(self, todo_id: int) -> Optional[TodoResponse]:
         todo = self.get(todo_id)
         if not todo:
             return None
-        todo.completed = not todo.completed
-        self.db.commit()
-        self.db.refresh(todo)
-        return todo
+        return self.to_response(todo)
 
-    def get_with_skills(self, todo_id: int) -> Optional[TodoResponse]:
+    def list_dicts(
+        self,
+        phase: Optional[Phase] = None,
+        priority: Optional[Priority] = None,
+        completed: Optional[bool] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_archived: bool = False,
+    ) -> List[TodoDict]:
+        todos = self.list(
+            phase=phase,
+            priority=priority,
+            completed=completed,
+            limit=limit,
+            cursor=cursor,
+            include_archived=include_archived,
+        )
+        return [self.to_dict(todo) for todo in todos]
+
+    def get_dict(self, todo_id: int) -> Optional[TodoDict]:
         todo = self.get(todo_id)
         if not todo:
             return None
-        skills = get_skills_for_phase(todo.phase.value)
-        skill_responses = [SkillResponse(**skill) for skill in skills]
+        return self.to_dict(todo)
+
+    def search_dicts(
+        self,
+        q: str,
+        phase: Optional[Phase] = None,
+        priority: Optional[Priority] = None,
+        completed: Optional[bool] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_archived: bool = False,
+    ) -> List[TodoDict]:
+        hits = self.search(
+            q,
+            phase=phase,
+            priority=priority,
+            completed=completed,
+            limit=limit,
+            cursor=cursor,
+            include_archived=include_archived,
+        )
+        return [{**self.to_dict(todo), "rank": rank} for todo, rank in hits]
+
+    @staticmethod
+    def to_dict(todo: Union[Todo, TodoRow]) -> TodoDict:
+        """TodoResponse's JSON as a plain dict, built without pydantic.
+
+        Keys follow TodoResponse's field order and enums and dates are
+        already strings, so the dict encodes to the same document as the model
+        and reads back equal from a cache.
+        """
+        return {
+            "title": todo.title,
+            "description": todo.description,
+            "phase": todo.phase.value,
+            "priority": todo.priority.value,
+            "due_date": todo.due_date.isoformat() if todo.due_date else None,
+            "id": todo.id,
+            "completed": todo.completed,
+            "created_at": todo.created_at.isoformat(),
+            "updated_at": todo.updated_at.isoformat(),
+            "recommended_skills": skill_dicts_for_phase(todo.phase.value),
+        }
+
+    @staticmethod
+    def to_response(todo: Union[Todo, TodoRow]) -> TodoResponse:
+        """Build a response from an already-loaded row without touching the database."""
         return TodoResponse(
             id=todo.id,
             title=todo.title,
@@ -86,5 +842,5 @@ class TodoService:
             completed=todo.completed,
             created_at=todo.created_at,
             updated_at=todo.updated_at,
-            recommended_skills=skill_responses,
+            recommended_skills=list(skills_for_phase(todo.phase.value)),
         )
@@ -0,0 +1,46 @@
+"""Read-only views across every workspace (see app.database.WorkspaceEngines)."""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.database import WorkspaceEngines
+from app.models import Phase, Priority
+from app.schemas import TodoStats, WorkspaceSummary
+from app.services.todo_service import TodoService
+
+# Workspaces read at once. Each read is one GROUP BY on its own file, so they
+# overlap well: SQLite releases the GIL while it reads.
+MAX_PARALLEL_READS = 8
+
+
+def merge_stats(stats: Iterable[TodoStats]) -> TodoStats:
+    total = TodoStats(
+        by_phase={phase.value: 0 for phase in Phase},
+        open_by_phase={phase.value: 0 for phase in Phase},
+        by_priority={priority.value: 0 for priority in Priority},
+    )
+    for part in stats:
+        total.total += part.total
+        total.completed += part.completed
+        total.open += part.open
+        for field in ("by_phase", "open_by_phase", "by_priority"):
+            merged = getattr(total, field)
+            for key, count in getattr(part, field).items():
+                merged[key] = merged.get(key, 0) + count
+    return total
+
+
+def summarize(engines: WorkspaceEngines, max_parallel: int = MAX_PARALLEL_READS) -> WorkspaceSummary:
+    """TodoService.stats() of every workspace, fanned out over a thread pool."""
+
+    def read(name: str) -> Tuple[str, TodoStats]:
+        with engines.borrow(name) as engine, Session(engine) as db:
+            return name, TodoService(db).stats()
+
+    names = engines.names()
+    if not names:
+        return WorkspaceSummary(total=merge_stats([]))
+    with ThreadPoolExecutor(max_workers=min(max_parallel, len(names))) as pool:
+        per_workspace = dict(pool.map(read, names))
+    return WorkspaceSummary(total=merge_stats(per_workspace.values()), workspaces=per_workspace)
@@ -0,0 +1,71 @@
+// Keep rendered todos current from /api/events instead of reloading the page.
+// Rows carrying data-todo-id are patched in place; changes the page cannot
+// patch (new todos, bulk writes, counts) raise a notice offering a reload.
+(function () {
+    if (!window.EventSource) {
+        return;
+    }
+    var source = new EventSource("/api/events");
+    var notice = document.getElementById("live-notice");
+
+    function elements(id) {
+        return document.querySelectorAll('[data-todo-id="' + id + '"]');
+    }
+
+    function stale() {
+        if (notice) {
+            notice.hidden = false;
+        }
+    }
+
+    function patch(el, todo) {
+        if (!el.classList.contains("todo-item")) {
+            stale();
+            return;
+        }
+        el.classList.toggle("completed", todo.completed);
+        var title = el.querySelector(".todo-title");
+        if (title) {
+            title.textContent = todo.title;
+        }
+        var checkbox = el.querySelector(".todo-checkbox");
+        if (checkbox) {
+            checkbox.textContent = todo.completed ? "☑" : "☐";
+        }
+        var priority = el.querySelector(".todo-priority");
+        if (priority) {
+            priority.className = "todo-priority priority-" + todo.priority;
+            priority.textContent = todo.priority.toUpperCase();
+        }
+    }
+
+    source.addEventListener("todo.updated", function (event) {
+        var todo = JSON.parse(event.data);
+        elements(todo.id).forEach(function (el) {
+            patch(el, todo);
+        });
+        if (document.querySelector("[data-live-counts]")) {
+            stale();
+        }
+    });
+
+    source.addEventListener("todo.deleted", function (event) {
+        var id = JSON.parse(event.data).id;
+        elements(id).forEach(function (el) {
+            if (el.classList.contains("todo-item")) {
+                el.remove();
+            } else {
+                stale();
+            }
+        });
+    });
+
+    source.addEventListener("todo.created", stale);
+    source.addEventListener("todos.bulk", stale);
+
+    // Sent when this tab fell too far behind; the server has dropped us.
+    source.addEventListener("reset", function () {
+        source.close();
+        window.location.reload();
+    });
+})();
@@ -0,0 +1,82 @@
+"""Per-item API writes versus one /api/todos:batch request.
+
+    python -m benchmarks.batch_writes --items 500 --synchronous FULL
+
+Runs in-process through TestClient against a temporary database file and
+counts transaction commits, each of which costs SQLite at least one fsync
+under synchronous=FULL.
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, create_sqlite_engine, get_db
+from app.main import create_app
+from benchmarks.common import Timer
+
+PHASES = ["planning", "design", "implementation", "testing", "deployment"]
+
+
+def measure(items: int, synchronous: str, batched: bool):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_sqlite_engine(
+            f"sqlite:///{Path(tmp) / 'batch.db'}", pragmas={"synchronous": synchronous}
+        )
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        commits = 0
+
+        def count_commit(conn):
+            nonlocal commits
+            commits += 1
+
+        def override_get_db():
+            with Session() as db:
+                yield db
+
+        event.listen(engine, "commit", count_commit)
+        # Built per measurement, bound to this measurement's database file.
+        app = create_app(migrate=False)
+        app.dependency_overrides[get_db] = override_get_db
+        creates = [
+            {"title": f"Imported {i}", "phase": PHASES[i % 5], "priority": "medium"}
+            for i in range(items)
+        ]
+        try:
+            with TestClient(app) as client, Timer() as timer:
+                if batched:
+                    results = client.post("/api/todos:batch", json={"create": creates}).json()
+                    ids = [r["id"] for r in results["results"]]
+                    client.post(
+                        "/api/todos:batch",
+                        json={"complete": [{"id": i, "completed": True} for i in ids]},
+                    )
+                else:
+                    ids = [client.post("/api/todos", json=c).json()["id"] for c in creates]
+                    for todo_id in ids:
+                        client.patch(f"/api/todos/{todo_id}/complete")
+        finally:
+            engine.dispose()
+    return commits, timer.elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--synchronous", default="FULL", choices=["OFF", "NORMAL", "FULL"])
+    args = parser.parse_args()
+
+    for label, batched in (("per-item", False), ("batch", True)):
+        commits, elapsed = measure(args.items, args.synchronous, batched)
+        print(
+            f"{label:>9}: {args.items} creates + {args.items} completions  "
+            f"commits={commits}  {elapsed * 1000:.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Engine
+
+from app.database import Base, create_sqlite_engine
+from app.models import Todo, Phase, Priority
+
+# Rough shape of a real backlog: most work sits in implementation, few items
+# are high priority, and roughly a third of everything is already done.
+PHASE_WEIGHTS = {
+    Phase.PLANNING: 10,
+    Phase.DESIGN: 15,
+    Phase.IMPLEMENTATION: 40,
+    Phase.TESTING: 25,
+    Phase.DEPLOYMENT: 10,
+}
+PRIORITY_WEIGHTS = {Priority.LOW: 30, Priority.MEDIUM: 50, Priority.HIGH: 20}
+# Database sizes the suite is tuned for; benchmarks.seed builds all three.
+SEED_SIZES = (10_000, 100_000, 1_000_000)
+
+
+def generate_todos(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    phases, phase_weights = zip(*PHASE_WEIGHTS.items())
+    priorities, priority_weights = zip(*PRIORITY_WEIGHTS.items())
+    start = datetime(2024, 1, 1)
+    today = date(2026, 2, 6)
+    for i in range(count):
+        created_at = start + timedelta(seconds=i * 30 + rng.randint(0, 29))
+        yield {
+            "title": f"Todo {i}: {rng.choice(['fix', 'add', 'refactor', 'document'])} "
+                     f"{rng.choice(['parser', 'login flow', 'exporter', 'cache', 'dashboard'])}",
+            "description": None if rng.random() < 0.3 else f"Details for todo {i}",
+            "phase": rng.choices(phases, phase_weights)[0],
+            "priority": rng.choices(priorities, priority_weights)[0],
+            "due_date": None if rng.random() < 0.5 else today + timedelta(days=rng.randint(-60, 90)),
+            "completed": rng.random() < 0.35,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+
+def seed_database(engine: Engine, count: int, seed: int = 0, batch_size: int = 10_000) -> None:
+    """Create the schema and bulk-insert `count` generated todos."""
+    Base.metadata.create_all(engine)
+    batch: List[Dict[str, Any]] = []
+    with engine.begin() as conn:
+        for row in generate_todos(count, seed):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                conn.execute(insert(Todo), batch)
+                batch.clear()
+        if batch:
+            conn.execute(insert(Todo), batch)
+
+
+def seeded_database(rows: int, directory: Path, seed: int = 0) -> Path:
+    """Path of a database file holding `rows` generated todos, seeding it once.
+
+    Files are named by size and seed and reused across runs, which matters at
+    a million rows. Seeding goes to a temporary name first so an interrupted
+    run never leaves a half-filled file behind under the final name.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"todos-{rows}-seed{seed}.db"
+    if path.exists():
+        return path
+    partial = path.with_suffix(".partial")
+    partial.unlink(missing_ok=True)
+    engine = create_sqlite_engine(f"sqlite:///{partial}", profile="production")
+    seed_database(engine, rows, seed)
+    with engine.connect() as conn:
+        assert conn.scalar(select(func.count()).select_from(Todo)) == rows
+        # Fold the WAL back in so the single file can be copied or renamed.
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    engine.dispose()
+    os.replace(partial, path)
+    return path
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    if len(samples) == 1:
+        return {"p50": samples[0], "p95": samples[0], "p99": samples[0]}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98]}
+
+
+class Timer:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+
+
+def environment() -> Dict[str, Any]:
+    """What a result was measured on, so runs on different setups are not compared blindly."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def save_results(path: Path, benchmark: str, params: Dict[str, Any], results: Dict[str, Dict[str, float]]) -> None:
+    """Write one run as JSON for benchmarks.compare.
+
+    `results` maps a case name to its metrics. Latency metrics are in
+    milliseconds; throughput is per second.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "benchmark": benchmark,
+        "environment": environment(),
+        "params": params,
+        "results": results,
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n")
@@ -0,0 +1,67 @@
+"""Compare two saved benchmark runs and flag regressions.
+
+    python -m benchmarks.compare benchmarks/results/before.json benchmarks/results/after.json \
+        --threshold 10
+
+Both files come from the --output flag of benchmarks.micro or benchmarks.load.
+Cases present in both runs are compared metric by metric; a latency rising
+or a throughput falling by more than --threshold percent counts as a
+regression and makes the exit status 1, so the command can gate CI.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Metrics where a smaller number is better; everything else is a rate.
+LOWER_IS_BETTER = {"p50", "p95", "p99"}
+COMPARED = ("p50", "p95", "p99", "throughput", "calls_per_sec")
+
+
+def load(path: Path) -> Dict:
+    return json.loads(path.read_text())
+
+
+def compare(before: Dict, after: Dict, threshold: float) -> List[Tuple[str, str, float, float, float, bool]]:
+    """(case, metric, before, after, % change, regressed) for every shared metric."""
+    rows = []
+    for case, old in before["results"].items():
+        new = after["results"].get(case)
+        if new is None:
+            continue
+        for metric in COMPARED:
+            if metric not in old or metric not in new or not old[metric]:
+                continue
+            change = (new[metric] - old[metric]) / old[metric] * 100
+            worse = change if metric in LOWER_IS_BETTER else -change
+            rows.append((case, metric, old[metric], new[metric], change, worse > threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("before", type=Path)
+    parser.add_argument("after", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent")
+    args = parser.parse_args()
+
+    before, after = load(args.before), load(args.after)
+    if before["benchmark"] != after["benchmark"]:
+        sys.exit(f"cannot compare a {before['benchmark']} run with a {after['benchmark']} run")
+    print(f"before: {before['environment'].get('commit')}  after: {after['environment'].get('commit')}")
+    for key in ("python", "sqlite", "cpus"):
+        if before["environment"].get(key) != after["environment"].get(key):
+            print(f"note: {key} differs: {before['environment'].get(key)} -> {after['environment'].get(key)}")
+
+    rows = compare(before, after, args.threshold)
+    for case, metric, old, new, change, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        print(f"{case:>50} {metric:>13} {old:12.3f} -> {new:12.3f}  {change:+7.1f}%  {flag}")
+    regressions = sum(1 for row in rows if row[-1])
+    print(f"{regressions} regression(s) beyond {args.threshold:g}%")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
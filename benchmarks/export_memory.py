@@ -0,0 +1,53 @@
+"""Peak Python memory of the streaming export at growing table sizes.
+
+    python -m benchmarks.export_memory --rows 1000 10000 100000 1000000
+
+Each size gets its own seeded database file. The export generator is drained
+under tracemalloc exactly as StreamingResponse would drain it, so the peak
+covers row fetching and serialization but not the socket.
+"""
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from sqlalchemy.orm import Session
+
+from app.database import create_sqlite_engine
+from app.services.export import EXPORTERS, ExportFormat
+from app.services.todo_service import TodoService
+from benchmarks.common import Timer, seed_database
+
+
+def measure(rows: int, export_format: ExportFormat):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_sqlite_engine(f"sqlite:///{Path(tmp) / 'export.db'}")
+        seed_database(engine, rows)
+        with Session(bind=engine) as db:
+            tracemalloc.start()
+            size = 0
+            with Timer() as timer:
+                for chunk in EXPORTERS[export_format](TodoService(db).iter_rows()):
+                    size += len(chunk)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        engine.dispose()
+    return peak, size, timer.elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--format", type=ExportFormat, default=ExportFormat.NDJSON)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        peak, size, elapsed = measure(rows, args.format)
+        print(
+            f"{rows:>9} rows: peak {peak / 1024:8.0f} KiB  "
+            f"output {size / 1024 / 1024:8.1f} MiB  {elapsed:6.1f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""FTS5 search versus a LIKE '%term%' scan over titles and descriptions.
+
+    python -m benchmarks.fts_search --rows 1000000 --repeat 20
+
+Seeds one database (the FTS index is filled by the same triggers the app
+uses), then times the first page and the full match count for each query,
+once through TodoService.search and once through LIKE on both columns.
+"""
+import argparse
+import re
+import tempfile
+from pathlib import Path
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.database import create_sqlite_engine
+from app.models import Todo, todos_fts
+from app.services.todo_service import TodoService, apply_list_filters, match_expression
+from benchmarks.common import Timer, percentiles, seed_database
+
+PAGE_SIZE = 50
+# A common word, a two-word query, a prefix and a single-row needle.
+DEFAULT_QUERIES = ["parser", "refactor dashboard", "dash*", "123457"]
+
+
+def like_filter(q: str):
+    words = [word for word, _ in re.findall(r"(\w+)(\*?)", q)]
+    return and_(
+        *(
+            or_(Todo.title.like(f"%{word}%"), Todo.description.like(f"%{word}%"))
+            for word in words
+        )
+    )
+
+
+def time_calls(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        with Timer() as timer:
+            result = fn()
+        samples.append(timer.elapsed * 1000)
+    return result, percentiles(samples)["p50"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--query", action="append", dest="queries")
+    args = parser.parse_args()
+    queries = args.queries or DEFAULT_QUERIES
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_sqlite_engine(f"sqlite:///{Path(tmp) / 'search.db'}")
+        with Timer() as seed_timer:
+            seed_database(engine, args.rows)
+        print(f"seeded {args.rows} rows with search index in {seed_timer.elapsed:.1f} s")
+
+        with Session(bind=engine) as db:
+            service = TodoService(db)
+            for q in queries:
+                fts_page, fts_page_ms = time_calls(
+                    lambda: service.search(q, limit=PAGE_SIZE), args.repeat
+                )
+                fts_count, fts_count_ms = time_calls(
+                    lambda: db.scalar(
+                        select(func.count())
+                        .select_from(todos_fts)
+                        .where(todos_fts.c.todos_fts.match(match_expression(q)))
+                    ),
+                    args.repeat,
+                )
+                like_page, like_page_ms = time_calls(
+                    lambda: db.scalars(
+                        apply_list_filters(select(Todo).where(like_filter(q))).limit(PAGE_SIZE)
+                    ).all(),
+                    args.repeat,
+                )
+                like_count, like_count_ms = time_calls(
+                    lambda: db.scalar(select(func.count()).where(like_filter(q))),
+                    args.repeat,
+                )
+                db.expunge_all()
+                print(
+                    f"{q!r:>22}  fts: page {fts_page_ms:8.2f} ms  count {fts_count_ms:8.2f} ms "
+                    f"({fts_count})  |  like: page {like_page_ms:8.2f} ms  "
+                    f"count {like_count_ms:8.2f} ms ({like_count})"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
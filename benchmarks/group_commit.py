@@ -0,0 +1,124 @@
+"""Write throughput with a commit per request versus group commit.
+
+    python -m benchmarks.group_commit --writers 1 16 128 --seconds 5 --synchronous FULL
+
+Both modes use the production profile with the given synchronous setting; under
+FULL every commit is an fsync, which is the cost group commit shares out.
+Each writer thread loops over TodoService on its own session, creating a todo
+or toggling a random one. "direct" commits every write on the writer's own
+connection; "grouped" hands writes to a GroupCommitter that folds concurrent
+writes into shared transactions. Every run starts from a fresh seeded file.
+"""
+import argparse
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.database import create_sqlite_engine
+from app.group_commit import GroupCommitter
+from app.models import Phase, Priority
+from app.schemas import TodoCreate
+from app.services.todo_service import TodoService
+from benchmarks.common import percentiles, save_results, seed_database
+
+SEED_ROWS = 1_000
+
+
+def run(writers: int, seconds: float, synchronous: str, grouped: bool, window_ms: float) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'writes.db'}"
+        pragmas = {"synchronous": synchronous}
+        engine = create_sqlite_engine(
+            url, profile="production", pragmas=pragmas, pool_size=writers, max_overflow=0
+        )
+        seed_database(engine, SEED_ROWS)
+        Session = sessionmaker(bind=engine)
+        committer = None
+        if grouped:
+            committer = GroupCommitter(
+                url, window=window_ms / 1000, max_batch=writers, profile="production", pragmas=pragmas
+            )
+        latencies: List[float] = []
+        locked = 0
+        lock = threading.Lock()
+        start = threading.Barrier(writers)
+
+        def writer(seed: int):
+            nonlocal locked
+            rng = random.Random(seed)
+            local: List[float] = []
+            local_locked = 0
+            with Session() as db:
+                service = TodoService(db, writer=committer)
+                start.wait()
+                deadline = time.perf_counter() + seconds
+                while time.perf_counter() < deadline:
+                    began = time.perf_counter()
+                    try:
+                        if rng.random() < 0.5:
+                            service.create(TodoCreate(
+                                title="bench", phase=rng.choice(list(Phase)), priority=rng.choice(list(Priority))
+                            ))
+                        else:
+                            service.toggle_complete(rng.randint(1, SEED_ROWS))
+                    except OperationalError:
+                        db.rollback()
+                        local_locked += 1
+                        continue
+                    local.append(time.perf_counter() - began)
+            with lock:
+                latencies.extend(local)
+                locked += local_locked
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        batches = committer.batches if committer else len(latencies)
+        if committer:
+            committer.close()
+        engine.dispose()
+
+    latencies.sort()
+    return {
+        "writes": len(latencies),
+        "locked": locked,
+        "throughput": len(latencies) / seconds,
+        "writes_per_commit": len(latencies) / max(batches, 1),
+        **{key: value * 1000 for key, value in percentiles(latencies).items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 16, 128])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--synchronous", default="FULL")
+    parser.add_argument("--window-ms", type=float, default=2.0)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    results = {}
+    for writers in args.writers:
+        for mode in ("direct", "grouped"):
+            result = run(writers, args.seconds, args.synchronous, mode == "grouped", args.window_ms)
+            results[f"{mode} x{writers}"] = result
+            print(
+                f"{mode:>8} x{writers:<4} {result['throughput']:8.0f} writes/s  "
+                f"{result['writes_per_commit']:5.1f}/commit  p50={result['p50']:.1f}ms  "
+                f"p95={result['p95']:.1f}ms  p99={result['p99']:.1f}ms  locked={result['locked']}"
+            )
+    if args.output:
+        params = {key: value for key, value in vars(args).items() if key != "output"}
+        save_results(args.output, "group_commit", params, results)
+
+
+if __name__ == "__main__":
+    main()
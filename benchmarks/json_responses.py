@@ -0,0 +1,115 @@
+"""Model responses versus the fast JSON path (AGENTIC_TODO_FAST_JSON=1).
+
+    python -m benchmarks.json_responses --sizes 1000 10000 --repeat 20 \
+        --output benchmarks/results/json.json
+
+Two measurements per list size, both over rows already loaded from a seeded
+database so SQL time is left out:
+
+* encode - rows to response body bytes. The model path builds TodoResponse
+  objects, lets FastAPI validate and jsonable_encode them against
+  response_model and renders JSONResponse; the fast path builds dicts and
+  renders ORJSONResponse.
+* request - GET /api/todos?limit=N end to end through TestClient, SQL
+  included. The API caps pages at MAX_PAGE_SIZE, so larger sizes are skipped.
+"""
+import argparse
+import asyncio
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.testclient import TestClient
+from fastapi.utils import create_response_field
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.database import create_sqlite_engine, get_db
+from app.main import create_app
+from app.pagination import MAX_PAGE_SIZE
+from app.routers import api
+from app.schemas import TodoResponse
+from app.services.todo_service import TodoService
+from benchmarks.common import Timer, percentiles, save_results, seeded_database
+
+LIST_FIELD = create_response_field(name="Response", type_=List[TodoResponse])
+
+
+def model_body(rows) -> bytes:
+    todos = [TodoService.to_response(todo) for todo in rows]
+    content = asyncio.run(serialize_response(field=LIST_FIELD, response_content=todos))
+    return JSONResponse(content).body
+
+
+def fast_body(rows) -> bytes:
+    return ORJSONResponse([TodoService.to_dict(todo) for todo in rows]).body
+
+
+def measure(call: Callable[[], object], repeat: int) -> Dict[str, float]:
+    call()
+    samples = []
+    for _ in range(repeat):
+        with Timer() as timer:
+            call()
+        samples.append(timer.elapsed)
+    samples.sort()
+    return {"calls_per_sec": repeat / sum(samples), **{k: v * 1000 for k, v in percentiles(samples).items()}}
+
+
+def run(path: Path, sizes: List[int], repeat: int) -> Dict[str, Dict[str, float]]:
+    engine = create_sqlite_engine(f"sqlite:///{path}", profile="production")
+    results = {}
+    with Session(bind=engine) as db:
+        for size in sizes:
+            rows = TodoService(db).list(limit=size)
+            assert model_body(rows) and fast_body(rows)
+            results[f"encode model @{size}"] = measure(lambda: model_body(rows), repeat)
+            results[f"encode fast @{size}"] = measure(lambda: fast_body(rows), repeat)
+
+    Local = sessionmaker(bind=engine)
+
+    def override_get_db():
+        with Local() as db:
+            yield db
+
+    app = create_app(migrate=False)
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        with TestClient(app) as client:
+            for size in sizes:
+                if size > MAX_PAGE_SIZE:
+                    continue
+                url = f"/api/todos?limit={size}"
+                for mode, fast in (("model", False), ("fast", True)):
+                    api.FAST_JSON = fast
+                    results[f"request {mode} @{size}"] = measure(lambda: client.get(url), repeat)
+    finally:
+        api.FAST_JSON = False
+        app.dependency_overrides.clear()
+        engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--dir", type=Path, default=Path("benchmarks/data"))
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    path = seeded_database(max(args.rows, *args.sizes), args.dir)
+    results = run(path, args.sizes, args.repeat)
+    for name, result in results.items():
+        print(
+            f"{name:>24}: {result['calls_per_sec']:8.1f}/s  p50={result['p50']:.2f}ms  "
+            f"p95={result['p95']:.2f}ms  p99={result['p99']:.2f}ms"
+        )
+    if args.output:
+        params = {"sizes": args.sizes, "repeat": args.repeat}
+        save_results(args.output, "json_responses", params, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Concurrent HTTP load against one or more app entry points under uvicorn.
+
+    python -m benchmarks.load --app app.main:app --app app.async_main:app \
+        --rows 10000 --concurrency 256 --requests 5000 --mix all \
+        --output benchmarks/results/load.json
+
+Every app gets its own uvicorn process over the seeded database from
+benchmarks.seed (reads only, so the file is shared between runs). The driver
+keeps `--concurrency` requests in flight over a mix of list and detail reads
+- JSON API routes, HTML routes or both - and reports throughput and latency
+percentiles overall and per route.
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import httpx
+
+from app.models import Phase
+from benchmarks.common import percentiles, save_results, seeded_database
+
+# A request to drive: the route template it is reported under, and the URL.
+Target = Tuple[str, str]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def serve(app: str, database_url: str, workers: int = 1) -> Iterator[str]:
+    port = free_port()
+    env = {**os.environ, "AGENTIC_TODO_DATABASE_URL": database_url}
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", app,
+            "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+        ],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                if httpx.get(f"{base_url}/api/phases").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline or process.poll() is not None:
+                raise RuntimeError(f"uvicorn did not start for {app}")
+            time.sleep(0.1)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def api_target(rng: random.Random, rows: int) -> Target:
+    if rng.random() < 0.5:
+        return "/api/todos", f"/api/todos?limit=50&phase={rng.choice(list(Phase)).value}"
+    return "/api/todos/{todo_id}", f"/api/todos/{rng.randint(1, rows)}"
+
+
+def web_target(rng: random.Random, rows: int) -> Target:
+    roll = rng.random()
+    if roll < 0.2:
+        return "/", "/"
+    if roll < 0.5:
+        return "/todos", f"/todos?phase={rng.choice(list(Phase)).value}"
+    return "/todos/{todo_id}", f"/todos/{rng.randint(1, rows)}"
+
+
+MIXES = {
+    "api": [api_target],
+    "web": [web_target],
+    "all": [api_target, web_target],
+}
+
+
+def default_targets(rows: int, mix: str = "api", seed: int = 0) -> List[Target]:
+    rng = random.Random(seed)
+    pickers = MIXES[mix]
+    return [rng.choice(pickers)(rng, rows) for _ in range(1000)]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, float]:
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / elapsed,
+        **{key: value * 1000 for key, value in percentiles(latencies).items()},
+    }
+
+
+async def drive(
+    base_url: str, targets: List[Target], requests: int, concurrency: int
+) -> Dict[str, Dict[str, float]]:
+    """Results under "all" plus one entry per route template."""
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    remaining = iter(range(requests))
+
+    async def worker(client: httpx.AsyncClient):
+        for i in remaining:
+            route, url = targets[i % len(targets)]
+            start = time.perf_counter()
+            try:
+                response = await client.get(url)
+                if response.status_code >= 400:
+                    errors[route] += 1
+            except httpx.HTTPError:
+                errors[route] += 1
+            latencies[route].append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    everything = [latency for samples in latencies.values() for latency in samples]
+    results = {"all": summarize(everything, sum(errors.values()), elapsed)}
+    for route in sorted(latencies):
+        results[route] = summarize(latencies[route], errors[route], elapsed)
+    return results
+
+
+def run(app: str, database: Path, rows: int, requests: int, concurrency: int, workers: int = 1,
+        mix: str = "api") -> Dict[str, Dict[str, float]]:
+    with serve(app, f"sqlite:///{database}", workers) as base_url:
+        return asyncio.run(drive(base_url, default_targets(rows, mix), requests, concurrency))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", action="append", dest="apps")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--mix", choices=sorted(MIXES), default="api")
+    parser.add_argument("--dir", type=Path, default=Path("benchmarks/data"))
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    database = seeded_database(args.rows, args.dir)
+    results = {}
+    for app in args.apps or ["app.main:app", "app.async_main:app"]:
+        for route, result in run(
+            app, database, args.rows, args.requests, args.concurrency, args.workers, args.mix
+        ).items():
+            results[f"{app} {route}"] = result
+            print(
+                f"{app:>22} {route:<22} {result['throughput']:7.0f} req/s  p50={result['p50']:.1f}ms  "
+                f"p95={result['p95']:.1f}ms  p99={result['p99']:.1f}ms  errors={result['errors']}"
+            )
+    if args.output:
+        params = {key: value for key, value in vars(args).items() if key not in ("dir", "output")}
+        save_results(args.output, "load", params, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""In-process microbenchmarks of TodoService reads and template rendering.
+
+    python -m benchmarks.micro --rows 10000 100000 --repeat 200 \
+        --output benchmarks/results/micro.json
+
+Runs against the seeded databases from benchmarks.seed (building any that
+are missing). Each case is timed `--repeat` times after a few warm-up calls;
+results are per-call latency percentiles in milliseconds. Templates are
+rendered straight from the Jinja2 environment with context built by the same
+service calls the web routes make, so render time is measured on its own.
+"""
+import argparse
+import random
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+
+from app.catalog import skills_for_phase
+from app.config import PHASE_SKILLS
+from app.database import create_sqlite_engine
+from app.models import Phase
+from app.pagination import next_cursor
+from app.routers.web import DASHBOARD_TODOS_PER_PHASE, PHASES, PRIORITIES, WEB_PAGE_SIZE, get_templates
+from app.services.todo_service import TodoService
+from benchmarks.common import Timer, percentiles, save_results, seeded_database
+
+WARMUP = 5
+
+
+def fake_request(path: str) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("benchmark", 80),
+        "path": path,
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+    })
+
+
+def render(name: str, context: Callable[[], dict]) -> Callable[[], str]:
+    template = get_templates().get_template(name)
+    return lambda: template.render(context())
+
+
+def cases(service: TodoService, rows: int, rng: random.Random) -> Dict[str, Callable[[], object]]:
+    ids = [rng.randint(1, rows) for _ in range(1000)]
+    phases = list(Phase)
+    first_page = service.list(limit=WEB_PAGE_SIZE)
+    second_page = next_cursor(first_page, WEB_PAGE_SIZE)
+    dashboard = {
+        "request": fake_request("/"),
+        "phases": PHASES,
+        "stats": service.stats(),
+        "todos_by_phase": service.recent_by_phase(limit=DASHBOARD_TODOS_PER_PHASE),
+        "skills_by_phase": {phase: list(PHASE_SKILLS.get(phase, [])) for phase in PHASES},
+    }
+    listing = {
+        "request": fake_request("/todos"),
+        "todos": first_page,
+        "phases": PHASES,
+        "priorities": PRIORITIES,
+        "phase": None,
+        "priority": None,
+        "completed": None,
+        "q": None,
+        "next_cursor": second_page,
+    }
+    detail = service.get(ids[0])
+
+    return {
+        "service.get_with_skills": lambda: service.get_with_skills(rng.choice(ids)),
+        "service.list_with_skills": lambda: service.list_with_skills(limit=WEB_PAGE_SIZE),
+        "service.list_with_skills[phase]": lambda: service.list_with_skills(
+            phase=rng.choice(phases), limit=WEB_PAGE_SIZE
+        ),
+        "service.list_with_skills[cursor]": lambda: service.list_with_skills(
+            limit=WEB_PAGE_SIZE, cursor=second_page
+        ),
+        "service.search": lambda: service.search("cache", limit=WEB_PAGE_SIZE),
+        "service.stats": service.stats,
+        "service.recent_by_phase": lambda: service.recent_by_phase(limit=DASHBOARD_TODOS_PER_PHASE),
+        "render index.html": render("index.html", lambda: dashboard),
+        "render todos/list.html": render("todos/list.html", lambda: listing),
+        "render todos/detail.html": render(
+            "todos/detail.html",
+            lambda: {
+                "request": fake_request(f"/todos/{detail.id}"),
+                "todo": detail,
+                "recommended_skills": skills_for_phase(detail.phase.value),
+            },
+        ),
+    }
+
+
+def measure(call: Callable[[], object], repeat: int, db: Session) -> Dict[str, float]:
+    for _ in range(WARMUP):
+        call()
+    samples: List[float] = []
+    for _ in range(repeat):
+        with Timer() as timer:
+            call()
+        samples.append(timer.elapsed)
+        # Drop loaded rows so every call pays for its own SELECT and hydration.
+        db.expunge_all()
+    samples.sort()
+    return {
+        "calls_per_sec": repeat / sum(samples),
+        **{key: value * 1000 for key, value in percentiles(samples).items()},
+    }
+
+
+def run(path: Path, rows: int, repeat: int, seed: int = 0) -> Dict[str, Dict[str, float]]:
+    engine = create_sqlite_engine(f"sqlite:///{path}", profile="production")
+    results = {}
+    with Session(bind=engine) as db:
+        service = TodoService(db)
+        for name, call in cases(service, rows, random.Random(seed)).items():
+            results[name] = measure(call, repeat, db)
+    engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--dir", type=Path, default=Path("benchmarks/data"))
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    results = {}
+    for rows in args.rows:
+        path = seeded_database(rows, args.dir)
+        for name, result in run(path, rows, args.repeat).items():
+            results[f"{name} @{rows}"] = result
+            print(
+                f"{name:>34} @{rows:<8} {result['calls_per_sec']:9.0f}/s  p50={result['p50']:.3f}ms  "
+                f"p95={result['p95']:.3f}ms  p99={result['p99']:.3f}ms"
+            )
+    if args.output:
+        save_results(args.output, "micro", {"rows": args.rows, "repeat": args.repeat}, results)
+
+
+if __name__ == "__main__":
+    main()
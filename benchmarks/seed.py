@@ -0,0 +1,30 @@
+"""Seed reusable benchmark databases at the standard sizes.
+
+    python -m benchmarks.seed --rows 10000 100000 1000000 --dir benchmarks/data
+
+Todos are spread across phases and priorities with the weights in
+benchmarks.common. Existing files are kept, so later runs of benchmarks.micro
+and benchmarks.load with the same --dir start immediately.
+"""
+import argparse
+from pathlib import Path
+
+from benchmarks.common import SEED_SIZES, Timer, seeded_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=list(SEED_SIZES))
+    parser.add_argument("--dir", type=Path, default=Path("benchmarks/data"))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        with Timer() as timer:
+            path = seeded_database(rows, args.dir, args.seed)
+        size_mb = path.stat().st_size / 1e6
+        print(f"{rows:>9} rows: {path}  {size_mb:7.1f} MB  {timer.elapsed:6.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Building list responses with per-todo skill models versus the shared catalog.
+
+    python -m benchmarks.skill_catalog --todos 1000 --repeat 20
+
+The baseline rebuilds SkillResponse objects from SKILL_DETAILS for every todo,
+as TodoService.to_response did before the catalog; the catalog path reuses the
+frozen objects. Both are followed by the JSON encoding a list response pays.
+"""
+import argparse
+import time
+from datetime import datetime
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.config import get_skills_for_phase
+from app.models import Phase, Priority, Todo
+from app.schemas import SkillResponse, TodoResponse
+from app.services.todo_service import TodoService
+
+TODO_LIST = TypeAdapter(List[TodoResponse])
+
+
+def baseline_response(todo: Todo) -> TodoResponse:
+    skills = get_skills_for_phase(todo.phase.value)
+    return TodoResponse(
+        id=todo.id,
+        title=todo.title,
+        description=todo.description,
+        phase=todo.phase,
+        priority=todo.priority,
+        due_date=todo.due_date,
+        completed=todo.completed,
+        created_at=todo.created_at,
+        updated_at=todo.updated_at,
+        recommended_skills=[SkillResponse(**skill) for skill in skills],
+    )
+
+
+def make_todos(count: int) -> List[Todo]:
+    phases = list(Phase)
+    now = datetime(2026, 2, 6, 20, 0)
+    return [
+        Todo(
+            id=i,
+            title=f"Todo {i}",
+            description=None,
+            phase=phases[i % len(phases)],
+            priority=Priority.MEDIUM,
+            due_date=None,
+            completed=False,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--todos", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    todos = make_todos(args.todos)
+    for label, build in (("per-todo", baseline_response), ("catalog", TodoService.to_response)):
+        elapsed = best_of(args.repeat, lambda: TODO_LIST.dump_json([build(t) for t in todos]))
+        print(f"{label:>9}: {elapsed * 1000:7.2f} ms for {args.todos} todos")
+
+
+if __name__ == "__main__":
+    main()
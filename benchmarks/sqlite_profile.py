@@ -0,0 +1,97 @@
+"""Mixed read/write throughput with and without the production SQLite profile.
+
+    python -m benchmarks.sqlite_profile --rows 10000 --threads 8 --seconds 5
+
+Each thread loops over a TodoService, listing a filtered page most of the
+time and creating or toggling a todo otherwise. Every profile runs against a
+fresh database file so journal modes do not leak between runs.
+"""
+import argparse
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.database import SQLITE_PROFILES, create_sqlite_engine
+from app.models import Phase, Priority
+from app.schemas import TodoCreate
+from app.services.todo_service import TodoService
+from benchmarks.common import seed_database
+
+
+def run_profile(profile: str, rows: int, threads: int, seconds: float, write_ratio: float):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_sqlite_engine(
+            f"sqlite:///{Path(tmp) / 'bench.db'}",
+            profile=profile,
+            pool_size=threads,
+            max_overflow=0,
+        )
+        seed_database(engine, rows)
+        Session = sessionmaker(bind=engine)
+        counts = {"reads": 0, "writes": 0, "locked": 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + seconds
+
+        def worker(seed: int):
+            rng = random.Random(seed)
+            local = {"reads": 0, "writes": 0, "locked": 0}
+            with Session() as session:
+                service = TodoService(session)
+                while time.perf_counter() < deadline:
+                    try:
+                        if rng.random() < write_ratio:
+                            if rng.random() < 0.5:
+                                service.create(
+                                    TodoCreate(
+                                        title="bench",
+                                        phase=rng.choice(list(Phase)),
+                                        priority=rng.choice(list(Priority)),
+                                    )
+                                )
+                            else:
+                                service.toggle_complete(rng.randint(1, rows))
+                            local["writes"] += 1
+                        else:
+                            service.list(phase=rng.choice(list(Phase)), limit=50)
+                            session.rollback()
+                            local["reads"] += 1
+                    except OperationalError:
+                        session.rollback()
+                        local["locked"] += 1
+            with lock:
+                for key, value in local.items():
+                    counts[key] += value
+
+        workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        engine.dispose()
+    total = counts["reads"] + counts["writes"]
+    return {**counts, "ops_per_sec": total / seconds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    for profile in SQLITE_PROFILES:
+        result = run_profile(profile, args.rows, args.threads, args.seconds, args.write_ratio)
+        print(
+            f"{profile:>10}: {result['ops_per_sec']:8.0f} ops/s  "
+            f"reads={result['reads']} writes={result['writes']} locked={result['locked']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""CPU cost of idle SSE subscribers and latency of one fan-out.
+
+    python -m benchmarks.sse_fanout --subscribers 1000 5000 --idle 10
+
+Subscribers are consumed in-process exactly as /api/events consumes them,
+without sockets. CPU time is measured while every stream sits idle, then a
+single publish from a worker thread is timed until every subscriber has it.
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+from app.events import Broadcaster
+from benchmarks.common import Timer
+
+
+async def measure(subscribers: int, idle: float):
+    events = Broadcaster()
+    received = 0
+    all_received = asyncio.Event()
+
+    async def consume(ready: asyncio.Event):
+        nonlocal received
+        async with events.subscribe() as subscription:
+            ready.set()
+            async for message in subscription.messages():
+                if message.startswith(b"event:"):
+                    received += 1
+                    if received == subscribers:
+                        all_received.set()
+
+    readies = [asyncio.Event() for _ in range(subscribers)]
+    tasks = [asyncio.create_task(consume(ready)) for ready in readies]
+    for ready in readies:
+        await ready.wait()
+
+    cpu_start = time.process_time()
+    await asyncio.sleep(idle)
+    idle_cpu = time.process_time() - cpu_start
+
+    with Timer() as timer:
+        threading.Thread(target=events.publish, args=("todo.deleted", {"id": 1})).start()
+        await all_received.wait()
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return idle_cpu, timer.elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[100, 1_000, 5_000])
+    parser.add_argument("--idle", type=float, default=10.0)
+    args = parser.parse_args()
+
+    for subscribers in args.subscribers:
+        idle_cpu, fan_out = asyncio.run(measure(subscribers, args.idle))
+        print(
+            f"{subscribers:>7} subscribers: idle CPU {idle_cpu / args.idle * 100:5.2f}% of a core  "
+            f"fan-out {fan_out * 1000:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Cold-start cost of an app entry point: import, app construction and first response.
+
+    python -m benchmarks.startup --app app.main:app --rows 10000 --runs 10 \
+        --output benchmarks/results/startup.json
+
+Every measurement is a fresh interpreter, as a new worker or test process
+would be:
+
+- import: `python -X importtime -c "import <module>"`, the cumulative time
+  reported for the app's module, plus its slowest direct imports;
+- load: wall time for uvicorn's importer to resolve the app string, which
+  imports the module and builds the app (calls it too, with --factory);
+- first response: from spawning uvicorn to the first 200 from --path, so it
+  includes interpreter start, lifespan/startup handlers and the request.
+
+Uvicorn runs over a private copy of the seeded database from benchmarks.seed,
+migrated beforehand with `python -m app.migrations` as a deploy would. It is
+started once before timing so that one-off work (a cold page cache) is
+reported separately as "first start" and the timed runs are ordinary
+restarts.
+"""
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import httpx
+
+from benchmarks.common import percentiles, save_results, seeded_database
+from benchmarks.load import free_port
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(module: str, env: Dict[str, str]) -> Tuple[float, Dict[str, float]]:
+    """Cumulative import time of `module` and of each of its direct imports, in ms."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env, capture_output=True, text=True, check=True,
+    ).stderr
+    rows = [
+        (len(indent), name, int(cumulative) / 1000)
+        for _, cumulative, indent, name in IMPORT_LINE.findall(stderr)
+    ]
+    # importtime prints a module after everything it imported, each nested
+    # import indented one step (two spaces) further.
+    total = next(ms for depth, name, ms in rows if depth == 1 and name == module)
+    children = {name: ms for depth, name, ms in rows if depth == 3}
+    return total, children
+
+
+def load_time(app: str, factory: bool, env: Dict[str, str]) -> float:
+    code = (
+        "import time; start = time.perf_counter()\n"
+        "from uvicorn.importer import import_from_string\n"
+        f"app = import_from_string({app!r})\n"
+        f"app = app() if {factory} else app\n"
+        "print(time.perf_counter() - start)"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return float(out) * 1000
+
+
+def first_response(app: str, factory: bool, path: str, env: Dict[str, str]) -> float:
+    port = free_port()
+    command = [sys.executable, "-m", "uvicorn", app, "--port", str(port), "--log-level", "warning"]
+    if factory:
+        command.append("--factory")
+    # One client for the whole poll: building one per attempt (an SSL
+    # context each time) would cost more than the gaps being measured.
+    client = httpx.Client(base_url=f"http://127.0.0.1:{port}")
+    start = time.perf_counter()
+    process = subprocess.Popen(command, env=env)
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                if client.get(path).status_code == 200:
+                    return (time.perf_counter() - start) * 1000
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline or process.poll() is not None:
+                raise RuntimeError(f"uvicorn did not start for {app}")
+            time.sleep(0.005)
+    finally:
+        client.close()
+        process.terminate()
+        process.wait()
+
+
+def run(app: str, factory: bool, database: Path, runs: int, path: str, top: int) -> Dict[str, Dict[str, float]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        copy = Path(tmp) / database.name
+        shutil.copyfile(database, copy)
+        env = {**os.environ, "AGENTIC_TODO_DATABASE_URL": f"sqlite:///{copy}"}
+        subprocess.run([sys.executable, "-m", "app.migrations"], env=env, check=True, capture_output=True)
+        first_start = first_response(app, factory, path, env)
+
+        samples: Dict[str, List[float]] = defaultdict(list)
+        children: Dict[str, List[float]] = defaultdict(list)
+        for _ in range(runs):
+            total, imports = import_times(app.split(":")[0], env)
+            samples["import"].append(total)
+            for name, ms in imports.items():
+                children[name].append(ms)
+            samples["load"].append(load_time(app, factory, env))
+            samples["first response"].append(first_response(app, factory, path, env))
+
+    results = {"first start": {"ms": first_start}}
+    for name, values in samples.items():
+        results[name] = percentiles(sorted(values))
+    slowest = sorted(children.items(), key=lambda item: -sum(item[1]))[:top]
+    for name, values in slowest:
+        results[f"import {name}"] = percentiles(sorted(values))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default="app.main:app")
+    parser.add_argument("--factory", action="store_true", help="the app string names an app factory")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--path", default="/api/todos?limit=1")
+    parser.add_argument("--top", type=int, default=8, help="slowest direct imports to report")
+    parser.add_argument("--dir", type=Path, default=Path("benchmarks/data"))
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    database = seeded_database(args.rows, args.dir)
+    results = run(args.app, args.factory, database, args.runs, args.path, args.top)
+    print(f"{args.app}: first start {results['first start']['ms']:.0f}ms")
+    for name, result in results.items():
+        if name != "first start":
+            print(f"  {name:<40} p50={result['p50']:7.1f}ms  p95={result['p95']:7.1f}ms")
+    if args.output:
+        params = {key: value for key, value in vars(args).items() if key not in ("dir", "output")}
+        save_results(args.output, "startup", params, results)
+
+
+if __name__ == "__main__":
+    main()
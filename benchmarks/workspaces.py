@@ -0,0 +1,111 @@
+"""Write throughput with writers spread over one or several workspaces.
+
+    python -m benchmarks.workspaces --writers 16 --workspaces 1 4 16 --seconds 5 --synchronous FULL
+
+Each writer thread is assigned a workspace round-robin and loops over
+TodoService on its own session, creating a todo or toggling one it created.
+With one workspace every writer queues on the same SQLite write lock; with
+several, writers only contend with the others in their workspace. Under
+synchronous=FULL each commit waits for an fsync, which workspaces can overlap.
+Every run starts from fresh files.
+"""
+import argparse
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.database import WorkspaceEngines
+from app.models import Phase, Priority
+from app.schemas import TodoCreate
+from app.services.todo_service import TodoService
+from benchmarks.common import percentiles, save_results
+
+
+def run(writers: int, workspaces: int, seconds: float, synchronous: str) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        engines = WorkspaceEngines(
+            tmp, max_engines=workspaces, profile="production", pragmas={"synchronous": synchronous}
+        )
+        names = [f"ws{i}" for i in range(workspaces)]
+        for name in names:
+            engines.get(name)
+        latencies: List[float] = []
+        locked = 0
+        lock = threading.Lock()
+        start = threading.Barrier(writers)
+
+        def writer(index: int):
+            nonlocal locked
+            rng = random.Random(index)
+            local: List[float] = []
+            local_locked = 0
+            created: List[int] = []
+            with Session(engines.get(names[index % workspaces])) as db:
+                service = TodoService(db)
+                start.wait()
+                deadline = time.perf_counter() + seconds
+                while time.perf_counter() < deadline:
+                    began = time.perf_counter()
+                    try:
+                        if not created or rng.random() < 0.5:
+                            created.append(service.create(TodoCreate(
+                                title="bench", phase=rng.choice(list(Phase)), priority=rng.choice(list(Priority))
+                            )).id)
+                        else:
+                            service.toggle_complete(rng.choice(created))
+                    except OperationalError:
+                        db.rollback()
+                        local_locked += 1
+                        continue
+                    local.append(time.perf_counter() - began)
+            with lock:
+                latencies.extend(local)
+                locked += local_locked
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        engines.close()
+
+    latencies.sort()
+    return {
+        "writes": len(latencies),
+        "locked": locked,
+        "throughput": len(latencies) / seconds,
+        **{key: value * 1000 for key, value in percentiles(latencies).items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--workspaces", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--synchronous", default="FULL")
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    results = {}
+    for workspaces in args.workspaces:
+        result = run(args.writers, workspaces, args.seconds, args.synchronous)
+        results[f"{workspaces} workspaces"] = result
+        print(
+            f"{workspaces:>3} workspaces  {result['throughput']:8.0f} writes/s  "
+            f"p50={result['p50']:.1f}ms  p95={result['p95']:.1f}ms  p99={result['p99']:.1f}ms  "
+            f"locked={result['locked']}"
+        )
+    if args.output:
+        params = {key: value for key, value in vars(args).items() if key != "output"}
+        save_results(args.output, "workspaces", params, results)
+
+
+if __name__ == "__main__":
+    main()
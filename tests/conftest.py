@@ -5,7 +5,14 @@ from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
 
 from app.database import Base, get_db
-from app.main import app
+from app.instrumentation import QueryBudget, instrument_engine
+from app.main import create_app
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The app under test; it leaves the schema to each test's own database."""
+    return create_app(migrate=False)
 
 
 @pytest.fixture(scope="function")
@@ -15,6 +22,7 @@ def db_engine():
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+    instrument_engine(engine)
     Base.metadata.create_all(engine)
     yield engine
     Base.metadata.drop_all(engine)
@@ -29,7 +37,35 @@ def db_session(db_engine):
 
 
 @pytest.fixture(scope="function")
-def client(db_session):
+def query_plan(db_session):
+    """Return EXPLAIN QUERY PLAN details for an ORM query on the test engine."""
+
+    def explain(query):
+        compiled = query.statement.compile(
+            dialect=db_session.get_bind().dialect,
+            compile_kwargs={"literal_binds": True},
+        )
+        rows = db_session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}")
+        return [row[3] for row in rows]
+
+    return explain
+
+
+@pytest.fixture(scope="function")
+def query_budget(db_engine):
+    """Fail if a block issues more statements than declared.
+
+        with query_budget(2):
+            client.get("/api/todos")
+
+    QueryBudget can also decorate a whole test; the test engine is
+    instrumented either way.
+    """
+    return QueryBudget
+
+
+@pytest.fixture(scope="function")
+def client(app, db_session):
     def override_get_db():
         try:
             yield db_session
@@ -1,5 +1,15 @@
+import asyncio
+import csv
+import io
+import json
+import tempfile
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.routers import api
+from app.services.todo_service import TodoService
 
 
 def test_create_todo(client):
@@ -35,6 +45,36 @@ def test_list_todos(client):
     assert len(data) == 2
 
 
+def test_list_todos_statement_count_is_constant(client, db_engine):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def list_statement_count():
+        statements.clear()
+        event.listen(db_engine, "before_cursor_execute", count)
+        try:
+            response = client.get("/api/todos")
+        finally:
+            event.remove(db_engine, "before_cursor_execute", count)
+        assert response.status_code == 200
+        return len(response.json()), len(statements)
+
+    client.post("/api/todos", json={"title": "One", "phase": "planning", "priority": "low"})
+    rows_small, statements_small = list_statement_count()
+
+    for i in range(20):
+        client.post(
+            "/api/todos",
+            json={"title": f"Todo {i}", "phase": "testing", "priority": "high"},
+        )
+    rows_large, statements_large = list_statement_count()
+
+    assert (rows_small, rows_large) == (1, 21)
+    assert statements_large == statements_small
+
+
 def test_list_todos_filter_by_phase(client):
     client.post(
         "/api/todos",
@@ -52,6 +92,37 @@ def test_list_todos_filter_by_phase(client):
     assert data[0]["title"] == "Planning"
 
 
+def test_list_todos_pagination(client):
+    for i in range(5):
+        client.post(
+            "/api/todos",
+            json={"title": f"Todo {i}", "phase": "planning", "priority": "low"},
+        )
+
+    titles = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/todos", params=params)
+        assert response.status_code == 200
+        titles.extend(t["title"] for t in response.json())
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert pages == 3
+    assert titles == [f"Todo {i}" for i in reversed(range(5))]
+
+
+def test_list_todos_invalid_cursor(client):
+    response = client.get("/api/todos", params={"cursor": "garbage"})
+    assert response.status_code == 400
+
+
 def test_get_todo(client):
     create_response = client.post(
         "/api/todos",
@@ -136,3 +207,335 @@ def test_get_phase(client):
 def test_get_phase_not_found(client):
     response = client.get("/api/phases/invalid")
     assert response.status_code == 404
+
+
+def test_batch_applies_all_operations_in_one_commit(client, db_engine):
+    keep_id = client.post(
+        "/api/todos", json={"title": "Keep", "phase": "planning", "priority": "low"}
+    ).json()["id"]
+    drop_id = client.post(
+        "/api/todos", json={"title": "Drop", "phase": "planning", "priority": "low"}
+    ).json()["id"]
+
+    commits = []
+
+    def record_commit(conn):
+        commits.append(conn)
+
+    event.listen(db_engine, "commit", record_commit)
+    try:
+        response = client.post(
+            "/api/todos:batch",
+            json={
+                "create": [
+                    {"title": "New 1", "phase": "design", "priority": "high"},
+                    {"title": "New 2", "phase": "testing", "priority": "low"},
+                ],
+                "update": [
+                    {"id": keep_id, "title": "Kept", "phase": "deployment"},
+                    {"id": 999, "title": "Missing"},
+                ],
+                "complete": [{"id": keep_id, "completed": True}],
+                "delete": [drop_id, 998],
+            },
+        )
+    finally:
+        event.remove(db_engine, "commit", record_commit)
+
+    assert response.status_code == 200
+    assert len(commits) == 1
+    results = {(r["op"], r["index"]): r for r in response.json()["results"]}
+    assert results[("create", 0)]["status"] == 201
+    assert results[("update", 0)]["status"] == 200
+    assert results[("update", 1)]["status"] == 404
+    assert results[("complete", 0)]["status"] == 200
+    assert results[("delete", 0)]["status"] == 204
+    assert results[("delete", 1)]["status"] == 404
+
+    kept = client.get(f"/api/todos/{keep_id}").json()
+    assert (kept["title"], kept["phase"], kept["completed"]) == ("Kept", "deployment", True)
+    assert client.get(f"/api/todos/{drop_id}").status_code == 404
+    new_id = results[("create", 1)]["id"]
+    assert client.get(f"/api/todos/{new_id}").json()["title"] == "New 2"
+
+
+def test_empty_batch_update_leaves_the_todo_untouched(client):
+    todo = client.post("/api/todos", json={"title": "Same", "phase": "design", "priority": "low"}).json()
+    etag = client.get(f"/api/todos/{todo['id']}").headers["etag"]
+
+    response = client.post("/api/todos:batch", json={"update": [{"id": todo["id"]}]})
+    assert response.json()["results"][0]["status"] == 200
+    client.put(f"/api/todos/{todo['id']}", json={})
+
+    after = client.get(f"/api/todos/{todo['id']}")
+    assert after.json()["updated_at"] == todo["updated_at"]
+    assert after.headers["etag"] == etag
+
+
+def test_batch_rejects_invalid_items(client):
+    response = client.post(
+        "/api/todos:batch",
+        json={"create": [{"title": "x" * 201, "phase": "design", "priority": "high"}]},
+    )
+    assert response.status_code == 422
+
+
+def test_export_ndjson_streams_filtered_rows(client):
+    client.post("/api/todos", json={"title": "One", "phase": "planning", "priority": "low"})
+    client.post("/api/todos", json={"title": "Two", "phase": "design", "priority": "high"})
+
+    response = client.get("/api/todos/export", params={"phase": "design"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 1
+    assert rows[0]["title"] == "Two"
+    assert rows[0]["phase"] == "design"
+    assert rows[0]["completed"] is False
+
+
+def test_export_csv(client):
+    client.post(
+        "/api/todos",
+        json={
+            "title": "Quoted, title",
+            "description": "multi\nline",
+            "phase": "testing",
+            "priority": "medium",
+            "due_date": "2026-02-10",
+        },
+    )
+
+    response = client.get("/api/todos/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]["title"] == "Quoted, title"
+    assert rows[0]["description"] == "multi\nline"
+    assert rows[0]["due_date"] == "2026-02-10"
+
+
+def test_import_ndjson_reports_bad_lines_and_keeps_good_ones(client, db_engine):
+    lines = [
+        json.dumps({"title": "One", "phase": "planning", "priority": "low"}),
+        "{not json",
+        json.dumps({"title": "Two", "phase": "design", "priority": "high", "due_date": "2026-03-01"}),
+        "",
+        json.dumps({"title": "Bad phase", "phase": "someday", "priority": "low"}),
+        json.dumps({"title": "Three", "phase": "testing", "priority": "medium"}),
+    ]
+    commits = []
+
+    def record_commit(conn):
+        commits.append(conn)
+
+    event.listen(db_engine, "commit", record_commit)
+    try:
+        response = client.post(
+            "/api/todos/import",
+            params={"chunk_size": 2},
+            content="\n".join(lines).encode(),
+        )
+    finally:
+        event.remove(db_engine, "commit", record_commit)
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["imported"], report["failed"], report["chunks"]) == (3, 2, 2)
+    assert [e["line"] for e in report["errors"]] == [2, 5]
+    assert "phase" in report["errors"][1]["error"]
+    assert len(commits) == 2
+    titles = {t["title"] for t in client.get("/api/todos").json()}
+    assert titles == {"One", "Two", "Three"}
+
+
+def test_import_spools_the_upload_off_the_event_loop(client, monkeypatch):
+    writes = []
+
+    class Spool(tempfile.SpooledTemporaryFile):
+        def write(self, data):
+            try:
+                asyncio.get_running_loop()
+                writes.append("loop")
+            except RuntimeError:
+                writes.append("thread")
+            return super().write(data)
+
+    monkeypatch.setattr(tempfile, "SpooledTemporaryFile", Spool)
+    monkeypatch.setattr(api, "IMPORT_SPOOL_MAX_MEMORY", 16)
+    lines = [json.dumps({"title": f"Todo {i}", "phase": "planning", "priority": "low"}) for i in range(50)]
+
+    response = client.post("/api/todos/import", content="\n".join(lines).encode())
+
+    assert response.json()["imported"] == 50
+    assert writes and set(writes) == {"thread"}
+
+
+def test_export_csv_round_trips_through_import(client):
+    client.post(
+        "/api/todos",
+        json={"title": "Has, comma", "description": "two\nlines", "phase": "design", "priority": "low"},
+    )
+    client.post("/api/todos", json={"title": "Plain", "phase": "testing", "priority": "high"})
+    exported = client.get("/api/todos/export", params={"format": "csv"}).content
+
+    response = client.post("/api/todos/import", params={"format": "csv"}, content=exported)
+
+    assert response.json()["imported"] == 2
+    descriptions = {t["title"]: t["description"] for t in client.get("/api/todos").json()}
+    assert descriptions["Has, comma"] == "two\nlines"
+    assert descriptions["Plain"] is None
+
+
+def test_import_retries_a_failed_chunk_row_by_row(client, db_session):
+    db_session.connection().exec_driver_sql(
+        "CREATE TRIGGER reject_bad BEFORE INSERT ON todos WHEN new.title = 'Bad' "
+        "BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+    )
+    db_session.commit()
+    lines = [
+        json.dumps({"title": title, "phase": "planning", "priority": "low"})
+        for title in ("One", "Bad", "Two", "Three")
+    ]
+
+    response = client.post(
+        "/api/todos/import", params={"chunk_size": 3}, content="\n".join(lines).encode()
+    )
+
+    report = response.json()
+    assert (report["imported"], report["failed"], report["chunks"]) == (3, 1, 2)
+    assert [e["line"] for e in report["errors"]] == [2]
+    assert {t["title"] for t in client.get("/api/todos").json()} == {"One", "Two", "Three"}
+
+
+def test_export_round_trip_keeps_completed(client):
+    todo_id = client.post(
+        "/api/todos", json={"title": "Done", "phase": "testing", "priority": "low"}
+    ).json()["id"]
+    client.patch(f"/api/todos/{todo_id}/complete")
+    client.post("/api/todos", json={"title": "Open", "phase": "testing", "priority": "low"})
+
+    exports = {
+        format: client.get("/api/todos/export", params={"format": format}).content
+        for format in ("ndjson", "csv")
+    }
+    for format, exported in exports.items():
+        response = client.post("/api/todos/import", params={"format": format}, content=exported)
+        assert response.json()["imported"] == 2
+
+    completed = [(t["title"], t["completed"]) for t in client.get("/api/todos").json()]
+    assert sorted(completed) == [("Done", True)] * 3 + [("Open", False)] * 3
+
+
+def test_get_todo_etag_and_last_modified(client):
+    todo_id = client.post(
+        "/api/todos", json={"title": "Cached", "phase": "design", "priority": "low"}
+    ).json()["id"]
+
+    first = client.get(f"/api/todos/{todo_id}")
+    etag = first.headers["ETag"]
+    assert "Last-Modified" in first.headers
+
+    cached = client.get(f"/api/todos/{todo_id}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+    since = client.get(
+        f"/api/todos/{todo_id}", headers={"If-Modified-Since": first.headers["Last-Modified"]}
+    )
+    assert since.status_code == 304
+
+    client.patch(f"/api/todos/{todo_id}/complete")
+    changed = client.get(f"/api/todos/{todo_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_revalidating_a_todo_does_not_build_it(client, monkeypatch):
+    todo_id = client.post(
+        "/api/todos", json={"title": "Cached", "phase": "design", "priority": "low"}
+    ).json()["id"]
+    etag = client.get(f"/api/todos/{todo_id}").headers["ETag"]
+
+    def build(self, todo_id):
+        raise AssertionError("built a response for a 304")
+
+    monkeypatch.setattr(TodoService, "get_with_skills", build)
+    assert client.get(f"/api/todos/{todo_id}", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/todos/999", headers={"If-None-Match": etag}).status_code == 404
+
+
+def test_list_todos_etag_follows_table_version(client):
+    client.post("/api/todos", json={"title": "One", "phase": "planning", "priority": "low"})
+    etag = client.get("/api/todos").headers["ETag"]
+
+    assert client.get("/api/todos", headers={"If-None-Match": etag}).status_code == 304
+    filtered = client.get("/api/todos?phase=planning", headers={"If-None-Match": etag})
+    assert filtered.status_code == 200
+
+    client.post("/api/todos", json={"title": "Two", "phase": "design", "priority": "low"})
+    after_create = client.get("/api/todos", headers={"If-None-Match": etag})
+    assert after_create.status_code == 200
+    assert len(after_create.json()) == 2
+
+
+def test_phases_etag(client):
+    etag = client.get("/api/phases").headers["ETag"]
+    assert client.get("/api/phases", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/phases", headers={"If-None-Match": f'W/{etag}'}).status_code == 304
+
+    phase_etag = client.get("/api/phases/testing").headers["ETag"]
+    assert phase_etag != etag
+    assert client.get("/api/phases/testing", headers={"If-None-Match": phase_etag}).status_code == 304
+
+
+def test_stats(client):
+    client.post("/api/todos", json={"title": "One", "phase": "design", "priority": "high"})
+
+    response = client.get("/api/stats")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1
+    assert data["by_phase"]["design"] == 1
+    assert data["by_priority"]["high"] == 1
+
+
+def test_search_todos(client):
+    for title in ("Fix parser", "Parser docs", "Login flow"):
+        client.post("/api/todos", json={"title": title, "phase": "design", "priority": "low"})
+
+    response = client.get("/api/todos/search", params={"q": "parser", "limit": 1})
+    assert response.status_code == 200
+    first = response.json()
+    assert len(first) == 1
+    assert "rank" in first[0]
+    assert first[0]["recommended_skills"]
+
+    cursor = response.headers["X-Next-Cursor"]
+    response = client.get("/api/todos/search", params={"q": "parser", "limit": 1, "cursor": cursor})
+    second = response.json()
+    assert {first[0]["title"], second[0]["title"]} == {"Fix parser", "Parser docs"}
+
+    response = client.get("/api/todos/search", params={"q": "parser", "limit": 1, "cursor": "bad"})
+    assert response.status_code == 400
+    assert client.get("/api/todos/search").status_code == 422
+
+
+def test_changes_feed_and_compaction(client):
+    first = client.post("/api/todos", json={"title": "One", "phase": "planning", "priority": "low"}).json()
+    feed = client.get("/api/changes").json()
+    assert [c["id"] for c in feed["changes"]] == [first["id"]]
+
+    client.delete(f"/api/todos/{first['id']}")
+    delta = client.get("/api/changes", params={"since": feed["since"]}).json()
+    assert delta["changes"] == [
+        {"seq": delta["since"], "id": first["id"], "deleted": True, "todo": None}
+    ]
+
+    compacted = client.post("/api/changes:compact", params={"retention_days": 0}).json()
+    assert compacted["tombstones"] == 1
+    response = client.get("/api/changes", params={"since": feed["since"]})
+    assert response.status_code == 410
+    assert client.get("/api/changes").json()["changes"] == []
@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.cache import MemoryCache, TodoCache
+from app.database import Base, create_sqlite_engine
+from app.models import ArchivedTodo, Phase, Priority, Todo
+from app.pagination import next_cursor
+from app.schemas import TodoCreate
+from app.services import archive
+from app.services.cached_todo_service import CachedTodoService
+from app.services.todo_service import TodoService, search_key
+
+
+def make_todos(service, count, completed=False, age_days=0, title="Todo"):
+    ids = []
+    for i in range(count):
+        todo = service.create(TodoCreate(title=f"{title} {i}", phase=Phase.TESTING, priority=Priority.LOW))
+        ids.append(todo.id)
+    service.db.execute(
+        update(Todo)
+        .where(Todo.id.in_(ids))
+        .values(completed=completed, updated_at=datetime.utcnow() - timedelta(days=age_days))
+    )
+    service.db.commit()
+    return ids
+
+
+def test_archive_moves_only_old_completed_todos(db_session):
+    service = TodoService(db_session)
+    old_done = make_todos(service, 5, completed=True, age_days=100)
+    recent_done = make_todos(service, 2, completed=True, age_days=1)
+    old_open = make_todos(service, 2, completed=False, age_days=100)
+
+    report = service.archive_completed(timedelta(days=90), batch_size=2)
+
+    assert report.archived == 5
+    assert report.batches == 3
+    hot = set(db_session.scalars(select(Todo.id)))
+    assert hot == set(recent_done) | set(old_open)
+    assert set(db_session.scalars(select(ArchivedTodo.id))) == set(old_done)
+    assert service.get(old_done[0]) is None
+    assert service.archive_completed(timedelta(days=90)).archived == 0
+
+
+def test_list_and_search_include_archived_on_request(db_session):
+    service = TodoService(db_session)
+    archived = make_todos(service, 3, completed=True, age_days=100, title="Shipped release")
+    hot = make_todos(service, 3, completed=True, title="Shipped hotfix")
+    service.archive_completed(timedelta(days=90))
+
+    assert [t.id for t in service.list()] == hot[::-1]
+    assert [t.id for t in service.list(include_archived=True)] == (archived + hot)[::-1]
+    assert service.list(completed=False, include_archived=True) == []
+
+    assert {t.id for t, _ in service.search("shipped")} == set(hot)
+    hits = service.search_with_skills("shipped", include_archived=True)
+    assert {hit.id for hit in hits} == set(archived + hot)
+    assert [search_key(hit) for hit in hits] == sorted(search_key(hit) for hit in hits)
+
+
+def test_include_archived_pages_across_both_tables(db_session):
+    service = TodoService(db_session)
+    archived = make_todos(service, 4, completed=True, age_days=100)
+    hot = make_todos(service, 3)
+    service.archive_completed(timedelta(days=90))
+
+    seen, cursor = [], None
+    while True:
+        page = service.list_with_skills(limit=3, cursor=cursor, include_archived=True)
+        seen.extend(todo.id for todo in page)
+        cursor = next_cursor(page, 3)
+        if cursor is None:
+            break
+    assert seen == (archived + hot)[::-1]
+
+
+def test_archived_ids_are_not_reused(db_session):
+    service = TodoService(db_session)
+    archived = make_todos(service, 2, completed=True, age_days=100)
+    service.archive_completed(timedelta(days=90))
+
+    todo = service.create(TodoCreate(title="After", phase=Phase.PLANNING, priority=Priority.LOW))
+
+    assert todo.id > max(archived)
+
+
+def test_cached_service_forgets_archived_todos(db_session):
+    service = CachedTodoService(db_session, TodoCache(MemoryCache(ttl=60)))
+    todo_id, = make_todos(service, 1, completed=True, age_days=100)
+    assert service.get_with_skills(todo_id) is not None
+    assert [t.id for t in service.list_with_skills()] == [todo_id]
+
+    service.archive_completed(timedelta(days=90))
+
+    assert service.get_with_skills(todo_id) is None
+    assert service.list_with_skills() == []
+    assert [t.id for t in service.list_with_skills(include_archived=True)] == [todo_id]
+
+
+def test_incremental_vacuum_releases_freed_pages(tmp_path):
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'archive.db'}", profile="production")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        service = TodoService(db)
+        make_todos(service, 300, completed=True, age_days=100, title="x" * 150)
+
+        report = service.archive_completed(timedelta(days=90))
+
+        assert report.archived == 300
+        assert report.pages_freed > 0
+        assert archive.incremental_vacuum(db) == 0
+    engine.dispose()
+
+
+def test_vacuum_is_skipped_without_incremental_auto_vacuum(db_session):
+    assert archive.incremental_vacuum(db_session) is None
+
+
+def test_archive_endpoint(client, db_session):
+    service = TodoService(db_session)
+    make_todos(service, 3, completed=True, age_days=100)
+
+    response = client.post("/api/todos:archive", params={"older_than_days": 90})
+
+    assert response.status_code == 200
+    assert response.json() == {"archived": 3, "batches": 1, "pages_freed": None}
+    assert client.get("/api/todos").json() == []
+    listed = client.get("/api/todos", params={"include_archived": True})
+    assert len(listed.json()) == 3
+    assert listed.headers["etag"] != client.get("/api/todos").headers["etag"]
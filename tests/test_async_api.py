@@ -0,0 +1,141 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.async_database import get_async_db
+from app.async_main import create_app
+from app.database import Base, get_db
+from app.instrumentation import instrument_engine
+from app.routers import api, async_api
+
+
+@pytest.fixture(scope="module")
+def app():
+    return create_app(migrate=False)
+
+
+@pytest.fixture(scope="function")
+def client(app, tmp_path):
+    # One file behind both sessions: the routes without an async version are
+    # the sync API's, and they must see what the async ones wrote.
+    path = tmp_path / "async.db"
+    sync_engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(sync_engine)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    instrument_engine(engine.sync_engine)
+    AsyncSession = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    SyncSession = sessionmaker(bind=sync_engine)
+
+    async def override_get_async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    def override_get_db():
+        with SyncSession() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_db] = override_get_db
+    # aiosqlite connections belong to the event loop that opened them, so the
+    # engine is disposed on the TestClient's loop.
+    with TestClient(app) as test_client:
+        yield test_client
+        test_client.portal.call(engine.dispose)
+    app.dependency_overrides.clear()
+    sync_engine.dispose()
+
+
+def test_create_and_get_todo(client):
+    create_response = client.post(
+        "/api/todos",
+        json={"title": "Async todo", "phase": "implementation", "priority": "high"},
+    )
+    assert create_response.status_code == 201
+    todo_id = create_response.json()["id"]
+
+    response = client.get(f"/api/todos/{todo_id}")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["title"] == "Async todo"
+    assert data["recommended_skills"][0]["name"] == "test-driven-development"
+
+
+def test_list_todos_filter_and_paginate(client):
+    for i in range(3):
+        client.post("/api/todos", json={"title": f"Plan {i}", "phase": "planning", "priority": "low"})
+    client.post("/api/todos", json={"title": "Design", "phase": "design", "priority": "low"})
+
+    first = client.get("/api/todos", params={"phase": "planning", "limit": 2})
+    assert [t["title"] for t in first.json()] == ["Plan 2", "Plan 1"]
+
+    second = client.get(
+        "/api/todos",
+        params={"phase": "planning", "limit": 2, "cursor": first.headers["X-Next-Cursor"]},
+    )
+    assert [t["title"] for t in second.json()] == ["Plan 0"]
+    assert "X-Next-Cursor" not in second.headers
+
+
+def test_update_toggle_and_delete(client):
+    todo_id = client.post(
+        "/api/todos", json={"title": "Original", "phase": "testing", "priority": "low"}
+    ).json()["id"]
+
+    updated = client.put(f"/api/todos/{todo_id}", json={"title": "Updated"})
+    assert updated.json()["title"] == "Updated"
+
+    toggled = client.patch(f"/api/todos/{todo_id}/complete")
+    assert toggled.json()["completed"] is True
+
+    assert client.delete(f"/api/todos/{todo_id}").status_code == 204
+    assert client.get(f"/api/todos/{todo_id}").status_code == 404
+    assert client.patch(f"/api/todos/{todo_id}/complete").status_code == 404
+
+
+def test_phases_are_served(client):
+    assert len(client.get("/api/phases").json()) == 5
+    assert client.get("/api/phases/invalid").status_code == 404
+
+
+def test_serves_every_route_of_the_sync_api():
+    def routes(router):
+        return [(route.path, route.methods) for route in router.routes]
+
+    assert routes(async_api.router) == routes(api.router)
+
+
+def test_sync_routes_see_async_writes(client):
+    todo_id = client.post(
+        "/api/todos", json={"title": "Shared", "phase": "design", "priority": "low"}
+    ).json()["id"]
+    client.patch(f"/api/todos/{todo_id}/complete")
+
+    assert [hit["title"] for hit in client.get("/api/todos/search", params={"q": "shared"}).json()] == ["Shared"]
+    assert client.get("/api/stats").json()["completed"] == 1
+    changes = client.get("/api/changes").json()["changes"]
+    assert [change["id"] for change in changes] == [todo_id]
+
+
+def test_server_timing_counts_async_statements(client):
+    client.post("/api/todos", json={"title": "A", "phase": "design", "priority": "low"})
+
+    response = client.get("/api/todos")
+
+    assert 'desc="1 query"' in response.headers["Server-Timing"]
+
+
+def test_fast_json_matches_model_responses(client, monkeypatch):
+    for i in range(3):
+        client.post("/api/todos", json={"title": f"Plan {i}", "phase": "planning", "priority": "low"})
+    expected = client.get("/api/todos", params={"limit": 2})
+    expected_one = client.get("/api/todos/1")
+
+    monkeypatch.setattr(async_api, "FAST_JSON", True)
+    response = client.get("/api/todos", params={"limit": 2})
+
+    assert response.json() == expected.json()
+    assert response.headers["X-Next-Cursor"] == expected.headers["X-Next-Cursor"]
+    assert client.get("/api/todos/1").json() == expected_one.json()
+    assert client.patch("/api/todos/1/complete").json()["completed"] is True
@@ -0,0 +1,195 @@
+import pytest
+from sqlalchemy import event
+
+from app import cache as cache_module
+from app.cache import MemoryCache, SQLiteCache, TodoCache, groups_containing
+from app.models import Phase, Priority
+from app.routers import api
+from app.schemas import TodoCreate, TodoUpdate
+from app.services import cached_todo_service
+from app.services.cached_todo_service import CachedTodoService
+from app.services.todo_service import TodoService
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryCache(ttl=60)
+    return SQLiteCache(str(tmp_path / "cache.db"), ttl=60)
+
+
+@pytest.fixture
+def cached_service(db_session, backend):
+    return CachedTodoService(db_session, TodoCache(backend))
+
+
+@pytest.fixture
+def statements(db_engine):
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(db_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(db_engine, "before_cursor_execute", record)
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(ttl=60, max_entries=2)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.get("a")
+    cache.set("c", b"3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (2, 1, 1, 2)
+
+
+def test_expired_entries_are_misses(backend):
+    backend.ttl = 0
+    backend.set("a", b"1")
+
+    assert backend.get("a") is None
+    assert backend.stats().expirations == 1
+
+
+def test_counters_only_move_forward(backend):
+    backend.incr(["x", "y"])
+    x, y = backend.counter("x"), backend.counter("y")
+    backend.incr(["x"])
+
+    assert backend.counter("x") > max(x, y)
+    assert backend.counter("y") == y
+    assert backend.counter("z") == 0
+
+
+def test_counters_are_bounded_and_dropped_ones_never_go_back(backend, monkeypatch):
+    monkeypatch.setattr(cache_module, "SQLITE_PRUNE_INTERVAL", 1)
+    backend.max_entries = 2
+    seen = {}
+    for key in ["a", "b", "a", "c", "d"]:
+        backend.incr([key])
+        value = backend.counter(key)
+        assert value > max(seen.get(key, [0]))
+        seen.setdefault(key, []).append(value)
+
+    # Dropped: at or past their last value, never back at an earlier one.
+    assert backend.counter("a") >= max(seen["a"])
+    assert backend.counter("b") >= max(seen["b"])
+    assert backend.counter("never") > 0
+    if isinstance(backend, MemoryCache):
+        assert len(backend._counters) == 2
+    else:
+        with backend.engine.connect() as conn:
+            assert conn.exec_driver_sql("SELECT count(*) FROM cache_counters").scalar() == 2
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "shared.db")
+    SQLiteCache(path).set("k", b"v")
+    SQLiteCache(path).incr(["gen"])
+
+    other = SQLiteCache(path)
+    assert other.get("k") == b"v"
+    assert other.counter("gen") == 1
+
+
+def test_sqlite_cache_prunes_oldest_beyond_max_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_module, "SQLITE_PRUNE_INTERVAL", 3)
+    cache = SQLiteCache(str(tmp_path / "c.db"), ttl=60, max_entries=2)
+    for key in "abc":
+        cache.set(key, b"v")
+
+    assert cache.get("a") is None
+    assert cache.stats().evictions == 1
+    assert cache.size() == 2
+
+
+def test_groups_containing_covers_every_filter_combination():
+    groups = groups_containing(Phase.DESIGN, Priority.HIGH, False)
+
+    assert len(groups) == 8
+    assert "*:*:*" in groups
+    assert "design:high:False" in groups
+    assert "design:*:False" in groups
+
+
+def test_list_is_served_from_cache_until_a_write(cached_service, statements):
+    cached_service.create(TodoCreate(title="A", phase=Phase.DESIGN, priority=Priority.LOW))
+    first = cached_service.list_with_skills(phase=Phase.DESIGN, limit=10)
+    statements.clear()
+
+    second = cached_service.list_with_skills(phase=Phase.DESIGN, limit=10)
+    assert statements == []
+    assert second == first
+
+    cached_service.create(TodoCreate(title="B", phase=Phase.DESIGN, priority=Priority.LOW))
+    assert [t.title for t in cached_service.list_with_skills(phase=Phase.DESIGN, limit=10)] == ["B", "A"]
+
+
+def test_writes_invalidate_only_affected_groups(cached_service, statements):
+    todo = cached_service.create(TodoCreate(title="A", phase=Phase.DESIGN, priority=Priority.LOW))
+    cached_service.list_with_skills(phase=Phase.TESTING)
+    cached_service.list_with_skills(phase=Phase.PLANNING)
+    cached_service.list_with_skills(phase=Phase.DESIGN)
+
+    cached_service.update(todo.id, TodoUpdate(phase=Phase.TESTING))
+    statements.clear()
+
+    cached_service.list_with_skills(phase=Phase.PLANNING)
+    assert statements == []
+    assert [t.title for t in cached_service.list_with_skills(phase=Phase.TESTING)] == ["A"]
+    assert cached_service.list_with_skills(phase=Phase.DESIGN) == []
+
+
+def test_get_with_skills_is_cached_and_invalidated(cached_service, statements):
+    todo = cached_service.create(TodoCreate(title="A", phase=Phase.DESIGN, priority=Priority.LOW))
+    cached_service.get_with_skills(todo.id)
+    cached_service.db.expunge_all()
+    statements.clear()
+
+    assert cached_service.get_with_skills(todo.id).title == "A"
+    assert statements == []
+
+    cached_service.toggle_complete(todo.id)
+    assert cached_service.get_with_skills(todo.id).completed is True
+    cached_service.delete(todo.id)
+    assert cached_service.get_with_skills(todo.id) is None
+
+
+@pytest.mark.parametrize("getter", ["get_with_skills", "get_dict"])
+def test_a_write_between_read_and_set_is_not_cached(cached_service, monkeypatch, getter):
+    todo = cached_service.create(TodoCreate(title="A", phase=Phase.DESIGN, priority=Priority.LOW))
+    read = getattr(TodoService, getter)
+
+    def read_then_race(self, todo_id):
+        row = read(self, todo_id)
+        monkeypatch.setattr(TodoService, getter, read)
+        cached_service.delete(todo_id)  # commits and invalidates before the reader caches
+        return row
+
+    monkeypatch.setattr(TodoService, getter, read_then_race)
+    assert getattr(cached_service, getter)(todo.id) is not None
+
+    assert getattr(cached_service, getter)(todo.id) is None
+
+
+def test_cache_stats_endpoint(client, monkeypatch):
+    assert client.get("/api/cache").status_code == 404
+
+    cache = TodoCache(MemoryCache(ttl=60))
+    monkeypatch.setattr(api, "todo_cache", cache)
+    monkeypatch.setattr(cached_todo_service, "todo_cache", cache)
+    todo_id = client.post(
+        "/api/todos", json={"title": "A", "phase": "design", "priority": "low"}
+    ).json()["id"]
+    client.get(f"/api/todos/{todo_id}")
+    client.get(f"/api/todos/{todo_id}")
+
+    stats = client.get("/api/cache").json()
+    assert stats["backend"] == "memory"
+    assert stats["hits"] >= 1
+    assert stats["entries"] >= 1
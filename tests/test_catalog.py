@@ -0,0 +1,49 @@
+import json
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from app.catalog import PHASE_JSON, PHASE_RESPONSES, PHASES_JSON, skills_for_phase
+from app.config import PHASE_SKILLS, get_skills_for_phase
+from app.models import Phase, Priority, Todo
+from app.services.todo_service import TodoService
+
+
+def test_catalog_covers_every_phase():
+    assert set(PHASE_RESPONSES) == set(PHASE_SKILLS)
+    for phase, response in PHASE_RESPONSES.items():
+        assert [s.name for s in response.skills] == PHASE_SKILLS[phase]
+
+
+def test_catalog_is_immutable():
+    with pytest.raises(TypeError):
+        PHASE_RESPONSES["planning"] = None
+    with pytest.raises(ValidationError):
+        skills_for_phase("planning")[0].name = "renamed"
+
+
+def test_skills_for_unknown_phase_is_empty():
+    assert skills_for_phase("invalid") == ()
+
+
+def test_precomputed_json_matches_skill_details():
+    phases = json.loads(PHASES_JSON)
+    assert [p["name"] for p in phases] == list(PHASE_SKILLS)
+    assert phases[0]["skills"] == get_skills_for_phase(phases[0]["name"])
+    assert json.loads(PHASE_JSON["testing"]) == phases[3]
+
+
+def test_responses_share_catalog_skill_objects():
+    now = datetime(2026, 2, 6, 20, 0)
+    todo = Todo(
+        id=1,
+        title="Shared",
+        phase=Phase.DESIGN,
+        priority=Priority.LOW,
+        completed=False,
+        created_at=now,
+        updated_at=now,
+    )
+    response = TodoService.to_response(todo)
+    assert response.recommended_skills[0] is skills_for_phase("design")[0]
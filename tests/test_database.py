@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy import text
+
+from app.database import create_sqlite_engine
+
+
+def pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_production_profile_applies_pragmas(tmp_path):
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'prod.db'}", profile="production")
+
+    assert pragma(engine, "journal_mode") == "wal"
+    assert pragma(engine, "synchronous") == 1
+    assert pragma(engine, "busy_timeout") == 5000
+    assert pragma(engine, "temp_store") == 2
+    assert pragma(engine, "cache_size") == -64 * 1024
+    engine.dispose()
+
+
+def test_default_profile_keeps_sqlite_defaults(tmp_path):
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'plain.db'}", profile="default")
+
+    assert pragma(engine, "journal_mode") == "delete"
+    engine.dispose()
+
+
+def test_pragma_overrides(tmp_path):
+    engine = create_sqlite_engine(
+        f"sqlite:///{tmp_path / 'custom.db'}",
+        profile="production",
+        pragmas={"busy_timeout": 250},
+    )
+
+    assert pragma(engine, "busy_timeout") == 250
+    assert pragma(engine, "journal_mode") == "wal"
+    engine.dispose()
+
+
+def test_unknown_profile_is_rejected(tmp_path):
+    with pytest.raises(KeyError):
+        create_sqlite_engine(f"sqlite:///{tmp_path / 'x.db'}", profile="turbo")
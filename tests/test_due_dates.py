@@ -0,0 +1,182 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models import DueDateCount, Phase, Priority, Todo
+from app.pagination import encode_cursor, next_cursor
+from app.schemas import (
+    CalendarBucket,
+    TodoBatchComplete,
+    TodoBatchRequest,
+    TodoCreate,
+    TodoUpdate,
+)
+from app.services.todo_service import TodoService, due_key
+
+TODAY = date(2026, 3, 11)  # a Wednesday
+
+
+def add(service, due_in, title="Todo", completed=False, today=TODAY):
+    todo = service.create(
+        TodoCreate(
+            title=title,
+            phase=Phase.IMPLEMENTATION,
+            priority=Priority.HIGH,
+            due_date=today + timedelta(days=due_in),
+        )
+    )
+    if completed:
+        service.toggle_complete(todo.id)
+    return todo.id
+
+
+def summary(db):
+    return {
+        row.due_date: (row.total, row.open)
+        for row in db.scalars(select(DueDateCount).where(DueDateCount.total > 0))
+    }
+
+
+def recount(db):
+    rows = db.execute(
+        select(Todo.due_date, func.count(), func.sum(~Todo.completed))
+        .where(Todo.due_date.is_not(None))
+        .group_by(Todo.due_date)
+    )
+    return {due_date: (total, open_) for due_date, total, open_ in rows}
+
+
+def test_due_date_counts_follow_every_write(db_session):
+    service = TodoService(db_session)
+    a = add(service, 0)
+    b = add(service, 0, completed=True)
+    c = add(service, 3)
+    assert summary(db_session) == {TODAY: (2, 1), TODAY + timedelta(days=3): (1, 1)}
+
+    service.update(a, TodoUpdate(due_date=TODAY + timedelta(days=3)))
+    service.toggle_complete(b)
+    service.update(c, TodoUpdate(due_date=None))
+    service.delete(a)
+    service.create(TodoCreate(title="Undated", phase=Phase.PLANNING, priority=Priority.LOW))
+    service.apply_batch(TodoBatchRequest(complete=[TodoBatchComplete(id=b, completed=True)]))
+
+    assert summary(db_session) == recount(db_session) == {TODAY: (1, 0)}
+
+
+def test_due_date_counts_backfill_existing_rows():
+    engine = create_engine("sqlite:///:memory:")
+    Todo.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            Todo.__table__.insert(),
+            [
+                {
+                    "title": title,
+                    "phase": Phase.DESIGN,
+                    "priority": Priority.LOW,
+                    "due_date": TODAY,
+                    "completed": done,
+                }
+                for title, done in (("a", False), ("b", True))
+            ],
+        )
+
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as db:
+        assert summary(db) == {TODAY: (2, 1)}
+
+
+def test_overdue_and_due_soon(db_session):
+    service = TodoService(db_session)
+    late = [add(service, -5), add(service, -1)]
+    add(service, -2, completed=True)
+    soon = [add(service, 0), add(service, 7)]
+    add(service, 8)
+
+    assert [t.id for t in service.overdue(today=TODAY)] == late
+    assert [t.id for t in service.due_soon(7, today=TODAY)] == soon
+    assert len(service.due_between(end=TODAY, completed=None)) == 4
+
+
+def test_due_pages_follow_the_cursor(db_session):
+    service = TodoService(db_session)
+    ids = [add(service, -day) for day in (3, 1, 2, 1)]
+
+    seen, cursor = [], None
+    while True:
+        page = service.overdue(today=TODAY, limit=3, cursor=cursor)
+        seen.extend(todo.id for todo in page)
+        cursor = next_cursor(page, 3, key=due_key)
+        if cursor is None:
+            break
+
+    assert seen == [ids[0], ids[2], ids[1], ids[3]]
+
+
+@pytest.mark.parametrize("with_cursor", [False, True])
+def test_due_queries_are_range_scans_on_an_index(db_session, query_plan, with_cursor):
+    cursor = encode_cursor("2026-03-01", 10) if with_cursor else None
+    query = TodoService(db_session).due_query(end=TODAY, phase=Phase.DESIGN, cursor=cursor)
+    plan = query_plan(query.limit(20))
+
+    assert any("ix_todos_completed_due_date" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+def test_due_date_counts_by_week(db_session):
+    service = TodoService(db_session)
+    for due_in in (-2, 0, 4, 5):  # Monday, Wednesday, Sunday, next Monday
+        add(service, due_in)
+    add(service, 0, completed=True)
+
+    days = service.due_date_counts(TODAY, TODAY + timedelta(days=5))
+    weeks = service.due_date_counts(
+        TODAY - timedelta(days=2), TODAY + timedelta(days=5), CalendarBucket.WEEK
+    )
+
+    assert [(d.start, d.total, d.open) for d in days] == [
+        (TODAY, 2, 1),
+        (TODAY + timedelta(days=4), 1, 1),
+        (TODAY + timedelta(days=5), 1, 1),
+    ]
+    assert [(w.start, w.total, w.open) for w in weeks] == [
+        (TODAY - timedelta(days=2), 4, 3),
+        (TODAY + timedelta(days=5), 1, 1),
+    ]
+
+
+def test_due_endpoints(client, db_session):
+    def ids(url, **params):
+        return [todo["id"] for todo in client.get(url, params=params).json()]
+
+    service = TodoService(db_session)
+    today = date.today()
+    late = add(service, -1, today=today)
+    soon = add(service, 2, today=today)
+
+    assert ids("/api/todos/overdue") == [late]
+    assert ids("/api/todos/due", within_days=1) == []
+    assert ids("/api/todos/due", within_days=2) == [soon]
+
+    calendar = client.get(
+        "/api/todos/calendar",
+        params={"start": str(today - timedelta(days=7)), "end": str(today + timedelta(days=7))},
+    )
+    assert calendar.status_code == 200
+    assert [day["total"] for day in calendar.json()] == [1, 1]
+    backwards = client.get("/api/todos/calendar", params={"start": "2026-03-02", "end": "2026-03-01"})
+    assert backwards.status_code == 400
+    assert client.get("/api/todos/overdue", params={"cursor": "nope"}).status_code == 400
+
+
+def test_due_page(client, db_session):
+    add(TodoService(db_session), 0, title="Ship it", today=date.today())
+
+    response = client.get("/todos/due")
+
+    assert response.status_code == 200
+    assert "Ship it" in response.text
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import threading
+
+from fastapi import Request
+
+from app.events import RESET, Broadcaster
+from app.models import Phase, Priority
+from app.routers import api
+from app.schemas import TodoCreate
+from app.services.todo_service import TodoService
+
+
+def parse(message: bytes):
+    lines = dict(line.split(": ", 1) for line in message.decode().strip().splitlines())
+    return lines["event"], json.loads(lines["data"])
+
+
+def test_publish_fans_out_to_every_subscriber():
+    async def scenario():
+        events = Broadcaster()
+        async with events.subscribe() as first, events.subscribe() as second:
+            events.publish("todo.deleted", {"id": 1})
+            assert first.queue.get_nowait() is second.queue.get_nowait()
+        assert not events.subscriptions
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_is_dropped_with_reset():
+    async def scenario():
+        events = Broadcaster(queue_size=2)
+        async with events.subscribe() as slow:
+            for i in range(3):
+                events.publish("todo.deleted", {"id": i})
+            assert slow.dropped
+            assert events.dropped == 1
+            assert not events.subscriptions
+            messages = [message async for message in slow.messages()]
+        assert messages[-1] is RESET
+        assert len(messages) == 2  # retry hint, then reset
+
+    asyncio.run(scenario())
+
+
+def test_publish_from_worker_thread_is_delivered_on_the_loop():
+    async def scenario():
+        events = Broadcaster()
+        async with events.subscribe() as subscription:
+            thread = threading.Thread(target=events.publish, args=("todo.deleted", {"id": 7}))
+            thread.start()
+            thread.join()
+            message = await asyncio.wait_for(subscription.queue.get(), 1)
+        assert parse(message) == ("todo.deleted", {"id": 7})
+
+    asyncio.run(scenario())
+
+
+def test_heartbeat_on_idle_stream():
+    async def scenario():
+        events = Broadcaster(heartbeat=0.01)
+        async with events.subscribe() as subscription:
+            stream = subscription.messages()
+            assert (await stream.__anext__()).startswith(b"retry:")
+            assert await stream.__anext__() == b": ping\n\n"
+            await stream.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_service_publishes_after_commit(db_session):
+    async def scenario():
+        events = Broadcaster()
+        service = TodoService(db_session, events=events)
+        async with events.subscribe() as subscription:
+            todo = service.create(TodoCreate(title="Live", phase=Phase.DESIGN, priority=Priority.LOW))
+            service.toggle_complete(todo.id)
+            service.delete(todo.id)
+            received = [parse(subscription.queue.get_nowait()) for _ in range(3)]
+        assert [event for event, _ in received] == ["todo.created", "todo.updated", "todo.deleted"]
+        assert received[1][1]["completed"] is True
+        assert "recommended_skills" not in received[0][1]
+
+    asyncio.run(scenario())
+
+
+def test_events_endpoint_streams_published_events(monkeypatch):
+    async def scenario():
+        events = Broadcaster()
+        monkeypatch.setattr(api, "broadcaster", events)
+        response = await api.stream_events(Request({"type": "http", "headers": []}))
+        assert response.media_type == "text/event-stream"
+        body = response.body_iterator
+        assert (await body.__anext__()).startswith(b"retry:")
+        events.publish("todo.deleted", {"id": 3})
+        assert parse(await body.__anext__()) == ("todo.deleted", {"id": 3})
+        await body.aclose()
+        assert not events.subscriptions
+
+    asyncio.run(scenario())
@@ -0,0 +1,107 @@
+import pytest
+
+from app.cache import MemoryCache, TodoCache
+from app.routers import api
+from app.schemas import TodoCreate
+from app.services.cached_todo_service import CachedTodoService
+from app.models import Phase, Priority
+
+
+@pytest.fixture
+def fast_json(monkeypatch):
+    def enable(on: bool = True):
+        monkeypatch.setattr(api, "FAST_JSON", on)
+
+    return enable
+
+
+def seed(client):
+    todos = [
+        {"title": "Ship parser", "phase": "implementation", "priority": "high", "due_date": "2026-03-01"},
+        {"title": "Design ünïcode cache", "description": "LRU", "phase": "design", "priority": "low"},
+        {"title": "Test the parser", "phase": "testing", "priority": "medium"},
+    ]
+    return [client.post("/api/todos", json=todo).json()["id"] for todo in todos]
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/todos",
+        "/api/todos?limit=2",
+        "/api/todos?phase=design",
+        "/api/todos/search?q=parser",
+        "/api/todos/search?q=parser&limit=1",
+    ],
+)
+def test_fast_json_lists_match_the_model_path(client, fast_json, path):
+    seed(client)
+    expected = client.get(path)
+
+    fast_json()
+    response = client.get(path)
+
+    assert response.json() == expected.json()
+    assert response.headers["content-type"] == "application/json"
+    for header in ("ETag", "Cache-Control", "X-Next-Cursor"):
+        assert response.headers.get(header) == expected.headers.get(header)
+
+
+def test_fast_json_cursor_pages_through_everything(client, fast_json):
+    seed(client)
+    fast_json()
+
+    first = client.get("/api/todos", params={"limit": 2})
+    second = client.get("/api/todos", params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+
+    assert [t["title"] for t in first.json() + second.json()] == [
+        "Test the parser", "Design ünïcode cache", "Ship parser"
+    ]
+    assert "X-Next-Cursor" not in second.headers
+
+
+def test_fast_json_single_todo_routes_match(client, fast_json):
+    todo_id = seed(client)[0]
+    expected = client.get(f"/api/todos/{todo_id}")
+
+    fast_json()
+    response = client.get(f"/api/todos/{todo_id}")
+    assert response.json() == expected.json()
+    assert response.headers["Last-Modified"] == expected.headers["Last-Modified"]
+    assert client.get(
+        f"/api/todos/{todo_id}", headers={"If-None-Match": response.headers["ETag"]}
+    ).status_code == 304
+    assert client.get("/api/todos/999").status_code == 404
+
+    created = client.post("/api/todos", json={"title": "New", "phase": "planning", "priority": "low"})
+    assert created.status_code == 201
+    assert created.json()["recommended_skills"][0]["name"] == "brainstorming"
+    updated = client.put(f"/api/todos/{todo_id}", json={"title": "Renamed"})
+    assert updated.json()["title"] == "Renamed"
+    toggled = client.patch(f"/api/todos/{todo_id}/complete")
+    assert toggled.json()["completed"] is True
+
+    fast_json(False)
+    assert client.get(f"/api/todos/{todo_id}").json() == toggled.json()
+
+
+def test_fast_json_leaves_openapi_unchanged(app, fast_json):
+    app.openapi_schema = None
+    expected = app.openapi()
+    fast_json()
+    app.openapi_schema = None
+
+    assert app.openapi() == expected
+
+
+def test_cached_dicts_and_models_share_entries(db_session):
+    service = CachedTodoService(db_session, TodoCache(MemoryCache(ttl=60)))
+    todo = service.create(TodoCreate(title="A", phase=Phase.DESIGN, priority=Priority.LOW))
+
+    models = service.list_with_skills(limit=10)
+    assert service.list_dicts(limit=10) == [m.model_dump(mode="json") for m in models]
+    assert service.cache.backend.hits == 1
+
+    expected = service.get_with_skills(todo.id).model_dump(mode="json")
+    assert service.get_dict(todo.id) == expected
+    assert service.cache.backend.hits == 2
@@ -0,0 +1,150 @@
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from app import group_commit
+from app.database import Base, create_sqlite_engine
+from app.group_commit import GroupCommitter
+from app.main import create_app
+from app.models import Phase, Priority, Todo
+from app.schemas import TodoCreate
+from app.services.todo_service import TodoService, insert_statement
+
+
+@pytest.fixture
+def database(tmp_path):
+    url = f"sqlite:///{tmp_path / 'writes.db'}"
+    engine = create_sqlite_engine(url, profile="production")
+    Base.metadata.create_all(engine)
+    yield url, sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def committer(database):
+    writer = GroupCommitter(database[0], window=0.05, max_batch=64, profile="production")
+    yield writer
+    writer.close()
+
+
+def count_todos(Session) -> int:
+    with Session() as db:
+        return db.scalar(select(func.count()).select_from(Todo))
+
+
+def todo(title: str) -> TodoCreate:
+    return TodoCreate(title=title, phase=Phase.DESIGN, priority=Priority.LOW)
+
+
+def test_concurrent_writes_share_commits(database, committer):
+    _, Session = database
+    ids = []
+    start = threading.Barrier(16)
+
+    def write(i):
+        with Session() as db:
+            service = TodoService(db, writer=committer)
+            start.wait()
+            ids.append(service.create(todo(f"Todo {i}")).id)
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(ids) == list(range(1, 17))
+    assert count_todos(Session) == 16
+    assert committer.writes == 16
+    assert committer.batches < 16
+
+
+def test_a_failing_write_only_fails_its_caller(database, committer):
+    _, Session = database
+    good = committer.enqueue(insert_statement(todo("Good")))
+    bad = committer.enqueue(
+        insert(Todo).values(title=None, phase=Phase.DESIGN, priority=Priority.LOW).returning(Todo.id)
+    )
+    also_good = committer.enqueue(insert_statement(todo("Also good")))
+
+    assert good.result().title == "Good"
+    assert also_good.result().title == "Also good"
+    with pytest.raises(IntegrityError):
+        bad.result()
+    assert committer.batches == 1
+    assert count_todos(Session) == 2
+
+
+def test_service_reads_see_its_own_group_committed_writes(database, committer):
+    _, Session = database
+    with Session() as db:
+        service = TodoService(db, writer=committer)
+        created = service.create(todo("Mine"))
+        assert service.get(created.id).completed is False
+
+        assert service.toggle_complete(created.id).completed is True
+        assert service.get(created.id).completed is True
+        assert service.delete(created.id).title == "Mine"
+        assert service.get(created.id) is None
+        assert service.delete(created.id) is None
+
+
+def test_close_commits_queued_writes_then_refuses_more(database):
+    url, Session = database
+    writer = GroupCommitter(url, window=1.0, profile="production")
+    pending = [writer.enqueue(insert_statement(todo(f"Todo {i}"))) for i in range(3)]
+
+    writer.close()
+
+    assert [p.result().title for p in pending] == ["Todo 0", "Todo 1", "Todo 2"]
+    assert count_todos(Session) == 3
+    with pytest.raises(RuntimeError):
+        writer.enqueue(insert_statement(todo("Late")))
+
+
+def test_writes_racing_close_are_committed_or_refused(database):
+    url, Session = database
+    writer = GroupCommitter(url, window=0.001, profile="production")
+    outcomes = []
+    start = threading.Barrier(9)
+
+    def write(i):
+        start.wait()
+        for j in range(20):
+            try:
+                future = writer.enqueue(insert_statement(todo(f"Todo {i}.{j}")))
+            except RuntimeError:
+                outcomes.append("refused")
+                return
+            outcomes.append(future.result(timeout=10).title)
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    start.wait()
+    writer.close()
+    for t in threads:
+        t.join(timeout=10)
+
+    assert not any(t.is_alive() for t in threads)
+    assert count_todos(Session) == len([o for o in outcomes if o != "refused"])
+    with pytest.raises(RuntimeError):
+        writer.enqueue(insert_statement(todo("Late")))
+
+
+def test_the_app_writer_runs_only_while_the_app_does(database, monkeypatch):
+    url, _ = database
+    monkeypatch.setattr(group_commit, "create_group_committer", lambda: GroupCommitter(url, profile="production"))
+    assert group_commit.group_committer is None
+
+    with TestClient(create_app(migrate=False)) as client:
+        writer = group_commit.group_committer
+        assert client.post("/api/todos", json={"title": "Grouped", "phase": "design", "priority": "low"}).status_code == 201
+        assert writer.writes == 1
+
+    assert group_commit.group_committer is None
+    assert not writer._thread.is_alive()
@@ -0,0 +1,117 @@
+import json
+import logging
+import re
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app import instrumentation
+from app.instrumentation import QueryBudget, QueryBudgetExceeded
+
+
+def create(client, title="One", phase="planning"):
+    return client.post("/api/todos", json={"title": title, "phase": phase, "priority": "low"}).json()
+
+
+def test_server_timing_reports_statement_count(client):
+    create(client)
+
+    response = client.get("/api/todos")
+
+    timing = response.headers["Server-Timing"]
+    assert re.fullmatch(r'db;dur=\d+\.\d\d;desc="2 queries", app;dur=\d+\.\d\d', timing), timing
+    assert 'desc="0 queries"' in client.get("/api/phases").headers["Server-Timing"]
+
+
+def test_each_request_is_logged_as_json(client, caplog):
+    create(client)
+    caplog.set_level(logging.INFO, logger="app.sql")
+
+    client.get("/api/todos", params={"phase": "planning"})
+
+    entries = [json.loads(r.getMessage()) for r in caplog.records if r.name == "app.sql"]
+    entry = next(e for e in entries if e["path"] == "/api/todos")
+    assert (entry["method"], entry["status"], entry["statements"]) == ("GET", 200, 2)
+    assert len(entry["slowest"]) == 2
+    assert entry["slowest"][0]["ms"] >= entry["slowest"][1]["ms"]
+    assert any(s["sql"].startswith("SELECT todos.id") for s in entry["slowest"])
+
+
+def test_slow_requests_log_a_warning(client, caplog, monkeypatch):
+    monkeypatch.setattr(instrumentation, "SQL_SLOW_REQUEST_MS", 0)
+    caplog.set_level(logging.WARNING, logger="app.sql")
+
+    client.get("/api/stats")
+
+    assert any(r.levelno == logging.WARNING for r in caplog.records if r.name == "app.sql")
+
+
+def test_query_budget_fails_when_exceeded(client, query_budget):
+    create(client)
+
+    with pytest.raises(QueryBudgetExceeded, match="2 statements issued, budget is 1"):
+        with query_budget(1):
+            client.get("/api/todos")
+
+
+@pytest.mark.parametrize(
+    "method, url, budget",
+    [
+        ("GET", "/api/todos", 2),
+        ("GET", "/api/todos/{id}", 1),
+        ("GET", "/api/todos/search?q=one", 2),
+        ("GET", "/api/stats", 1),
+        ("GET", "/api/changes", 2),
+        ("GET", "/api/phases", 0),
+        ("PUT", "/api/todos/{id}", 1),
+        ("PATCH", "/api/todos/{id}/complete", 1),
+        ("DELETE", "/api/todos/{id}", 1),
+        ("GET", "/", 2),
+    ],
+)
+def test_endpoint_query_budgets(client, db_session, query_budget, method, url, budget):
+    for i in range(5):
+        create(client, title=f"Todo {i}", phase="design")
+    todo = create(client)
+    # Requests get a fresh session in production; start from an empty identity map.
+    db_session.expunge_all()
+
+    with query_budget(budget):
+        response = client.request(method, url.format(id=todo["id"]), json={"title": "One v2"})
+    assert response.status_code < 400
+
+
+def test_create_is_one_statement(client, query_budget):
+    with query_budget(1):
+        response = client.post("/api/todos", json={"title": "One", "phase": "design", "priority": "low"})
+    assert response.status_code == 201
+    assert response.json()["recommended_skills"]
+
+
+@QueryBudget(3 + 2)
+def test_query_budget_decorates_a_whole_test(client):
+    for i in range(3):
+        create(client, title=f"Todo {i}")
+    assert len(client.get("/api/todos").json()) == 3
+
+
+def test_failed_statements_leave_no_timing_state(db_session, query_budget, monkeypatch):
+    # Each reading of the clock is 10s after the last, so a statement timed
+    # from its own start takes exactly 10s and one timed from a leftover
+    # start takes longer.
+    readings = iter(range(0, 1000, 10))
+    monkeypatch.setattr(instrumentation, "time", SimpleNamespace(perf_counter=lambda: next(readings)))
+    conn = db_session.connection()
+    info = repr(conn.info)
+    with query_budget(2) as budget:
+        with pytest.raises(IntegrityError):
+            conn.exec_driver_sql("INSERT INTO todos (id, title) VALUES (NULL, NULL)")
+        db_session.rollback()
+        conn = db_session.connection()
+        conn.exec_driver_sql("SELECT 1")
+
+    assert budget.stats.count == 1
+    assert budget.stats.seconds == 10
+    assert budget.stats.slowest() == [{"ms": 10000.0, "sql": "SELECT 1"}]
+    assert repr(conn.info) == info
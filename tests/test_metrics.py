@@ -0,0 +1,78 @@
+import os
+import subprocess
+import sys
+
+from prometheus_client import REGISTRY
+
+from app.cache import MemoryCache
+from app.metrics import render_metrics
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_latency_is_labelled_by_route_template(client):
+    todo_id = client.post(
+        "/api/todos", json={"title": "A", "phase": "design", "priority": "low"}
+    ).json()["id"]
+    labels = {"method": "GET", "route": "/api/todos/{todo_id}", "status": "200"}
+    before = sample("http_request_duration_seconds_count", **labels)
+
+    client.get(f"/api/todos/{todo_id}")
+    client.get(f"/api/todos/{todo_id}")
+
+    assert sample("http_request_duration_seconds_count", **labels) == before + 2
+
+
+def test_unmatched_paths_share_one_label(client):
+    labels = {"method": "GET", "route": "unmatched", "status": "404"}
+    before = sample("http_request_duration_seconds_count", **labels)
+
+    client.get("/no/such/page/1")
+    client.get("/no/such/page/2")
+
+    assert sample("http_request_duration_seconds_count", **labels) == before + 2
+
+
+def test_metrics_endpoint_serves_text_format(client):
+    client.get("/")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'template_render_seconds_count{template="index.html"}' in body
+    assert 'http_requests_in_flight{method="GET"} 1.0' in body
+    assert "db_pool_checkout_wait_seconds_bucket" in body
+
+
+def test_cache_events_are_counted_per_backend():
+    before = sample("todo_cache_events_total", backend="memory", event="miss")
+    cache = MemoryCache(ttl=60)
+    cache.get("a")
+    cache.set("a", b"1")
+    cache.get("a")
+
+    assert sample("todo_cache_events_total", backend="memory", event="miss") == before + 1
+    assert sample("todo_cache_events_total", backend="memory", event="hit") >= 1
+
+
+def test_multiprocess_mode_merges_workers(tmp_path, monkeypatch):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    worker = (
+        "from app.metrics import REQUEST_LATENCY;"
+        "REQUEST_LATENCY.labels('GET', '/api/todos', 200).observe(0.01)"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", worker], env=env, cwd=root, check=True)
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+    body = render_metrics().decode()
+
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/api/todos",status="200"} 2.0'
+        in body
+    )
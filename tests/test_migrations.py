@@ -0,0 +1,157 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import MetaData, create_engine, inspect
+from sqlalchemy.orm import Session
+
+from app import database, migrations
+from app.main import create_app
+from app.migrations import MIGRATIONS, migrate, pending, schema_version
+from app.models import Phase, Priority, Todo
+from app.schemas import TodoCreate
+from app.services.todo_service import TodoService
+
+
+def version(engine):
+    with engine.connect() as conn:
+        return schema_version(conn)
+
+
+def legacy_database(path):
+    """A file as create_all at import used to leave it: todos without
+    AUTOINCREMENT or the due-date index, and no other tables yet."""
+    engine = create_engine(f"sqlite:///{path}")
+    todos = Todo.__table__.to_metadata(MetaData())
+    todos.dialect_options["sqlite"]["autoincrement"] = False
+    todos.create(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_todos_completed_due_date")
+        conn.execute(
+            todos.insert(),
+            [
+                {"title": f"Old {i}", "phase": Phase.DESIGN, "priority": Priority.LOW}
+                for i in range(3)
+            ],
+        )
+    return engine
+
+
+def test_new_database_is_created_at_the_latest_version(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'new.db'}")
+
+    assert migrate(engine) == list(range(1, len(MIGRATIONS) + 1))
+    assert version(engine) == len(MIGRATIONS)
+    assert {"todos", "todos_archive", "due_date_counts"} <= set(inspect(engine).get_table_names())
+    assert migrate(engine) == []
+    assert pending(engine) == 0
+
+
+def test_legacy_database_is_upgraded_in_place(tmp_path):
+    engine = legacy_database(tmp_path / "legacy.db")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DELETE FROM todos WHERE id = 3")
+    assert pending(engine) == len(MIGRATIONS)
+
+    migrate(engine)
+
+    with engine.connect() as conn:
+        sql = conn.exec_driver_sql("SELECT sql FROM sqlite_master WHERE name = 'todos'").scalar()
+        indexes = {index["name"] for index in inspect(conn).get_indexes("todos")}
+    assert "AUTOINCREMENT" in sql
+    assert {"ix_todos_completed_due_date", "ix_todos_phase_created_at"} <= indexes
+    with Session(engine) as db:
+        service = TodoService(db)
+        assert {t.title for t, _ in service.search("old")} == {"Old 0", "Old 1"}
+        new = service.create(TodoCreate(title="New", phase=Phase.PLANNING, priority=Priority.LOW))
+        assert new.id == 3  # nothing recorded id 3, so it may be handed out again
+        service.delete(new.id)
+        assert service.create(TodoCreate(title="Next", phase=Phase.PLANNING, priority=Priority.LOW)).id == 4
+        assert [t.title for t, _ in service.search("next")] == ["Next"]
+
+
+def test_rebuild_starts_ids_above_archived_and_deleted_ones(tmp_path):
+    engine = legacy_database(tmp_path / "legacy.db")
+    with engine.begin() as conn:
+        migrations.create_schema(conn)
+        conn.exec_driver_sql("INSERT INTO todo_changes (todo_id, op, changed_at) VALUES (7, 'delete', '2026-01-01')")
+        conn.exec_driver_sql("DELETE FROM todos WHERE id = 3")
+
+    migrate(engine)
+
+    with Session(engine) as db:
+        todo = TodoService(db).create(TodoCreate(title="New", phase=Phase.PLANNING, priority=Priority.LOW))
+    assert todo.id == 8
+
+
+def test_todos_from_before_the_change_log_are_synced(tmp_path):
+    engine = legacy_database(tmp_path / "legacy.db")
+
+    migrate(engine)
+
+    with Session(engine) as db:
+        service = TodoService(db)
+        changes = service.changes_since(0)
+        assert [c.todo.title for c in changes.changes] == ["Old 0", "Old 1", "Old 2"]
+        service.delete(2)
+        changes = service.changes_since(changes.since)
+    assert [(c.id, c.deleted) for c in changes.changes] == [(2, True)]
+
+
+def test_change_log_backfill_runs_once_for_migrated_files(tmp_path):
+    engine = legacy_database(tmp_path / "legacy.db")
+    with engine.begin() as conn:
+        for step in MIGRATIONS[:-1]:
+            step(conn)
+        conn.exec_driver_sql("DELETE FROM todo_changes")
+        conn.exec_driver_sql(f"PRAGMA user_version = {len(MIGRATIONS) - 1}")
+
+    assert migrate(engine) == [len(MIGRATIONS)]
+
+    with engine.begin() as conn:
+        migrations.backfill_change_log(conn)
+    with Session(engine) as db:
+        assert [c.id for c in TodoService(db).changes_since(0).changes] == [1, 2, 3]
+
+
+def test_a_failed_migration_rolls_back_and_keeps_the_version(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    migrate(engine)
+
+    def broken(conn):
+        conn.exec_driver_sql("CREATE TABLE half_done (id INTEGER)")
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(migrations, "MIGRATIONS", [*MIGRATIONS, broken])
+    with pytest.raises(RuntimeError):
+        migrate(engine)
+
+    assert version(engine) == len(MIGRATIONS)
+    assert "half_done" not in inspect(engine).get_table_names()
+
+
+def test_app_migrates_on_startup_only_when_asked(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    monkeypatch.setattr(database, "engine", engine)
+
+    with TestClient(create_app(migrate=False)):
+        assert version(engine) == 0
+    with TestClient(create_app(migrate=True)) as client:
+        assert version(engine) == len(MIGRATIONS)
+        assert client.get("/api/phases").status_code == 200
+
+
+def test_importing_the_app_module_does_no_work(tmp_path):
+    path = tmp_path / "untouched.db"
+    code = (
+        "import sys, app.main, app.async_main\n"
+        "assert 'app.routers.api' not in sys.modules\n"
+        "assert 'app.database' not in sys.modules\n"
+    )
+    env = {**os.environ, "AGENTIC_TODO_DATABASE_URL": f"sqlite:///{path}"}
+
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
+
+    assert not path.exists()
@@ -1,9 +1,14 @@
+import itertools
+from datetime import date
+
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.database import Base
 from app.models import Todo, Phase, Priority
+from app.pagination import encode_cursor
+from app.services.todo_service import TodoService
 
 
 def test_todo_model_creates_with_required_fields():
@@ -56,3 +61,49 @@ def test_priority_enum_values():
     assert Priority.LOW.value == "low"
     assert Priority.MEDIUM.value == "medium"
     assert Priority.HIGH.value == "high"
+
+
+FILTER_VALUES = {
+    "phase": Phase.DESIGN,
+    "priority": Priority.HIGH,
+    "completed": False,
+}
+
+
+@pytest.mark.parametrize("with_cursor", [False, True])
+@pytest.mark.parametrize(
+    "filters",
+    [
+        dict(zip(FILTER_VALUES, combo))
+        for combo in itertools.product(*[(None, value) for value in FILTER_VALUES.values()])
+    ],
+    ids=lambda filters: "-".join(k for k, v in filters.items() if v is not None) or "none",
+)
+def test_list_queries_are_served_by_an_index(db_session, query_plan, filters, with_cursor):
+    cursor = encode_cursor("2026-02-06T20:00:00", 10) if with_cursor else None
+    plan = query_plan(TodoService(db_session).query(cursor=cursor, **filters).limit(20))
+
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+    assert all("USING INDEX" in step for step in plan if step.startswith("SCAN todos")), plan
+
+
+def test_due_date_range_uses_index(db_session, query_plan):
+    query = db_session.query(Todo).filter(Todo.due_date < date(2026, 2, 10))
+    assert any("ix_todos_due_date" in step for step in query_plan(query))
+
+
+def test_search_index_backfills_existing_rows():
+    engine = create_engine("sqlite:///:memory:")
+    Todo.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            Todo.__table__.insert(),
+            [{"title": "Legacy parser bug", "phase": Phase.DESIGN, "priority": Priority.LOW}],
+        )
+
+    Base.metadata.create_all(engine)
+    Base.metadata.create_all(engine)
+
+    with sessionmaker(bind=engine)() as session:
+        hits = TodoService(session).search("parser")
+    assert [todo.title for todo, _ in hits] == ["Legacy parser bug"]
@@ -1,11 +1,12 @@
 import pytest
-from datetime import date
+from datetime import date, timedelta
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.database import Base
 from app.models import Todo, Phase, Priority
-from app.services.todo_service import TodoService
+from app.pagination import InvalidCursor, next_cursor
+from app.services.todo_service import ChangesExpired, TodoService, match_expression, search_key
 from app.schemas import TodoCreate, TodoUpdate
 
 
@@ -93,8 +94,9 @@ def test_delete_todo(todo_service):
     todo = todo_service.create(
         TodoCreate(title="Delete me", phase=Phase.PLANNING, priority=Priority.LOW)
     )
-    result = todo_service.delete(todo.id)
-    assert result is True
+    deleted = todo_service.delete(todo.id)
+    assert deleted.title == "Delete me"
+    assert todo_service.delete(todo.id) is None
 
     fetched = todo_service.get(todo.id)
     assert fetched is None
@@ -113,6 +115,23 @@ def test_toggle_complete(todo_service):
     assert toggled_again.completed is False
 
 
+def test_toggle_flips_the_stored_value_not_a_stale_copy(todo_service, db_session):
+    todo = todo_service.create(TodoCreate(title="Race", phase=Phase.PLANNING, priority=Priority.LOW))
+    assert todo_service.get(todo.id).completed is False
+    other = TodoService(sessionmaker(bind=db_session.get_bind())())
+
+    other.toggle_complete(todo.id)
+
+    assert todo_service.toggle_complete(todo.id).completed is False
+
+
+def test_update_without_fields_keeps_updated_at(todo_service):
+    todo = todo_service.create(TodoCreate(title="Same", phase=Phase.PLANNING, priority=Priority.LOW))
+
+    assert todo_service.update(todo.id, TodoUpdate()).updated_at == todo.updated_at
+    assert todo_service.update(999, TodoUpdate()) is None
+
+
 def test_get_with_skills(todo_service):
     todo = todo_service.create(
         TodoCreate(title="With skills", phase=Phase.PLANNING, priority=Priority.LOW)
@@ -122,3 +141,186 @@ def test_get_with_skills(todo_service):
     assert response is not None
     assert len(response.recommended_skills) >= 2
     assert response.recommended_skills[0].name == "brainstorming"
+
+
+def test_list_with_skills(todo_service):
+    todo_service.create(TodoCreate(title="One", phase=Phase.PLANNING, priority=Priority.LOW))
+    todo_service.create(TodoCreate(title="Two", phase=Phase.TESTING, priority=Priority.HIGH))
+
+    responses = todo_service.list_with_skills(phase=Phase.TESTING)
+    assert len(responses) == 1
+    assert responses[0].title == "Two"
+    assert responses[0].recommended_skills[0].name == "test-driven-development"
+
+
+def test_list_todos_keyset_pagination(todo_service):
+    for i in range(5):
+        todo_service.create(TodoCreate(title=f"Todo {i}", phase=Phase.PLANNING, priority=Priority.LOW))
+
+    first = todo_service.list(limit=2)
+    cursor = next_cursor(first, 2)
+    second = todo_service.list(limit=2, cursor=cursor)
+    third = todo_service.list(limit=2, cursor=next_cursor(second, 2))
+
+    titles = [t.title for t in first + second + third]
+    assert titles == ["Todo 4", "Todo 3", "Todo 2", "Todo 1", "Todo 0"]
+    assert next_cursor(third, 2) is None
+
+
+def test_list_todos_invalid_cursor(todo_service):
+    with pytest.raises(InvalidCursor):
+        todo_service.list(limit=2, cursor="not-a-cursor")
+
+
+def test_iter_rows_streams_plain_tuples(todo_service, db_session):
+    for i in range(5):
+        todo_service.create(TodoCreate(title=f"Todo {i}", phase=Phase.TESTING, priority=Priority.LOW))
+    todo_service.create(TodoCreate(title="Other", phase=Phase.DESIGN, priority=Priority.LOW))
+    db_session.expunge_all()
+
+    rows = list(todo_service.iter_rows(phase=Phase.TESTING, batch_size=2))
+
+    assert [row.title for row in rows] == [f"Todo {i}" for i in reversed(range(5))]
+    assert len(db_session.identity_map) == 0
+
+
+def test_table_version_counts_every_write(todo_service):
+    start = todo_service.table_version()
+    todo = todo_service.create(TodoCreate(title="One", phase=Phase.PLANNING, priority=Priority.LOW))
+    todo_service.toggle_complete(todo.id)
+    todo_service.delete(todo.id)
+
+    assert todo_service.table_version() == start + 3
+
+
+def test_stats_counts_by_phase_priority_and_completion(todo_service):
+    todo_service.create(TodoCreate(title="A", phase=Phase.PLANNING, priority=Priority.LOW))
+    todo_service.create(TodoCreate(title="B", phase=Phase.PLANNING, priority=Priority.HIGH))
+    done = todo_service.create(TodoCreate(title="C", phase=Phase.TESTING, priority=Priority.HIGH))
+    todo_service.toggle_complete(done.id)
+
+    stats = todo_service.stats()
+
+    assert (stats.total, stats.open, stats.completed) == (3, 2, 1)
+    assert stats.by_phase["planning"] == 2
+    assert stats.by_phase["design"] == 0
+    assert stats.open_by_phase["testing"] == 0
+    assert stats.by_priority == {"low": 1, "medium": 0, "high": 2}
+
+
+def test_recent_by_phase_limits_each_phase(todo_service):
+    for i in range(4):
+        todo_service.create(TodoCreate(title=f"Plan {i}", phase=Phase.PLANNING, priority=Priority.LOW))
+    done = todo_service.create(TodoCreate(title="Done", phase=Phase.PLANNING, priority=Priority.LOW))
+    todo_service.toggle_complete(done.id)
+    todo_service.create(TodoCreate(title="Design", phase=Phase.DESIGN, priority=Priority.LOW))
+
+    recent = todo_service.recent_by_phase(limit=2)
+
+    assert [t.title for t in recent["planning"]] == ["Plan 3", "Plan 2"]
+    assert [t.title for t in recent["design"]] == ["Design"]
+    assert recent["deployment"] == []
+
+
+def test_match_expression_quotes_terms():
+    assert match_expression("fix parser*") == '"fix" "parser"*'
+    assert match_expression('title:x OR "y') == '"title" "x" "OR" "y"'
+    assert match_expression("  *** ") is None
+
+
+def test_search_ranks_title_matches_first(todo_service):
+    todo_service.create(
+        TodoCreate(title="Review docs", description="mentions the parser", phase=Phase.DESIGN, priority=Priority.LOW)
+    )
+    todo_service.create(TodoCreate(title="Fix parser crash", phase=Phase.DESIGN, priority=Priority.LOW))
+    todo_service.create(TodoCreate(title="Unrelated", phase=Phase.DESIGN, priority=Priority.LOW))
+
+    hits = todo_service.search("parser")
+
+    assert [todo.title for todo, _ in hits] == ["Fix parser crash", "Review docs"]
+    assert hits[0][1] < hits[1][1]
+
+
+def test_search_prefix_and_filters(todo_service):
+    todo_service.create(TodoCreate(title="Parse config", phase=Phase.DESIGN, priority=Priority.LOW))
+    todo_service.create(TodoCreate(title="Parsing errors", phase=Phase.TESTING, priority=Priority.LOW))
+
+    assert todo_service.search("pars") == []
+    assert {todo.title for todo, _ in todo_service.search("pars*")} == {"Parse config", "Parsing errors"}
+    assert [todo.title for todo, _ in todo_service.search("pars*", phase=Phase.TESTING)] == ["Parsing errors"]
+
+
+def test_search_index_follows_updates_and_deletes(todo_service):
+    todo = todo_service.create(TodoCreate(title="Old title", phase=Phase.DESIGN, priority=Priority.LOW))
+    todo_service.update(todo.id, TodoUpdate(title="New heading"))
+
+    assert todo_service.search("old") == []
+    assert [t.id for t, _ in todo_service.search("heading")] == [todo.id]
+
+    todo_service.delete(todo.id)
+    assert todo_service.search("heading") == []
+
+
+def test_search_keyset_pagination(todo_service):
+    for i in range(5):
+        todo_service.create(TodoCreate(title=f"Cache item {i}", phase=Phase.DESIGN, priority=Priority.LOW))
+
+    seen = []
+    cursor = None
+    while True:
+        hits = todo_service.search_with_skills("cache", limit=2, cursor=cursor)
+        seen.extend(hit.id for hit in hits)
+        cursor = next_cursor(hits, 2, key=search_key)
+        if cursor is None:
+            break
+
+    assert sorted(seen) == sorted(set(seen))
+    assert len(seen) == 5
+
+
+def test_changes_since_reports_latest_state_and_tombstones(todo_service):
+    kept = todo_service.create(TodoCreate(title="Kept", phase=Phase.PLANNING, priority=Priority.LOW))
+    gone = todo_service.create(TodoCreate(title="Gone", phase=Phase.PLANNING, priority=Priority.LOW))
+    start = todo_service.changes_since(0).since
+
+    todo_service.update(kept.id, TodoUpdate(title="Kept v2"))
+    todo_service.toggle_complete(kept.id)
+    todo_service.delete(gone.id)
+
+    feed = todo_service.changes_since(start)
+    assert [(c.id, c.deleted) for c in feed.changes] == [(kept.id, False), (gone.id, True)]
+    assert feed.changes[0].todo.title == "Kept v2"
+    assert feed.changes[0].todo.completed is True
+    assert feed.changes[1].todo is None
+    assert feed.since == start + 3
+    assert not feed.has_more
+
+    assert todo_service.changes_since(feed.since).changes == []
+
+
+def test_changes_since_pages_by_limit(todo_service):
+    for i in range(3):
+        todo_service.create(TodoCreate(title=f"Todo {i}", phase=Phase.PLANNING, priority=Priority.LOW))
+
+    first = todo_service.changes_since(0, limit=2)
+    second = todo_service.changes_since(first.since, limit=2)
+
+    assert first.has_more and not second.has_more
+    assert [c.todo.title for c in first.changes + second.changes] == ["Todo 0", "Todo 1", "Todo 2"]
+
+
+def test_compact_changes_sets_horizon_for_dropped_tombstones(todo_service):
+    kept = todo_service.create(TodoCreate(title="Kept", phase=Phase.PLANNING, priority=Priority.LOW))
+    gone = todo_service.create(TodoCreate(title="Gone", phase=Phase.PLANNING, priority=Priority.LOW))
+    todo_service.update(kept.id, TodoUpdate(title="Kept v2"))
+    position = todo_service.changes_since(0).since
+    todo_service.delete(gone.id)
+
+    result = todo_service.compact_changes(timedelta(0))
+
+    assert (result.superseded, result.tombstones) == (2, 1)
+    assert result.horizon == position + 1
+    with pytest.raises(ChangesExpired):
+        todo_service.changes_since(position)
+    fresh = todo_service.changes_since(0)
+    assert [c.todo.title for c in fresh.changes] == ["Kept v2"]
@@ -0,0 +1,40 @@
+from app.routers import web
+
+
+def test_dashboard_empty_state(client):
+    response = client.get("/")
+    assert response.status_code == 200
+    assert "No todos yet" in response.text
+
+
+def test_dashboard_renders_counts_and_open_todos(client):
+    client.post("/api/todos", json={"title": "Open plan", "phase": "planning", "priority": "low"})
+    done_id = client.post(
+        "/api/todos", json={"title": "Done plan", "phase": "planning", "priority": "low"}
+    ).json()["id"]
+    client.patch(f"/api/todos/{done_id}/complete")
+
+    response = client.get("/")
+    assert response.status_code == 200
+    assert "Planning (2)" in response.text
+    assert "Design (0)" in response.text
+    assert "Open plan" in response.text
+    assert "Done plan" not in response.text
+    assert "No todos yet" not in response.text
+
+
+def test_todo_list_search(client):
+    client.post("/api/todos", json={"title": "Fix exporter", "phase": "design", "priority": "low"})
+    client.post("/api/todos", json={"title": "Add dashboard", "phase": "design", "priority": "low"})
+
+    response = client.get("/todos", params={"q": "export*"})
+    assert response.status_code == 200
+    assert "Fix exporter" in response.text
+    assert "Add dashboard" not in response.text
+
+
+def test_live_updates_are_opt_in(client, monkeypatch):
+    assert "live.js" not in client.get("/").text
+
+    monkeypatch.setitem(web.get_templates().env.globals, "live_updates", True)
+    assert "live.js" in client.get("/").text
@@ -0,0 +1,148 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import database, http_cache
+from app.cache import MemoryCache, TodoCache
+from app.database import WorkspaceEngines
+from app.events import broadcaster, broadcaster_for
+from app.models import Phase, Priority
+from app.routers import api
+from app.schemas import TodoCreate
+from app.services import cached_todo_service
+from app.services.cached_todo_service import CachedTodoService, todo_service_for
+from app.services.todo_service import TodoService
+
+
+@pytest.fixture
+def engines(tmp_path, monkeypatch):
+    engines = WorkspaceEngines(str(tmp_path), max_engines=2, idle_seconds=60, profile="default")
+    monkeypatch.setattr(database, "workspace_engines", engines)
+    monkeypatch.setattr(api, "workspace_engines", engines)
+    monkeypatch.setattr(http_cache, "WORKSPACES", True)
+    yield engines
+    engines.close()
+
+
+@pytest.fixture
+def workspace_client(app, engines):
+    with TestClient(app) as client:
+        yield client
+
+
+def create(client, workspace, title, completed=False):
+    headers = {"X-Workspace": workspace}
+    todo = client.post(
+        "/api/todos", json={"title": title, "phase": "testing", "priority": "low"}, headers=headers
+    ).json()
+    if completed:
+        client.patch(f"/api/todos/{todo['id']}/complete", headers=headers)
+    return todo
+
+
+def test_workspaces_are_separate_databases(workspace_client, engines, tmp_path):
+    create(workspace_client, "alpha", "Alpha todo")
+    create(workspace_client, "beta", "Beta todo")
+
+    alpha = workspace_client.get("/api/todos", headers={"X-Workspace": "alpha"})
+    beta = workspace_client.get("/api/todos", headers={"X-Workspace": "beta"})
+
+    assert [t["title"] for t in alpha.json()] == ["Alpha todo"]
+    assert [t["title"] for t in beta.json()] == ["Beta todo"]
+    assert alpha.headers["vary"] == "X-Workspace"
+    assert sorted(path.name for path in tmp_path.glob("*.db")) == ["alpha.db", "beta.db"]
+    assert engines.names() == ["alpha", "beta"]
+
+
+def test_invalid_workspace_names_are_rejected(workspace_client):
+    for name in ("../etc", "Alpha", "", "a" * 64):
+        response = workspace_client.get("/api/todos", headers={"X-Workspace": name})
+        assert response.status_code == 400, name
+
+
+def test_least_recently_used_engines_are_closed(engines):
+    a = engines.get("a")
+    engines.get("b")
+    assert engines.get("a") is a
+    engines.get("c")
+
+    assert engines.open_names() == ["a", "c"]
+    assert (engines.opened, engines.closed) == (3, 1)
+    assert engines.get("b") is not None
+    assert engines.open_names() == ["c", "b"]
+
+
+def test_idle_engines_are_closed_on_the_next_open(engines):
+    engines.get("a")
+    engines.idle_seconds = 0
+
+    engines.get("b")
+
+    assert engines.open_names() == ["b"]
+
+
+def test_a_disposed_engine_keeps_serving_open_sessions(engines):
+    with Session(engines.get("a")) as db:
+        TodoService(db).create(TodoCreate(title="Kept", phase=Phase.PLANNING, priority=Priority.LOW))
+        engines.get("b")
+        engines.get("c")
+        assert "a" not in engines.open_names()
+
+        assert [t.title for t in TodoService(db).list()] == ["Kept"]
+
+
+def test_summary_fans_out_without_touching_the_pool(workspace_client, engines):
+    create(workspace_client, "alpha", "One", completed=True)
+    create(workspace_client, "alpha", "Two")
+    create(workspace_client, "beta", "Three")
+    create(workspace_client, "gamma", "Four")
+    open_before = engines.open_names()
+
+    summary = workspace_client.get("/api/workspaces").json()
+
+    assert summary["total"]["total"] == 4
+    assert summary["total"]["completed"] == 1
+    assert summary["total"]["by_phase"]["testing"] == 4
+    assert {name: stats["total"] for name, stats in summary["workspaces"].items()} == {
+        "alpha": 2,
+        "beta": 1,
+        "gamma": 1,
+    }
+    assert engines.open_names() == open_before
+
+
+def test_workspace_services_get_their_own_cache_namespace_and_events(engines, monkeypatch):
+    monkeypatch.setattr(cached_todo_service, "todo_cache", TodoCache(MemoryCache()))
+    with Session(engines.get("alpha"), info={"workspace": "alpha"}) as db:
+        service = todo_service_for(db)
+
+    assert isinstance(service, CachedTodoService)
+    assert service.cache.namespace == "alpha"
+    assert service.events is broadcaster_for("alpha") is not broadcaster
+    assert service.writer is None
+
+
+def test_opening_a_workspace_does_not_block_the_others(engines, monkeypatch):
+    hot = engines.get("hot")
+    started, release = threading.Event(), threading.Event()
+    open_engine = engines._open
+
+    def slow_open(name):
+        started.set()
+        release.wait(5)
+        return open_engine(name)
+
+    monkeypatch.setattr(engines, "_open", slow_open)
+    with ThreadPoolExecutor(3) as pool:
+        cold = [pool.submit(engines.get, "cold") for _ in range(2)]
+        assert started.wait(5)
+
+        assert engines.get("hot") is hot
+        assert not any(future.done() for future in cold)
+        release.set()
+        assert cold[0].result() is cold[1].result()
+
+    assert engines.opened == 2